@@ -1,25 +1,187 @@
-from flask import Flask, render_template, request, jsonify, send_file
+import time
+_startup_started = time.perf_counter()
+
+from flask import Flask, Request, Response, current_app, render_template, request, jsonify, send_file, stream_with_context
 from werkzeug.utils import secure_filename
 import os
+import atexit
+import threading
+import multiprocessing
 from datetime import datetime
 import json
+import shutil
+import tarfile
+import uuid
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, wait
 
 from config import Config
 from database_models import db, User, DetectionResult, EvidenceReport, AuditLog
-from deepfake_detection import DeepfakeDetector
-from object_detection import ObjectDetector
-from fraud_detection import FraudDetector
-from evidence_report_generator import EvidenceReportGenerator
+from schema_migrations import upgrade_schema
+import dashboard_stats
+import listings
+from result_cache import ResultCache
+from job_queue import DetectionJobManager, DetectionJob, QueueFullError
+from lazy_loader import LazyInstance
+from model_registry import ModelRegistry
+from inference_workers import InferenceWorkerPool
+from inference_profile import InferenceProfile
+from report_service import ReportRenderService, stream_zip, report_exists
+from file_integrity import save_upload, hash_file, verify_file
+from batch_submission import BatchExtractor, BatchLimitError, group_items
+from chunked_uploads import (
+    ChunkedUploadStore, UploadError, UploadNotFoundError, UploadOffsetError, UploadHashMismatchError
+)
+from metrics import StageTimer, stage, merge_stages, observe_detection, observe_batch, registry as metrics_registry
+
+_imports_finished = time.perf_counter()
+
+# Endpoints allowed to receive uploads above MAX_CONTENT_LENGTH
+LARGE_UPLOAD_ENDPOINTS = {'detect_transactions', 'detect_batch'}
+
+class DetectionRequest(Request):
+    @property
+    def max_content_length(self):
+        if self.endpoint in LARGE_UPLOAD_ENDPOINTS:
+            return current_app.config['BATCH_MAX_CONTENT_LENGTH']
+        return super().max_content_length
 
 app = Flask(__name__)
+app.request_class = DetectionRequest
 app.config.from_object(Config)
 db.init_app(app)
 
-# Initialize detectors
-deepfake_detector = DeepfakeDetector()
-object_detector = ObjectDetector(model_path=app.config['YOLO_MODEL_PATH'])
-fraud_detector = FraudDetector()
-report_generator = EvidenceReportGenerator()
+DETECTION_TYPES = ('deepfake', 'object', 'fraud')
+
+# Content-addressed cache of detection results
+result_cache = ResultCache(max_memory_entries=app.config['RESULT_CACHE_MEMORY_ENTRIES'])
+
+# Detectors are built on first use so inference libraries are only imported when needed
+def deepfake_options():
+    return {
+        'audio_window_seconds': app.config['AUDIO_WINDOW_SECONDS'] or None,
+        'audio_hop_seconds': app.config['AUDIO_HOP_SECONDS'] or None,
+        'audio_batch_size': app.config['AUDIO_BATCH_SIZE'],
+        'inference_profile': InferenceProfile(
+            threads=app.config['INFERENCE_THREADS'] or None,
+            interop_threads=app.config['INFERENCE_INTEROP_THREADS'] or None,
+            quantize_int8=app.config['INFERENCE_QUANTIZE_INT8'],
+            autocast_bf16=app.config['INFERENCE_AUTOCAST_BF16']
+        ),
+        'backend': app.config['INFERENCE_BACKEND'],
+        'onnx_cache_dir': app.config['ONNX_CACHE_DIR'],
+        'frame_max_side': app.config['FRAME_MAX_SIDE'] or None,
+        'frame_seek_threshold': app.config['FRAME_SEEK_THRESHOLD'] or None
+    }
+
+def object_options():
+    return {
+        'frame_max_side': app.config['FRAME_MAX_SIDE'] or None,
+        'frame_seek_threshold': app.config['FRAME_SEEK_THRESHOLD'] or None
+    }
+
+def _build_deepfake_detector(model_name):
+    from deepfake_detection import DeepfakeDetector
+    return DeepfakeDetector(image_model_name=model_name, registry=model_registry, **deepfake_options())
+
+def _build_object_detector(model_name):
+    from object_detection import ObjectDetector
+    return ObjectDetector(model_path=model_name, registry=model_registry, **object_options())
+
+def _build_fraud_detector(model_name):
+    from fraud_detection import FraudDetector
+    return FraudDetector(
+        model_path=model_name,
+        stream_threshold_bytes=app.config['FRAUD_STREAM_THRESHOLD_BYTES'],
+        chunk_rows=app.config['FRAUD_CSV_CHUNK_ROWS'],
+        top_k=app.config['FRAUD_TOP_K']
+    )
+
+def _build_report_generator():
+    from evidence_report_generator import EvidenceReportGenerator
+    return EvidenceReportGenerator()
+
+DETECTOR_BUILDERS = {
+    'deepfake': _build_deepfake_detector,
+    'object': _build_object_detector,
+    'fraud': _build_fraud_detector
+}
+
+def _drop_stale_cache_entries(detection_type):
+    def on_load(detector):
+        # Cached results from an older version of the same model are no longer valid
+        with app.app_context():
+            result_cache.invalidate(
+                detection_type=detection_type,
+                signature_prefix=f"{detector.model_family}|",
+                keep_model_signature=detector.model_signature
+            )
+    return on_load
+
+def _lazy_detector(detection_type, model_name):
+    return LazyInstance(
+        f"{detection_type} detector ({model_name or 'default'})",
+        lambda: DETECTOR_BUILDERS[detection_type](model_name),
+        on_load=_drop_stale_cache_entries(detection_type)
+    )
+
+# Loaded models are shared by all detectors and kept within the memory budget
+model_registry = ModelRegistry(
+    budget_bytes=app.config['MODEL_MEMORY_BUDGET_MB'] * 1024 * 1024 or None
+)
+
+# One lazily built detector per (detection type, model variant); the first
+# configured variant of each type is the default
+detectors = {
+    detection_type: _lazy_detector(detection_type, app.config['MODEL_VARIANTS'][detection_type][0])
+    for detection_type in DETECTION_TYPES
+}
+detector_variants = {
+    (detection_type, app.config['MODEL_VARIANTS'][detection_type][0]): detectors[detection_type]
+    for detection_type in DETECTION_TYPES
+}
+_detector_variants_lock = threading.Lock()
+report_generator = LazyInstance('report generator', _build_report_generator)
+
+# Resumable uploads beyond MAX_CONTENT_LENGTH, assembled on disk chunk by chunk
+chunked_uploads = ChunkedUploadStore(
+    app.config['CHUNKED_UPLOAD_FOLDER'],
+    max_size=app.config['CHUNKED_UPLOAD_MAX_SIZE'],
+    ttl_seconds=app.config['CHUNKED_UPLOAD_TTL_HOURS'] * 3600
+)
+
+# PDF builds run in their own processes (in-process when REPORT_RENDER_WORKERS=0)
+report_renderer = ReportRenderService(
+    max_workers=app.config['REPORT_RENDER_WORKERS'],
+    output_dir=app.config['REPORTS_FOLDER'],
+    local_generator=report_generator.get
+)
+atexit.register(report_renderer.shutdown)
+
+# Optional out-of-process inference; workers build their own detectors
+inference_pool = None
+if app.config['INFERENCE_WORKERS'] > 0:
+    inference_pool = InferenceWorkerPool(
+        num_workers=app.config['INFERENCE_WORKERS'],
+        detector_options={
+            'deepfake': deepfake_options(),
+            'object': object_options(),
+            'fraud': {
+                'stream_threshold_bytes': app.config['FRAUD_STREAM_THRESHOLD_BYTES'],
+                'chunk_rows': app.config['FRAUD_CSV_CHUNK_ROWS'],
+                'top_k': app.config['FRAUD_TOP_K']
+            }
+        },
+        torch_threads=app.config['INFERENCE_WORKER_THREADS'] or None,
+        task_timeout=app.config['INFERENCE_TASK_TIMEOUT']
+    )
+    atexit.register(inference_pool.shutdown)
+
+# Background executor for async detection jobs
+job_manager = DetectionJobManager(
+    max_workers=app.config['DETECTION_JOB_WORKERS'],
+    max_pending=app.config['DETECTION_JOB_QUEUE_SIZE']
+)
 
 # ADD THIS JINJA2 FILTER (MISSING IN YOUR CODE)
 @app.template_filter('from_json')
@@ -46,6 +208,211 @@ def index():
 def detection():
     return render_template('detection.html')
 
+def get_detector(detection_type, model_name=None):
+    """
+    Return the detector for `detection_type`, loading it on first use.
+    `model_name` selects one of the configured MODEL_VARIANTS instead of the default.
+    """
+    if model_name is None:
+        lazy_detector = detectors.get(detection_type)
+        return lazy_detector.get() if lazy_detector is not None else None
+
+    if model_name not in app.config['MODEL_VARIANTS'].get(detection_type, ()):
+        return None
+
+    with _detector_variants_lock:
+        key = (detection_type, model_name)
+        if key not in detector_variants:
+            detector_variants[key] = _lazy_detector(detection_type, model_name)
+        lazy_detector = detector_variants[key]
+    return lazy_detector.get()
+
+def warm_up(names):
+    """
+    Load the named detectors (and/or 'report'); returns per-component status.
+    With an inference pool, detectors are warmed in the worker that picks up
+    the warmup task rather than in this process.
+    """
+    components = dict(detectors, report=report_generator)
+    status = {}
+    for name in names:
+        component = components.get(name)
+        if component is None:
+            status[name] = {'loaded': False, 'error': 'unknown component'}
+            continue
+        if inference_pool is not None and name in DETECTION_TYPES:
+            try:
+                inference_pool.model_signature(name, app.config['MODEL_VARIANTS'][name][0])
+                status[name] = {'name': name, 'loaded': True, 'in_worker': True}
+            except Exception as e:
+                status[name] = {'name': name, 'loaded': False, 'in_worker': True, 'error': str(e)}
+            continue
+        try:
+            component.get()
+        except Exception:
+            pass
+        status[name] = component.status()
+    return status
+
+def run_detector(filepath, detection_type, model_name=None, file_hash=None):
+    """
+    Run the detector matching `detection_type` on a saved upload, in the
+    inference worker pool when one is configured, otherwise in this process.
+    `file_hash` (the upload's SHA-256, when known) spares the result cache a re-read.
+    """
+    if detection_type not in DETECTION_TYPES:
+        return None
+
+    if inference_pool is not None:
+        model_name = model_name or app.config['MODEL_VARIANTS'][detection_type][0]
+        _, model_signature = inference_pool.model_signature(detection_type, model_name)
+
+        def detect_fn(path):
+            result = inference_pool.detect(detection_type, path, model_name)
+            # Worker stage timings join this request's breakdown rather than the cached result
+            merge_stages(result.get('metadata', {}).pop('stages', None))
+            return result
+    else:
+        detector = get_detector(detection_type, model_name)
+        if detector is None:
+            return None
+        model_signature = detector.model_signature
+        detect_fn = detector.detect
+
+    if not app.config['RESULT_CACHE_ENABLED']:
+        return detect_fn(filepath)
+
+    return result_cache.get_or_detect(
+        filepath,
+        detection_type,
+        model_signature,
+        detect_fn,
+        file_hash=file_hash
+    )
+
+def store_detection(filepath, detection_type, result, file_hash=None, file_size=None):
+    """Persist a detection result and return the DetectionResult record"""
+    with stage('serialize'):
+        result_json = json.dumps(result)
+        meta_json = json.dumps(result.get('metadata', {}))
+
+    detection_record = DetectionResult(
+        user_id=1,  # TODO: Replace with actual user auth
+        file_path=filepath,
+        detection_type=detection_type,
+        media_type=result.get('media_type', result.get('type', 'unknown')),
+        result=result_json,
+        confidence=result.get('confidence', 0.0),
+        timestamp=datetime.fromisoformat(result.get('timestamp', datetime.now().isoformat())),
+        meta=meta_json,
+        file_sha256=file_hash,
+        file_size=file_size,
+        **DetectionResult.summarize(result)
+    )
+
+    with stage('db_commit'):
+        db.session.add(detection_record)
+        dashboard_stats.record_detection(detection_type)
+        db.session.commit()
+    return detection_record
+
+def generate_evidence_report(detection_record):
+    """Render the court report PDF for a detection; returns the EvidenceReport or None"""
+    try:
+        print(f"Generating court-ready evidence report...")
+        generator = report_generator.get()
+
+        # Generate court report data
+        with stage('report_build'):
+            report_data = generator.generate_court_report(detection_record, verify=app.config['REPORT_VERIFY_FILE_HASH'])
+            report_hash = generator.content_hash(report_data)
+
+        # Same findings as an existing report: hand that one back instead of rendering
+        existing = find_unchanged_report(detection_record.id, report_hash)
+        if existing is not None:
+            print(f"Report unchanged, reusing: {existing.file_path}")
+            return existing
+
+        # Create PDF, named after its report number so earlier reports keep their files
+        report_number = new_report_number(report_data)
+        with stage('report_render'):
+            pdf_path = report_renderer.render(
+                report_data, report_number, timeout=app.config['REPORT_RENDER_TIMEOUT']
+            )
+
+        # Create EvidenceReport database record
+        evidence_report = new_evidence_report(detection_record, report_data, pdf_path, report_number, generator, report_hash)
+
+        with stage('report_db_commit'):
+            db.session.add(evidence_report)
+            dashboard_stats.record_report()
+            db.session.commit()
+
+        print(f"Report generated successfully: {pdf_path}")
+        return evidence_report
+
+    except Exception as report_error:
+        print(f"Report generation failed: {report_error}")
+        # Don't fail the entire request if report generation fails
+        db.session.rollback()
+        return None
+
+def new_report_number(report_data):
+    """Unique report number, also used as the PDF's file name"""
+    # report_id is per detection and day; the suffix keeps regenerated reports unique
+    return f"{report_data['report_id']}-{uuid.uuid4().hex[:8]}"
+
+def new_evidence_report(detection_record, report_data, pdf_path, report_number, generator, report_hash=None):
+    """EvidenceReport row for a rendered PDF (not yet added to the session)"""
+    return EvidenceReport(
+        detection_id=detection_record.id,
+        report_number=report_number,
+        report_type='court_evidence',
+        file_path=pdf_path,
+        generated_at=datetime.now(),
+        report_hash=report_hash or generator.content_hash(report_data),
+        status='completed'
+    )
+
+def find_unchanged_report(detection_id, report_hash):
+    """Latest completed report for the detection with this content hash, if its file still exists"""
+    existing = (
+        EvidenceReport.query.filter_by(detection_id=detection_id, report_hash=report_hash, status='completed')
+        .order_by(EvidenceReport.generated_at.desc()).first()
+    )
+    return existing if report_exists(existing) else None
+
+def process_detection_job(job, filepath, detection_type, generate_report_requested, model_name=None, upload_stages=None,
+                          file_hash=None, file_size=None):
+    """Detection pipeline executed by the job manager outside the request thread"""
+    with app.app_context(), StageTimer() as timer:
+        # Stages already spent in the request thread (file save) and waiting in the queue
+        timer.merge(upload_stages)
+        if job.started_at is not None:
+            timer.add('queue_wait', (job.started_at - job.created_at).total_seconds())
+
+        job.stage = 'detection'
+        result = run_detector(filepath, detection_type, model_name, file_hash)
+        media_type = result.get('media_type', result.get('type'))
+
+        if result.get('prediction') == 'error':
+            observe_detection(detection_type, media_type, timer, outcome='error')
+            return {'error': result.get('error', 'Detection failed')}
+
+        result.setdefault('metadata', {})['stages'] = timer.as_dict()
+
+        job.stage = 'storing'
+        detection_record = store_detection(filepath, detection_type, result, file_hash, file_size)
+
+        report_id = None
+        if generate_report_requested:
+            job.stage = 'report'
+            evidence_report = generate_evidence_report(detection_record)
+            report_id = evidence_report.id if evidence_report else None
+
+        observe_detection(detection_type, media_type, timer)
+        return {'detection_id': detection_record.id, 'report_id': report_id, 'stages': timer.as_dict()}
+
 @app.route('/detection', methods=['POST'])
 def detect():
     """Handle file upload and detection"""
@@ -61,114 +428,509 @@ def detect():
     
     if not allowed_file(file.filename):
         return jsonify({'success': False, 'error': 'Invalid file type'}), 400
+
+    if detection_type not in DETECTION_TYPES:
+        return jsonify({'success': False, 'error': 'Invalid detection type'}), 400
+
+    # Optional model variant, e.g. an alternative deepfake image model
+    model_name = request.form.get('model') or None
+    if model_name is not None and model_name not in app.config['MODEL_VARIANTS'][detection_type]:
+        return jsonify({'success': False, 'error': 'Unknown model for this detection type'}), 400
     
+    return handle_detection_upload(file, detection_type, model_name)
+
+@app.route('/detection/transactions', methods=['POST'])
+def detect_transactions():
+    """
+    Upload a transaction CSV for batch fraud analysis.
+    Accepts files up to BATCH_MAX_CONTENT_LENGTH; large files are scored in
+    streaming mode with per-row results written to a sidecar CSV.
+    """
+    if 'file' not in request.files:
+        return jsonify({'success': False, 'error': 'No file uploaded'}), 400
+
+    file = request.files['file']
+
+    if file.filename == '':
+        return jsonify({'success': False, 'error': 'No file selected'}), 400
+
+    if not file.filename.lower().endswith('.csv'):
+        return jsonify({'success': False, 'error': 'Only CSV files are supported'}), 400
+
+    return handle_detection_upload(file, 'fraud')
+
+@app.route('/detection/batch', methods=['POST'])
+def detect_batch():
+    """
+    Analyze many files in one request: any number of `files` parts, each a
+    media file or a ZIP/TAR archive of them. Items are grouped by detector and
+    media kind and run through batched inference where the detector has a
+    batched path (images, JSON transactions). Results are bulk inserted.
+    Accepts files up to BATCH_MAX_CONTENT_LENGTH; `async` queues the
+    analysis as a job.
+    """
+    files = [file for file in request.files.getlist('files') + request.files.getlist('file') if file.filename]
+    if not files:
+        return jsonify({'success': False, 'error': 'No files uploaded'}), 400
+
+    detection_type = request.form.get('detection_type', 'deepfake')
+    if detection_type not in DETECTION_TYPES:
+        return jsonify({'success': False, 'error': 'Invalid detection type'}), 400
+
+    model_name = request.form.get('model') or None
+    if model_name is not None and model_name not in app.config['MODEL_VARIANTS'][detection_type]:
+        return jsonify({'success': False, 'error': 'Unknown model for this detection type'}), 400
+
+    batch_dir = os.path.join(
+        app.config['UPLOAD_FOLDER'], f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    )
+    extractor = BatchExtractor(
+        batch_dir,
+        app.config['ALLOWED_EXTENSIONS'],
+        max_items=app.config['BATCH_MAX_FILES'],
+        max_bytes=app.config['BATCH_MAX_EXTRACTED_BYTES']
+    )
     try:
-        # Save uploaded file
-        filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        unique_filename = f"{timestamp}_{filename}"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-        
-        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-        file.save(filepath)
-        
-        # Perform detection based on type
-        result = None
-        if detection_type == 'deepfake':
-            result = deepfake_detector.detect(filepath)
-        elif detection_type == 'object':
-            result = object_detector.detect(filepath)
-        elif detection_type == 'fraud':
-            result = fraud_detector.detect(filepath)
-        else:
-            return jsonify({'success': False, 'error': 'Invalid detection type'}), 400
-        
-        # Check for errors in result
-        if result.get('prediction') == 'error':
-            return jsonify({
-                'success': False, 
-                'error': result.get('error', 'Detection failed')
-            }), 500
-        
-        # Store in database
-        detection_record = DetectionResult(
-            user_id=1,  # TODO: Replace with actual user auth
-            file_path=filepath,
-            detection_type=detection_type,
-            media_type=result.get('media_type', result.get('type', 'unknown')),
-            result=json.dumps(result),
-            confidence=result.get('confidence', 0.0),
-            timestamp=datetime.fromisoformat(result.get('timestamp', datetime.now().isoformat())),
-            meta=json.dumps(result.get('metadata', {}))
-        )
-        
-        db.session.add(detection_record)
-        db.session.commit()
-        
-        # Generate report if requested - FIXED: Check for 'generate_report' not 'generateReport'
-        report_path = None
-        report_id = None
-        generate_report_requested = request.form.get('generate_report') == 'on'
-        
-        if generate_report_requested:
-            try:
-                print(f"Generating court-ready evidence report...")
-                
-                # Generate court report data
-                report_data = report_generator.generate_court_report(detection_record)
-                
-                # Create PDF
-                pdf_path = report_generator.create_pdf_report(report_data, detection_record.id)
-                
-                # Create EvidenceReport database record
-                evidence_report = EvidenceReport(
-                    detection_id=detection_record.id,
-                    report_type='court_evidence',
-                    file_path=pdf_path,
-                    generated_at=datetime.now(),
-                    report_hash=report_generator.generate_hash(report_data),
-                    status='completed'
-                )
-                
-                db.session.add(evidence_report)
-                db.session.commit()
-                
-                report_path = pdf_path
-                report_id = evidence_report.id
-                
-                print(f"Report generated successfully: {pdf_path}")
-                
-            except Exception as report_error:
-                print(f"Report generation failed: {report_error}")
-                # Don't fail the entire request if report generation fails
-                report_path = None
-                report_id = None
-        
+        for file in files:
+            extractor.add_upload(file)
+    except BatchLimitError as e:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+        return jsonify({'success': False, 'error': str(e)}), 413
+    except (zipfile.BadZipFile, tarfile.TarError) as e:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+        return jsonify({'success': False, 'error': f'Unreadable archive: {e}'}), 400
+
+    if not extractor.items:
+        shutil.rmtree(batch_dir, ignore_errors=True)
+        return jsonify({'success': False, 'error': 'No supported files in the batch', 'skipped': extractor.skipped}), 400
+
+    if is_async_request():
+        job = DetectionJob('batch', batch_dir, on_cancel=lambda: shutil.rmtree(batch_dir, ignore_errors=True))
+        try:
+            job_manager.submit(job, process_batch_job, extractor.items, extractor.skipped, detection_type, model_name)
+        except QueueFullError as e:
+            return jsonify({'success': False, 'error': str(e)}), 503
         return jsonify({
             'success': True,
-            'detection_id': detection_record.id,
-            'detection_type': detection_type,
-            'result': result,
-            'report_generated': report_path is not None,
-            'report_id': report_id,
-            'report_path': report_path
-        })
-        
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': f"/api/jobs/{job.id}",
+            'items': len(extractor.items)
+        }), 202
+
+    try:
+        summary = run_batch_detection(extractor.items, detection_type, model_name)
     except Exception as e:
-        print(f"❌ Detection failed: {e}")
+        print(f"❌ Batch detection failed: {e}")
+        db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 500
 
+    summary['skipped'] = extractor.skipped
+    return jsonify({'success': True, **summary})
+
+def process_batch_job(job, items, skipped, detection_type, model_name=None):
+    """Batch pipeline executed by the job manager outside the request thread"""
+    with app.app_context():
+        job.stage = 'detection'
+        summary = run_batch_detection(items, detection_type, model_name)
+        summary['skipped'] = skipped
+        return {'summary': summary}
+
+def batch_detect_fn(detection_type, media_kind, model_name):
+    """
+    Batched detect function for a (detection type, media kind) group, taking
+    a list of paths and returning results in order, plus the model signature
+    for caching. None when the group has no batched path (each file then goes
+    through run_detector).
+    """
+    if inference_pool is not None:
+        return None
+    detector = get_detector(detection_type, model_name)
+    if detector is None:
+        return None
+
+    if detection_type == 'deepfake' and media_kind == 'image':
+        batch_size = app.config['BATCH_IMAGE_SIZE']
+        return (lambda paths: detector.detect_images(paths, batch_size=batch_size)), detector.model_signature
+    if detection_type == 'object' and media_kind == 'image':
+        return detector.detect_images, detector.model_signature
+    if detection_type == 'fraud' and media_kind == 'transaction':
+        return detector.detect_transactions, detector.model_signature
+    return None
+
+def run_batch_detection(items, detection_type, model_name=None):
+    """Detect every batch item group by group, bulk insert the results and summarize them"""
+    groups = group_items(items, detection_type)
+    for (group_type, media_kind), group in groups.items():
+        # A model variant only applies to the detection type it was chosen for
+        group_model = model_name if group_type == detection_type else None
+
+        with StageTimer() as timer:
+            try:
+                batched = batch_detect_fn(group_type, media_kind, group_model)
+                if batched is None:
+                    results = [
+                        run_detector(item['file_path'], group_type, group_model, item['file_sha256'])
+                        for item in group
+                    ]
+                elif app.config['RESULT_CACHE_ENABLED']:
+                    detect_many, model_signature = batched
+                    results = result_cache.get_or_detect_many(
+                        [(item['file_path'], item['file_sha256']) for item in group],
+                        group_type, model_signature, detect_many
+                    )
+                else:
+                    results = batched[0]([item['file_path'] for item in group])
+
+                for item, result in zip(group, results):
+                    item['result'] = result
+                store_batch_detections(group)
+            except Exception as e:
+                # Only this group fails; items already committed keep their ids
+                print(f"❌ Batch group {group_type}/{media_kind} failed: {e}")
+                db.session.rollback()
+                for item in group:
+                    if item.get('detection_id') is None:
+                        item['result'] = {'prediction': 'error', 'confidence': 0.0, 'error': str(e)}
+
+        failed = sum(1 for item in group if item.get('detection_id') is None)
+        observe_batch(group_type, media_kind, timer, len(group) - failed, failed)
+
+    stored = [item for item in items if item.get('detection_id') is not None]
+    return {
+        'total': len(items),
+        'stored': len(stored),
+        'failed': len(items) - len(stored),
+        'groups': {f"{group_type}/{media_kind}": len(group) for (group_type, media_kind), group in groups.items()},
+        'items': [
+            {
+                'name': item['name'],
+                'source': item['source'],
+                'detection_type': item['detection_type'],
+                'media_kind': item['media_kind'],
+                'detection_id': item.get('detection_id'),
+                'prediction': (item['result'] or {}).get('prediction', 'error'),
+                'confidence': (item['result'] or {}).get('confidence', 0.0),
+                'error': (item['result'] or {}).get('error') if item.get('detection_id') is None else None
+            }
+            for item in items
+        ]
+    }
+
+def store_batch_detections(items):
+    """
+    Bulk insert the successful results of batch items, BATCH_INSERT_SIZE rows
+    per statement and commit, and set each item's `detection_id`.
+    """
+    succeeded = [
+        item for item in items
+        if item.get('result') and item['result'].get('prediction') != 'error'
+    ]
+    chunk_size = app.config['BATCH_INSERT_SIZE']
+    for start in range(0, len(succeeded), chunk_size):
+        chunk = succeeded[start:start + chunk_size]
+        with stage('serialize'):
+            rows = []
+            for item in chunk:
+                result = item['result']
+                rows.append({
+                    'user_id': 1,  # TODO: Replace with actual user auth
+                    'file_path': item['file_path'],
+                    'detection_type': item['detection_type'],
+                    'media_type': result.get('media_type', result.get('type', 'unknown')),
+                    'result': json.dumps(result),
+                    'confidence': result.get('confidence', 0.0),
+                    'timestamp': datetime.fromisoformat(result.get('timestamp', datetime.now().isoformat())),
+                    'meta': json.dumps(result.get('metadata', {})),
+                    'file_sha256': item['file_sha256'],
+                    'file_size': item['file_size'],
+                    **DetectionResult.summarize(result)
+                })
+
+        with stage('db_commit'):
+            # return_defaults fills in each row's primary key
+            db.session.bulk_insert_mappings(DetectionResult, rows, return_defaults=True)
+            counts = {}
+            for row in rows:
+                counts[row['detection_type']] = counts.get(row['detection_type'], 0) + 1
+            for counted_type, count in counts.items():
+                dashboard_stats.increment_counter(dashboard_stats.detection_counter(counted_type), count)
+            db.session.commit()
+
+        for item, row in zip(chunk, rows):
+            item['detection_id'] = row['id']
+
+def remove_file(path):
+    """Delete a file if it still exists"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+def upload_path(filename):
+    """Timestamped destination in UPLOAD_FOLDER for an uploaded file name"""
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return os.path.join(app.config['UPLOAD_FOLDER'], f"{timestamp}_{secure_filename(filename)}")
+
+def handle_detection_upload(file, detection_type, model_name=None):
+    """Save a validated upload and run (or queue) the detection pipeline"""
+    with StageTimer() as timer:
+        try:
+            # Save uploaded file
+            filepath = upload_path(file.filename)
+            os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+            # Hashed while it is written, so nothing re-reads the file for its digest
+            with timer.stage('file_save'):
+                file_hash, file_size = save_upload(file, filepath)
+
+            # Generate report if requested - FIXED: Check for 'generate_report' not 'generateReport'
+            generate_report_requested = request.form.get('generate_report') == 'on'
+
+            return run_detection_pipeline(
+                filepath, detection_type, model_name, generate_report_requested, timer,
+                file_hash, file_size, run_async=is_async_request()
+            )
+
+        except Exception as e:
+            print(f"❌ Detection failed: {e}")
+            observe_detection(detection_type, None, timer, outcome='error')
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+def run_detection_pipeline(filepath, detection_type, model_name, generate_report_requested, timer,
+                           file_hash=None, file_size=None, run_async=False):
+    """Run (or queue, with `run_async`) detection on a saved upload and build the JSON response"""
+    # Opt-in async mode: queue the job and return its id immediately
+    if run_async:
+        job = DetectionJob(detection_type, filepath, on_cancel=lambda: remove_file(filepath))
+        try:
+            job_manager.submit(
+                job, process_detection_job, filepath, detection_type, generate_report_requested, model_name,
+                timer.as_dict(), file_hash, file_size
+            )
+        except QueueFullError as e:
+            return jsonify({'success': False, 'error': str(e)}), 503
+
+        return jsonify({
+            'success': True,
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': f"/api/jobs/{job.id}"
+        }), 202
+
+    # Perform detection based on type
+    result = run_detector(filepath, detection_type, model_name, file_hash)
+    media_type = result.get('media_type', result.get('type'))
+
+    # Check for errors in result
+    if result.get('prediction') == 'error':
+        observe_detection(detection_type, media_type, timer, outcome='error')
+        return jsonify({
+            'success': False, 
+            'error': result.get('error', 'Detection failed')
+        }), 500
+
+    # Stored breakdown covers everything up to detection
+    result.setdefault('metadata', {})['stages'] = timer.as_dict()
+
+    # Store in database
+    detection_record = store_detection(filepath, detection_type, result, file_hash, file_size)
+
+    report_path = None
+    report_id = None
+
+    if generate_report_requested:
+        evidence_report = generate_evidence_report(detection_record)
+        if evidence_report is not None:
+            report_path = evidence_report.file_path
+            report_id = evidence_report.id
+
+    # The response also includes serialization, commit and report stages
+    result['metadata']['stages'] = timer.as_dict()
+    observe_detection(detection_type, media_type, timer)
+
+    return jsonify({
+        'success': True,
+        'detection_id': detection_record.id,
+        'detection_type': detection_type,
+        'result': result,
+        'report_generated': report_path is not None,
+        'report_id': report_id,
+        'report_path': report_path
+    })
+
+@app.route('/api/uploads', methods=['POST'])
+def api_create_upload():
+    """
+    Start a chunked upload. JSON body: filename, size, sha256, detection_type,
+    optional model and generate_report. Chunks are then sent with
+    PUT /api/uploads/<upload_id>, and POST /api/uploads/<upload_id>/finalize
+    runs detection on the assembled file.
+    """
+    data = request.get_json(silent=True) or {}
+    filename = data.get('filename') or ''
+    detection_type = data.get('detection_type', 'deepfake')
+    model_name = data.get('model') or None
+
+    if not allowed_file(filename):
+        return jsonify({'success': False, 'error': 'Invalid file type'}), 400
+    if detection_type not in DETECTION_TYPES:
+        return jsonify({'success': False, 'error': 'Invalid detection type'}), 400
+    if model_name is not None and model_name not in app.config['MODEL_VARIANTS'][detection_type]:
+        return jsonify({'success': False, 'error': 'Unknown model for this detection type'}), 400
+
+    # JSON true and 1.9 would both pass int(); only a real positive integer is a size
+    size = data.get('size')
+    if not isinstance(size, int) or isinstance(size, bool) or size <= 0:
+        return jsonify({'success': False, 'error': 'size must be a positive integer'}), 400
+
+    try:
+        upload = chunked_uploads.create(
+            filename, detection_type, size, data.get('sha256'),
+            model_name=model_name, generate_report=bool(data.get('generate_report'))
+        )
+    except UploadError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    upload['chunk_size'] = app.config['CHUNKED_UPLOAD_CHUNK_SIZE']
+    upload['upload_url'] = f"/api/uploads/{upload['upload_id']}"
+    return jsonify(upload), 201
+
+@app.route('/api/uploads/<upload_id>')
+def api_upload_status(upload_id):
+    """Upload progress; `offset` is where the next chunk must start"""
+    try:
+        return jsonify(chunked_uploads.status(upload_id))
+    except UploadError as e:
+        return upload_error_response(e)
+
+@app.route('/api/uploads/<upload_id>', methods=['PUT'])
+def api_upload_chunk(upload_id):
+    """
+    Append the raw request body at the offset given by the `Upload-Offset`
+    header (or `offset` query parameter), which must match the current offset.
+    """
+    try:
+        offset = int(request.headers.get('Upload-Offset', request.args.get('offset', '')))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Upload-Offset is required'}), 400
+
+    try:
+        new_offset = chunked_uploads.append(upload_id, offset, request.stream)
+    except UploadError as e:
+        return upload_error_response(e)
+    return jsonify({'upload_id': upload_id, 'offset': new_offset})
+
+@app.route('/api/uploads/<upload_id>', methods=['DELETE'])
+def api_abort_upload(upload_id):
+    try:
+        chunked_uploads.abort(upload_id)
+    except UploadError as e:
+        return upload_error_response(e)
+    return jsonify({'success': True})
+
+@app.route('/api/uploads/<upload_id>/finalize', methods=['POST'])
+def api_finalize_upload(upload_id):
+    """
+    Validate the assembled file's size and SHA-256, move it into UPLOAD_FOLDER
+    and run detection on it. As with /detection, `async=1` queues detection
+    as a job (202) instead of waiting for it.
+    """
+    try:
+        upload = chunked_uploads.status(upload_id)
+    except UploadError as e:
+        return upload_error_response(e)
+
+    detection_type = upload['detection_type']
+    filepath = upload_path(upload['filename'])
+    with StageTimer() as timer:
+        try:
+            with timer.stage('file_save'):
+                file_hash, file_size = chunked_uploads.finalize(upload_id, filepath)
+        except UploadError as e:
+            return upload_error_response(e)
+
+        try:
+            return run_detection_pipeline(
+                filepath, detection_type, upload['model_name'], upload['generate_report'], timer,
+                file_hash, file_size, run_async=is_async_request()
+            )
+        except Exception as e:
+            print(f"❌ Detection failed: {e}")
+            observe_detection(detection_type, None, timer, outcome='error')
+            return jsonify({'success': False, 'error': str(e)}), 500
+
+def upload_error_response(error):
+    if isinstance(error, UploadNotFoundError):
+        return jsonify({'success': False, 'error': str(error)}), 404
+    if isinstance(error, UploadOffsetError):
+        return jsonify({'success': False, 'error': str(error), 'offset': error.expected_offset}), 409
+    if isinstance(error, UploadHashMismatchError):
+        return jsonify({'success': False, 'error': str(error)}), 422
+    return jsonify({'success': False, 'error': str(error)}), 400
+
+def is_async_request():
+    """Async mode is requested via the `async` form field or query parameter"""
+    value = request.form.get('async', request.args.get('async', ''))
+    return str(value).lower() in ('1', 'true', 'on', 'yes')
+
+@app.route('/api/jobs/<job_id>')
+def api_job_status(job_id):
+    """Get the status of an async detection job"""
+    job = job_manager.snapshot(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def api_cancel_job(job_id):
+    """Cancel an async detection job that has not started yet"""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    snapshot = job_manager.snapshot(job_id)
+    if snapshot['status'] != DetectionJob.CANCELLED:
+        return jsonify({'success': False, 'error': f"Job is already {snapshot['status']}", 'job': snapshot}), 409
+    return jsonify({'success': True, 'job': snapshot})
+
 @app.route('/results')
 def results():
-    """Show all detection results"""
-    detections = DetectionResult.query.order_by(DetectionResult.timestamp.desc()).all()
-    return render_template('results.html', detections=detections)
+    """
+    Show detection results, newest first, one page at a time.
+    Query parameters: type, prediction, since, until, cursor, limit.
+    """
+    try:
+        options = listings.parse_list_args(request.args, app.config['LIST_PAGE_SIZE'], app.config['LIST_MAX_PAGE_SIZE'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    detections, next_cursor = listings.detection_page(options)
+    return render_template(
+        'results.html',
+        detections=detections,
+        next_cursor=next_cursor,
+        filters=request.args,
+        detection_types=DETECTION_TYPES
+    )
 
 @app.route('/reports')
 def reports():
-    """Show all evidence reports"""
-    reports = EvidenceReport.query.order_by(EvidenceReport.generated_at.desc()).all()
-    return render_template('reports.html', reports=reports)
+    """
+    Show evidence reports, newest first, one page at a time.
+    Query parameters: type, prediction, since, until, cursor, limit.
+    """
+    try:
+        options = listings.parse_list_args(request.args, app.config['LIST_PAGE_SIZE'], app.config['LIST_MAX_PAGE_SIZE'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    reports, next_cursor = listings.report_page(options)
+    return render_template(
+        'reports.html',
+        reports=reports,
+        next_cursor=next_cursor,
+        filters=request.args,
+        detection_types=DETECTION_TYPES
+    )
 
 
 @app.route('/reports/download/<int:report_id>')
@@ -177,8 +939,11 @@ def download_report(report_id):
     # Find the detection record
     detection = DetectionResult.query.get_or_404(report_id)
     
-    # Find the associated evidence report
-    evidence_report = EvidenceReport.query.filter_by(detection_id=detection.id).first()
+    # Find the latest evidence report (regenerated reports are kept alongside older ones)
+    evidence_report = (
+        EvidenceReport.query.filter_by(detection_id=detection.id)
+        .order_by(EvidenceReport.generated_at.desc()).first()
+    )
     
     if not evidence_report or not evidence_report.file_path:
         return jsonify({'error': 'Report not found'}), 404
@@ -196,22 +961,219 @@ def download_report(report_id):
         mimetype='application/pdf'
     )
 
+@app.route('/reports/generate/<int:detection_id>')
+def generate_report(detection_id):
+    """Generate (or reuse, when unchanged) the evidence report for a detection and download it"""
+    detection = DetectionResult.query.get_or_404(detection_id)
+    evidence_report = generate_evidence_report(detection)
+    if evidence_report is None:
+        return jsonify({'error': 'Report generation failed'}), 500
+
+    return send_file(
+        evidence_report.file_path,
+        as_attachment=True,
+        download_name=f"evidence_report_{detection.detection_type}_{detection.id}.pdf",
+        mimetype='application/pdf'
+    )
+
+@app.route('/reports/export')
+def export_reports():
+    """
+    Stream a ZIP of evidence reports for a filtered set of detections.
+    Query parameters: type, prediction, since, until, ids (comma separated),
+    render (1 to render reports that are missing, the default; 0 to only
+    collect existing ones). The archive ends with a manifest.json.
+    """
+    try:
+        options = listings.parse_list_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        ids = [int(i) for i in request.args.get('ids', '').split(',') if i.strip()]
+    except ValueError:
+        return jsonify({'error': 'Invalid ids'}), 400
+    render_missing = request.args.get('render', '1') != '0'
+
+    detection_ids = listings.detection_ids(options, ids, max_count=app.config['REPORT_EXPORT_MAX'])
+    if not detection_ids:
+        return jsonify({'error': 'No detections match the filters'}), 404
+
+    filename = f"evidence_reports_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    return Response(
+        stream_with_context(stream_zip(_export_entries(detection_ids, render_missing))),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+def _export_entries(detection_ids, render_missing):
+    """
+    (archive name, path) for each detection's latest completed report, then
+    the manifest. Missing reports are rendered on the report pool, keeping at
+    most twice the worker count in flight; each is yielded as soon as it is done.
+    """
+    generator = report_generator.get() if render_missing else None
+    manifest = {'generated_at': datetime.now().isoformat(), 'reports': [], 'missing': [], 'failed': []}
+    max_in_flight = max(1, 2 * report_renderer.max_workers)
+    pending = {}
+
+    def archive_name(detection):
+        return f"{detection.detection_type}/evidence_report_{detection.id}.pdf"
+
+    def finish(future):
+        detection, report_data, report_number = pending.pop(future)
+        try:
+            pdf_path = future.result()
+        except Exception as e:
+            print(f"Report generation failed for detection {detection.id}: {e}")
+            manifest['failed'].append(detection.id)
+            return None
+        db.session.add(new_evidence_report(detection, report_data, pdf_path, report_number, generator))
+        dashboard_stats.record_report()
+        db.session.commit()
+        manifest['reports'].append({'detection_id': detection.id, 'file': archive_name(detection), 'rendered': True})
+        return archive_name(detection), pdf_path
+
+    def drain(block_until):
+        # Wait only when `block_until` renders are in flight; otherwise take what has finished
+        if len(pending) >= block_until:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+        else:
+            done = [future for future in pending if future.done()]
+        for future in done:
+            entry = finish(future)
+            if entry:
+                yield entry
+
+    for detection_id in detection_ids:
+        detection = db.session.get(DetectionResult, detection_id)
+        existing = (
+            EvidenceReport.query.filter_by(detection_id=detection_id, status='completed')
+            .order_by(EvidenceReport.generated_at.desc()).first()
+        )
+        if report_exists(existing):
+            manifest['reports'].append({'detection_id': detection_id, 'file': archive_name(detection), 'rendered': False})
+            yield archive_name(detection), existing.file_path
+        elif not render_missing:
+            manifest['missing'].append(detection_id)
+        else:
+            report_data = generator.generate_court_report(detection, verify=app.config['REPORT_VERIFY_FILE_HASH'])
+            report_number = new_report_number(report_data)
+            pending[report_renderer.submit(report_data, report_number)] = (detection, report_data, report_number)
+            yield from drain(block_until=max_in_flight)
+
+    while pending:
+        yield from drain(block_until=1)
+
+    yield 'manifest.json', json.dumps(manifest, indent=2).encode()
+
+@app.route('/api/detections/<int:detection_id>/verify', methods=['POST'])
+def api_verify_detection_file(detection_id):
+    """
+    Re-hash a detection's original file against the digest recorded at upload.
+    Detections stored before digests were recorded get theirs computed now.
+    """
+    detection = DetectionResult.query.get_or_404(detection_id)
+    if detection.file_sha256 is None:
+        if not os.path.exists(detection.file_path):
+            return jsonify({'detection_id': detection.id, 'status': 'missing'}), 404
+        detection.file_sha256 = hash_file(detection.file_path)
+        detection.file_size = os.path.getsize(detection.file_path)
+        db.session.commit()
+        status = 'recorded'
+    else:
+        status = verify_file(detection.file_path, detection.file_sha256, detection.file_size)
+
+    return jsonify({
+        'detection_id': detection.id,
+        'status': status,
+        'file_sha256': detection.file_sha256,
+        'file_size': detection.file_size
+    })
+
 @app.route('/api/stats')
 def api_stats():
-    """Get dashboard statistics"""
-    total_detections = DetectionResult.query.count()
-    deepfake_count = DetectionResult.query.filter_by(detection_type='deepfake').count()
-    object_count = DetectionResult.query.filter_by(detection_type='object').count()
-    fraud_count = DetectionResult.query.filter_by(detection_type='fraud').count()
-    
+    """
+    Get dashboard statistics, from the maintained counters when
+    STATS_USE_COUNTERS is set, otherwise from one grouped aggregate query.
+    """
+    if app.config['STATS_USE_COUNTERS']:
+        counts = dashboard_stats.counter_counts(DETECTION_TYPES)
+    else:
+        counts = dashboard_stats.aggregate_counts()
+    return jsonify(dashboard_stats.stats_payload(counts, DETECTION_TYPES))
+
+@app.route('/api/warmup', methods=['POST'])
+def api_warmup():
+    """
+    Load detectors ahead of the first detection.
+    Body: {"detectors": ["deepfake", "object", "fraud", "report"]}; defaults to all.
+    """
+    payload = request.get_json(silent=True) or {}
+    names = payload.get('detectors') or list(DETECTION_TYPES) + ['report']
+    status = warm_up(names)
+    success = all(item.get('loaded') for item in status.values())
+    return jsonify({'success': success, 'components': status}), (200 if success else 500)
+
+@app.route('/api/detectors')
+def api_detectors():
+    """Get detector load status and the application startup-time breakdown"""
+    components = dict(detectors, report=report_generator)
     return jsonify({
-        'total_detections': total_detections,
-        'deepfake_detections': deepfake_count,
-        'object_detections': object_count,
-        'fraud_detections': fraud_count,
-        'reports_generated': EvidenceReport.query.count()
+        'startup': STARTUP_TIMINGS,
+        'components': {name: component.status() for name, component in components.items()}
     })
 
+@app.route('/api/workers')
+def api_workers():
+    """Get inference worker pool status"""
+    if inference_pool is None:
+        return jsonify({'enabled': False})
+    return jsonify(dict(inference_pool.stats(), enabled=True))
+
+@app.route('/api/models')
+def api_models():
+    """Get resident models, their approximate footprint and load/eviction counters"""
+    return jsonify(model_registry.stats())
+
+@app.route('/api/metrics')
+def api_metrics():
+    """Detection counters and per-stage latency histograms in Prometheus text format"""
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/cache/stats')
+def api_cache_stats():
+    """Get detection result cache hit/miss counters"""
+    return jsonify(result_cache.stats())
+
+@app.route('/api/cache/invalidate', methods=['POST'])
+def api_cache_invalidate():
+    """
+    Invalidate cached detection results.
+    Pass `detection_type` and/or `model_signature` to narrow the scope, or
+    `stale_only` (with an optional `model`) to drop entries produced by older
+    versions of the currently configured model.
+    """
+    payload = request.get_json(silent=True) or {}
+    detection_type = payload.get('detection_type')
+    model_signature = payload.get('model_signature')
+    keep_model_signature = None
+    signature_prefix = None
+
+    if payload.get('stale_only'):
+        detector = get_detector(detection_type, payload.get('model'))
+        if detector is None:
+            return jsonify({'success': False, 'error': 'stale_only requires a valid detection_type'}), 400
+        keep_model_signature = detector.model_signature
+        signature_prefix = f"{detector.model_family}|"
+
+    removed = result_cache.invalidate(
+        detection_type=detection_type,
+        model_signature=model_signature,
+        keep_model_signature=keep_model_signature,
+        signature_prefix=signature_prefix
+    )
+    return jsonify({'success': True, 'removed': removed})
+
 @app.route('/api/recent_detections')
 def api_recent_detections():
     """Get recent detections"""
@@ -225,10 +1187,32 @@ def api_recent_detections():
         'media_type': d.media_type,
         'confidence': d.confidence,
         'timestamp': d.timestamp.isoformat(),
-        'prediction': json.loads(d.result).get('prediction', 'unknown')
+        'prediction': d.prediction or 'unknown',
+        'model_name': d.model_name
     } for d in detections])
 
+def _prewarm(names):
+    with app.app_context():
+        warm_up(names)
+
+# Optional pre-warm of selected detectors, off the startup path (and not in
+# spawned worker processes, which re-import this module)
+if app.config['PREWARM_DETECTORS'] and multiprocessing.parent_process() is None:
+    threading.Thread(
+        target=_prewarm,
+        args=(app.config['PREWARM_DETECTORS'],),
+        name='detector-prewarm',
+        daemon=True
+    ).start()
+
+STARTUP_TIMINGS = {
+    'imports_seconds': _imports_finished - _startup_started,
+    'app_setup_seconds': time.perf_counter() - _imports_finished,
+    'total_seconds': time.perf_counter() - _startup_started
+}
+
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all()
+        upgrade_schema()
+    print(f"App ready in {STARTUP_TIMINGS['total_seconds']:.2f}s")
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""
+Audio decoding and resampling front-end for the audio deepfake model.
+
+Decodes straight to mono at the model's sampling rate when torchcodec is
+available (FFmpeg resamples during decode). Otherwise it falls back to
+torchaudio.load plus a `Resample` transform cached per (source, target) rate,
+so the resampling kernel is built once instead of on every call. Block-wise
+reads without torchcodec use one torchaudio StreamReader per file, which
+resamples the stream continuously rather than block by block.
+"""
+
+import threading
+import time
+from typing import Dict, Iterator, Tuple
+
+import torch
+import torchaudio
+
+try:
+    from torchcodec.decoders import AudioDecoder
+except ImportError:  # torchcodec is optional
+    AudioDecoder = None
+
+try:
+    from torchaudio.io import StreamReader
+except ImportError:  # removed in torchaudio 2.9, which decodes through torchcodec
+    StreamReader = None
+
+
+class AudioFrontend:
+    """Loads audio as a mono float32 1-D tensor at a requested sampling rate"""
+
+    def __init__(self, use_native_decoder: bool = True):
+        self.use_native_decoder = use_native_decoder and AudioDecoder is not None
+        self._resamplers: Dict[Tuple[int, int], torchaudio.transforms.Resample] = {}
+        self._lock = threading.Lock()
+
+    def resampler(self, source_sr: int, target_sr: int) -> torchaudio.transforms.Resample:
+        """Cached Resample transform for a (source, target) rate pair"""
+        key = (int(source_sr), int(target_sr))
+        with self._lock:
+            transform = self._resamplers.get(key)
+            if transform is None:
+                transform = torchaudio.transforms.Resample(orig_freq=key[0], new_freq=key[1])
+                self._resamplers[key] = transform
+        return transform
+
+    def resample(self, waveform: torch.Tensor, source_sr: int, target_sr: int) -> torch.Tensor:
+        if source_sr == target_sr:
+            return waveform
+        with torch.no_grad():
+            return self.resampler(source_sr, target_sr)(waveform)
+
+    def load(self, audio_path: str, target_sr: int) -> Tuple[torch.Tensor, int, Dict[str, float]]:
+        """
+        Decode a whole file to mono at `target_sr`.
+        Returns (samples, source_sr, timings) where timings holds decode and
+        resample seconds.
+        """
+        timings = {"decode_seconds": 0.0, "resample_seconds": 0.0}
+
+        started = time.perf_counter()
+        if self.use_native_decoder:
+            decoder = AudioDecoder(audio_path, sample_rate=target_sr, num_channels=1)
+            source_sr = decoder.metadata.sample_rate or target_sr
+            waveform = decoder.get_all_samples().data[0]
+            timings["decode_seconds"] = time.perf_counter() - started
+            return self._as_float32(waveform), source_sr, timings
+
+        waveform, source_sr = torchaudio.load(audio_path)
+        waveform = waveform.mean(dim=0) if waveform.shape[0] > 1 else waveform[0]  # Convert to mono
+        timings["decode_seconds"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        waveform = self.resample(waveform, source_sr, target_sr)
+        timings["resample_seconds"] = time.perf_counter() - started
+        return self._as_float32(waveform), source_sr, timings
+
+    def iter_blocks(self, audio_path: str, target_sr: int, block_seconds: float) -> Iterator[torch.Tensor]:
+        """Yield consecutive mono blocks of about `block_seconds` at `target_sr`"""
+        if self.use_native_decoder:
+            decoder = AudioDecoder(audio_path, sample_rate=target_sr, num_channels=1)
+            start = 0.0
+            while True:
+                try:
+                    samples = decoder.get_samples_played_in_range(start_seconds=start, stop_seconds=start + block_seconds)
+                except (RuntimeError, ValueError):
+                    # Range starts past the end of the stream
+                    break
+                block = samples.data[0]
+                if block.numel() == 0:
+                    break
+                yield self._as_float32(block)
+                if block.shape[0] < int(block_seconds * target_sr) - 1:
+                    break
+                start += block_seconds
+            return
+
+        block_samples = max(1, int(block_seconds * target_sr))
+        if StreamReader is not None:
+            # One decoder for the whole file; FFmpeg downmixes and resamples the
+            # stream continuously, so block boundaries leave no artifacts
+            reader = StreamReader(audio_path)
+            reader.add_basic_audio_stream(
+                frames_per_chunk=block_samples,
+                sample_rate=target_sr,
+                num_channels=1
+            )
+            for (chunk,) in reader.stream():
+                if chunk is not None and chunk.shape[0] > 0:
+                    yield self._as_float32(chunk[:, 0])
+            return
+
+        # No streaming decoder: decode and resample once, then slice
+        waveform, _, _ = self.load(audio_path, target_sr)
+        for start in range(0, waveform.shape[0], block_samples):
+            yield waveform[start:start + block_samples]
+
+    def _as_float32(self, waveform: torch.Tensor) -> torch.Tensor:
+        # Only copy when the dtype or layout actually requires it
+        if waveform.dtype != torch.float32:
+            waveform = waveform.to(torch.float32)
+        return waveform.contiguous()
@@ -0,0 +1,164 @@
+"""
+Batch submission: many files, or ZIP/TAR archives of them, in one request.
+
+Archive members are copied one at a time straight to disk (hashed in the
+same pass), never extracted with extractall and never held in memory whole.
+Member names are reduced to safe file names, and the item count and total
+extracted size are capped so a small archive cannot expand without bound.
+Items are then grouped by (detection type, media kind) so each group can
+go through its detector's batched path.
+"""
+
+import os
+import tarfile
+import zipfile
+from collections import OrderedDict
+
+from werkzeug.utils import secure_filename
+
+from file_integrity import COPY_CHUNK_SIZE, save_and_hash
+
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+
+MEDIA_KINDS = {
+    'image': {'png', 'jpg', 'jpeg', 'gif', 'bmp', 'webp'},
+    'video': {'mp4', 'avi', 'mov', 'mkv', 'webm'},
+    'audio': {'wav', 'flac', 'ogg', 'mp3', 'm4a', 'aac'},
+    'transaction': {'json'},
+    'transaction_batch': {'csv'},
+    'document': {'pdf', 'doc', 'docx'}
+}
+
+# Transaction files only make sense for the fraud detector, whatever the batch type
+TRANSACTION_KINDS = ('transaction', 'transaction_batch')
+
+
+class BatchLimitError(Exception):
+    """Raised when a batch exceeds its item count or extracted size limit"""
+
+
+def is_archive(filename):
+    return filename.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def file_extension(filename):
+    return filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+
+
+def media_kind(filename):
+    extension = file_extension(filename)
+    for kind, extensions in MEDIA_KINDS.items():
+        if extension in extensions:
+            return kind
+    return None
+
+
+class _LimitedReader:
+    """Read-through wrapper that fails once the batch's byte budget is spent"""
+
+    def __init__(self, stream, budget):
+        self._stream = stream
+        self._budget = budget
+
+    def read(self, size=-1):
+        data = self._stream.read(size)
+        self._budget.consume(len(data))
+        return data
+
+
+class _Budget:
+    def __init__(self, max_items, max_bytes):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.items = 0
+        self.bytes = 0
+
+    def add_item(self):
+        self.items += 1
+        if self.items > self.max_items:
+            raise BatchLimitError(f'Batch has more than {self.max_items} files')
+
+    def consume(self, size):
+        self.bytes += size
+        if self.bytes > self.max_bytes:
+            raise BatchLimitError(f'Batch expands to more than {self.max_bytes} bytes')
+
+
+class BatchExtractor:
+    """
+    Saves uploaded files and archive members into `directory`. `allowed`
+    is the set of accepted extensions; other members are listed as skipped.
+    """
+
+    def __init__(self, directory, allowed, max_items=5000, max_bytes=10 * 1024 * 1024 * 1024):
+        self.directory = directory
+        self.allowed = allowed
+        self._budget = _Budget(max_items, max_bytes)
+        self.items = []
+        self.skipped = []
+
+    def add_upload(self, file_storage):
+        """Save one uploaded file, or every allowed member of an uploaded archive"""
+        filename = file_storage.filename or ''
+        if is_archive(filename):
+            if filename.lower().endswith('.zip'):
+                self._add_zip(file_storage.stream, filename)
+            else:
+                self._add_tar(file_storage.stream, filename)
+        else:
+            self._add(filename, file_storage.stream, source=None)
+
+    def _add_zip(self, stream, archive_name):
+        # The upload is spooled by the form parser, so it is seekable
+        with zipfile.ZipFile(stream) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                with archive.open(info) as member:
+                    self._add(info.filename, member, source=archive_name)
+
+    def _add_tar(self, stream, archive_name):
+        # Stream mode reads members in order without seeking
+        with tarfile.open(fileobj=stream, mode='r|*') as archive:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                extracted = archive.extractfile(member)
+                if extracted is not None:
+                    with extracted:
+                        self._add(member.name, extracted, source=archive_name)
+
+    def _add(self, name, stream, source):
+        base_name = os.path.basename(name.replace('\\', '/'))
+        safe_name = secure_filename(base_name)
+        kind = media_kind(safe_name)
+        if not safe_name or base_name.startswith('.') or kind is None or file_extension(safe_name) not in self.allowed:
+            self.skipped.append({'name': name, 'source': source, 'reason': 'unsupported file type'})
+            return
+
+        self._budget.add_item()
+        os.makedirs(self.directory, exist_ok=True)
+        # The index keeps same-named files from different folders apart
+        file_path = os.path.join(self.directory, f"{len(self.items):05d}_{safe_name}")
+        file_hash, file_size = save_and_hash(_LimitedReader(stream, self._budget), file_path, COPY_CHUNK_SIZE)
+        self.items.append({
+            'name': name,
+            'source': source,
+            'file_path': file_path,
+            'file_sha256': file_hash,
+            'file_size': file_size,
+            'media_kind': kind
+        })
+
+
+def group_items(items, detection_type):
+    """
+    OrderedDict of (detection type, media kind) -> items. Transaction files go
+    to the fraud detector; everything else to `detection_type`.
+    """
+    groups = OrderedDict()
+    for item in items:
+        item_type = 'fraud' if item['media_kind'] in TRANSACTION_KINDS else detection_type
+        item['detection_type'] = item_type
+        groups.setdefault((item_type, item['media_kind']), []).append(item)
+    return groups
@@ -0,0 +1,123 @@
+"""
+Latency and prediction agreement of CPU inference profiles vs the fp32 baseline.
+
+Runs the deepfake image and audio models on synthetic inputs under each
+profile (fp32, int8 dynamic quantization, bf16 autocast, int8 + bf16).
+
+Usage (from ai-detection-dashboard/):
+    python benchmarks/bench_cpu_profile.py --images 32 --audio-clips 8 --threads 4
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deepfake_detection import DeepfakeDetector
+from inference_profile import InferenceProfile
+
+
+PROFILES = {
+    'fp32': dict(),
+    'int8': dict(quantize_int8=True),
+    'bf16': dict(autocast_bf16=True),
+    'int8+bf16': dict(quantize_int8=True, autocast_bf16=True)
+}
+
+
+def make_images(count, size, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, size=(size, size, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def make_audio_clips(directory, count, seconds, sample_rate=16000, seed=0):
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i in range(count):
+        t = np.arange(int(seconds * sample_rate)) / sample_rate
+        signal = 0.3 * np.sin(2 * np.pi * rng.uniform(100, 800) * t) + 0.05 * rng.standard_normal(t.shape)
+        path = os.path.join(directory, f'clip_{i}.wav')
+        with wave.open(path, 'wb') as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(sample_rate)
+            f.writeframes((np.clip(signal, -1, 1) * 32767).astype(np.int16).tobytes())
+        paths.append(path)
+    return paths
+
+
+def run_profile(name, options, images, audio_paths, threads):
+    profile = InferenceProfile(threads=threads, **options)
+    detector = DeepfakeDetector(inference_profile=profile)
+
+    # Warm up
+    detector.detect_images(images[:1])
+    if audio_paths:
+        detector.detect_audio(audio_paths[0])
+
+    started = time.perf_counter()
+    image_results = [detector.detect_images([image])[0] for image in images]
+    image_seconds = (time.perf_counter() - started) / len(images)
+
+    audio_results = []
+    audio_seconds = 0.0
+    if audio_paths:
+        started = time.perf_counter()
+        audio_results = [detector.detect_audio(path) for path in audio_paths]
+        audio_seconds = (time.perf_counter() - started) / len(audio_paths)
+
+    return {
+        'name': name,
+        'image_ms': image_seconds * 1000,
+        'audio_ms': audio_seconds * 1000,
+        'image_predictions': [r['prediction'] for r in image_results],
+        'audio_predictions': [r['prediction'] for r in audio_results]
+    }
+
+
+def agreement(predictions, baseline):
+    if not baseline:
+        return float('nan')
+    return sum(1 for a, b in zip(predictions, baseline) if a == b) / len(baseline)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--images', type=int, default=32)
+    parser.add_argument('--image-size', type=int, default=512)
+    parser.add_argument('--audio-clips', type=int, default=8)
+    parser.add_argument('--audio-seconds', type=float, default=5.0)
+    parser.add_argument('--threads', type=int, default=None)
+    parser.add_argument('--profiles', default=','.join(PROFILES), help='Comma separated subset of: ' + ', '.join(PROFILES))
+    args = parser.parse_args()
+
+    images = make_images(args.images, args.image_size)
+
+    with tempfile.TemporaryDirectory() as directory:
+        audio_paths = make_audio_clips(directory, args.audio_clips, args.audio_seconds)
+        results = [
+            run_profile(name, PROFILES[name], images, audio_paths, args.threads)
+            for name in args.profiles.split(',')
+        ]
+
+    baseline = results[0]
+    print(f"{'profile':<10} {'image ms':>9} {'speedup':>8} {'agree':>6}   {'audio ms':>9} {'speedup':>8} {'agree':>6}")
+    for result in results:
+        image_speedup = baseline['image_ms'] / result['image_ms'] if result['image_ms'] else float('nan')
+        audio_speedup = baseline['audio_ms'] / result['audio_ms'] if result['audio_ms'] else float('nan')
+        print(
+            f"{result['name']:<10} {result['image_ms']:>9.1f} {image_speedup:>7.2f}x "
+            f"{agreement(result['image_predictions'], baseline['image_predictions']):>6.0%}   "
+            f"{result['audio_ms']:>9.1f} {audio_speedup:>7.2f}x "
+            f"{agreement(result['audio_predictions'], baseline['audio_predictions']):>6.0%}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Throughput comparison: sequential vs batched deepfake image inference.
+
+Usage (from ai-detection-dashboard/):
+    python benchmarks/bench_deepfake_batch.py --images 16 --batch-size 16
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deepfake_detection import DeepfakeDetector
+
+
+def make_images(count, size, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, size=(size, size, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def time_call(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--images', type=int, default=16)
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--size', type=int, default=512, help='Synthetic image edge length in pixels')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    detector = DeepfakeDetector()
+    images = make_images(args.images, args.size)
+
+    # Warm up so lazy initialisation is not measured
+    detector.detect_images(images[:1], batch_size=1)
+
+    sequential = time_call(lambda: [detector.detect_images([image], batch_size=1) for image in images], args.repeat)
+    batched = time_call(lambda: detector.detect_images(images, batch_size=args.batch_size), args.repeat)
+
+    # Batched and sequential paths must agree
+    seq_results = [detector.detect_images([image], batch_size=1)[0] for image in images]
+    batch_results = detector.detect_images(images, batch_size=args.batch_size)
+    agreement = sum(
+        1 for a, b in zip(seq_results, batch_results) if a['prediction'] == b['prediction']
+    ) / len(images)
+
+    print(f"images: {args.images}  batch_size: {args.batch_size}  device: {detector.device}")
+    print(f"sequential: {sequential:.3f}s  ({args.images / sequential:.1f} img/s)")
+    print(f"batched:    {batched:.3f}s  ({args.images / batched:.1f} img/s)")
+    print(f"speedup:    {sequential / batched:.2f}x")
+    print(f"prediction agreement: {agreement:.0%}")
+
+
+if __name__ == '__main__':
+    main()
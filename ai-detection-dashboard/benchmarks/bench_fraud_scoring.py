@@ -0,0 +1,73 @@
+"""
+Parity and speed check: scalar vs vectorized fraud risk scoring.
+
+Usage (from ai-detection-dashboard/):
+    python benchmarks/bench_fraud_scoring.py --rows 1000000 --scalar-rows 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fraud_detection import FraudDetector
+
+
+def make_transactions(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'transaction_id': np.arange(rows),
+        'amount': rng.exponential(2000, size=rows).round(2),
+        'hour': rng.integers(0, 24, size=rows),
+        'merchant_risk': rng.random(rows),
+        'user_score': rng.random(rows),
+        'location_risk': rng.random(rows),
+        'device_id': rng.integers(0, 10000, size=rows)
+    })
+
+
+def scalar_scores(detector, df):
+    return np.array([
+        detector._calculate_risk_score(detector._extract_features(row.to_dict()))
+        for _, row in df.iterrows()
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Rows scored by the vectorized path')
+    parser.add_argument('--scalar-rows', type=int, default=50_000, help='Rows scored by the scalar path (it is slow)')
+    args = parser.parse_args()
+
+    detector = FraudDetector()
+    df = make_transactions(args.rows)
+    sample = df.head(args.scalar_rows)
+
+    started = time.perf_counter()
+    expected = scalar_scores(detector, sample)
+    scalar_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    vectorized = detector._calculate_risk_scores(df)
+    vectorized_seconds = time.perf_counter() - started
+
+    matches = np.array_equal(expected, vectorized[:len(sample)])
+    scalar_rate = len(sample) / scalar_seconds
+    vectorized_rate = len(df) / vectorized_seconds
+
+    print(f"scalar:     {len(sample):>10,} rows in {scalar_seconds:.3f}s  ({scalar_rate:,.0f} rows/s)")
+    print(f"vectorized: {len(df):>10,} rows in {vectorized_seconds:.3f}s  ({vectorized_rate:,.0f} rows/s)")
+    print(f"speedup:    {vectorized_rate / scalar_rate:.0f}x")
+    print(f"row-for-row parity on {len(sample):,} rows: {'OK' if matches else 'MISMATCH'}")
+
+    if not matches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Parity and latency of the ONNX Runtime backend vs eager PyTorch.
+
+Runs the deepfake image and audio models on synthetic inputs with both
+backends, compares class probabilities and reports per-item latency.
+Exits non-zero when the largest probability difference exceeds --tolerance
+or any prediction differs.
+
+Usage (from ai-detection-dashboard/):
+    python benchmarks/bench_onnx_parity.py --images 16 --audio-clips 4 --onnx-cache-dir /tmp/onnx
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_cpu_profile import make_images, make_audio_clips
+from deepfake_detection import DeepfakeDetector
+
+
+def image_probabilities(detector, images):
+    image_processor, image_model = detector._image_components()
+    inputs = image_processor(images=list(images), return_tensors="pt")
+    with torch.inference_mode():
+        return torch.softmax(image_model(**inputs).logits.float(), dim=-1).numpy()
+
+
+def audio_probabilities(detector, audio_paths):
+    feature_extractor, audio_model = detector._audio_components()
+    sampling_rate = feature_extractor.sampling_rate
+    rows = []
+    for path in audio_paths:
+        waveform, _, _ = detector.audio_frontend.load(path, sampling_rate)
+        inputs = feature_extractor(waveform.numpy(), sampling_rate=sampling_rate, return_tensors="pt")
+        with torch.inference_mode():
+            rows.append(torch.softmax(audio_model(**inputs).logits.float(), dim=-1).numpy()[0])
+    return np.stack(rows) if rows else np.zeros((0, 0))
+
+
+def run_backend(backend, images, audio_paths, cache_dir, threads):
+    from inference_profile import InferenceProfile
+    detector = DeepfakeDetector(
+        device=torch.device("cpu"),
+        backend=backend,
+        onnx_cache_dir=cache_dir,
+        inference_profile=InferenceProfile(threads=threads)
+    )
+
+    # Warm up (and export on the first ONNX run)
+    image_probabilities(detector, images[:1])
+
+    started = time.perf_counter()
+    image_probs = np.concatenate([image_probabilities(detector, [image]) for image in images])
+    image_ms = (time.perf_counter() - started) * 1000 / len(images)
+
+    audio_probs = audio_probabilities(detector, audio_paths[:1])
+    started = time.perf_counter()
+    audio_probs = audio_probabilities(detector, audio_paths)
+    audio_ms = (time.perf_counter() - started) * 1000 / len(audio_paths) if audio_paths else 0.0
+
+    return {'image_probs': image_probs, 'audio_probs': audio_probs, 'image_ms': image_ms, 'audio_ms': audio_ms}
+
+
+def compare(name, reference, candidate):
+    if reference.size == 0:
+        return 0.0, True
+    max_diff = float(np.abs(reference - candidate).max())
+    same = bool((reference.argmax(axis=-1) == candidate.argmax(axis=-1)).all())
+    print(f"{name:<6} max |dp| = {max_diff:.2e}   predictions {'match' if same else 'DIFFER'}")
+    return max_diff, same
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--images', type=int, default=16)
+    parser.add_argument('--image-size', type=int, default=512)
+    parser.add_argument('--audio-clips', type=int, default=4)
+    parser.add_argument('--audio-seconds', type=float, default=5.0)
+    parser.add_argument('--threads', type=int, default=None)
+    parser.add_argument('--tolerance', type=float, default=1e-3)
+    parser.add_argument('--onnx-cache-dir', default=None, help='Defaults to a fresh temporary directory')
+    args = parser.parse_args()
+
+    images = make_images(args.images, args.image_size)
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache_dir = args.onnx_cache_dir or os.path.join(directory, 'onnx')
+        audio_paths = make_audio_clips(directory, args.audio_clips, args.audio_seconds)
+        torch_run = run_backend('torch', images, audio_paths, cache_dir, args.threads)
+        onnx_run = run_backend('onnx', images, audio_paths, cache_dir, args.threads)
+
+    image_diff, image_same = compare('image', torch_run['image_probs'], onnx_run['image_probs'])
+    audio_diff, audio_same = compare('audio', torch_run['audio_probs'], onnx_run['audio_probs'])
+
+    print(f"{'backend':<8} {'image ms':>9} {'audio ms':>9}")
+    for name, run in (('torch', torch_run), ('onnx', onnx_run)):
+        print(f"{name:<8} {run['image_ms']:>9.1f} {run['audio_ms']:>9.1f}")
+
+    ok = image_same and audio_same and max(image_diff, audio_diff) <= args.tolerance
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,373 @@
+"""
+End-to-end benchmark suite for every detector path and the HTTP pipeline.
+
+Generates synthetic images, videos, audio clips, JSON transactions and a large
+CSV in a temporary directory, then times each case:
+
+    deepfake.image / deepfake.images_batch / deepfake.video / deepfake.audio
+    object.image / object.video
+    fraud.json / fraud.csv / fraud.csv_streaming
+    report.pdf
+    http.deepfake / http.object / http.fraud   (POST /detection via the Flask test client)
+
+For each case it records throughput, p50/p95/mean latency and peak memory
+(process max RSS; Python heap peak with --trace-memory) and writes them to a
+JSON file with stable keys, so runs can be compared with --baseline.
+
+--stub-models swaps the Hugging Face and YOLO networks for tiny stand-ins
+(benchmarks/stub_models.py) so the suite runs offline and measures everything
+around the model.
+
+Usage (from ai-detection-dashboard/):
+    python benchmarks/bench_suite.py --stub-models --output bench.json
+    python benchmarks/bench_suite.py --stub-models --output new.json --baseline bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import wave
+from datetime import datetime
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, APP_DIR)
+
+
+# Synthetic inputs
+
+def make_images(directory, count, size, rng):
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f'image_{i}.png')
+        cv2.imwrite(path, rng.integers(0, 256, size=(size, size, 3), dtype=np.uint8))
+        paths.append(path)
+    return paths
+
+
+def make_videos(directory, count, seconds, size, rng, fps=30):
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f'video_{i}.mp4')
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (size, size))
+        base = rng.integers(0, 256, size=(size, size, 3), dtype=np.uint8)
+        for frame_index in range(int(seconds * fps)):
+            writer.write(np.roll(base, frame_index * 4, axis=1))
+        writer.release()
+        paths.append(path)
+    return paths
+
+
+def make_audio_clips(directory, count, seconds, rng, sample_rate=16000):
+    paths = []
+    for i in range(count):
+        t = np.arange(int(seconds * sample_rate)) / sample_rate
+        signal = 0.3 * np.sin(2 * np.pi * rng.uniform(100, 800) * t) + 0.05 * rng.standard_normal(t.shape)
+        path = os.path.join(directory, f'clip_{i}.wav')
+        with wave.open(path, 'wb') as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(sample_rate)
+            f.writeframes((np.clip(signal, -1, 1) * 32767).astype(np.int16).tobytes())
+        paths.append(path)
+    return paths
+
+
+def make_transaction_jsons(directory, count, rng):
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f'transaction_{i}.json')
+        with open(path, 'w') as f:
+            json.dump({
+                'transaction_id': i,
+                'amount': round(float(rng.exponential(2000)), 2),
+                'hour': int(rng.integers(0, 24)),
+                'merchant_risk': float(rng.random()),
+                'user_score': float(rng.random()),
+                'location_risk': float(rng.random()),
+                'device_id': f'device-{int(rng.integers(0, 10000))}'
+            }, f)
+        paths.append(path)
+    return paths
+
+
+def make_transactions_csv(directory, rows, rng):
+    path = os.path.join(directory, 'transactions.csv')
+    pd.DataFrame({
+        'transaction_id': np.arange(rows),
+        'amount': rng.exponential(2000, size=rows).round(2),
+        'hour': rng.integers(0, 24, size=rows),
+        'merchant_risk': rng.random(rows),
+        'user_score': rng.random(rows),
+        'location_risk': rng.random(rows),
+        'device_id': rng.integers(0, 10000, size=rows)
+    }).to_csv(path, index=False)
+    return path
+
+
+# Measurement
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure(fn, items, repeat=1, warmup=1, units_per_item=1, trace_memory=False):
+    """Call fn(item) for every item `repeat` times; returns latency/throughput/memory stats"""
+    for item in items[:warmup]:
+        fn(item)
+
+    if trace_memory:
+        tracemalloc.start()
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            call_started = time.perf_counter()
+            fn(item)
+            latencies.append(time.perf_counter() - call_started)
+    total = time.perf_counter() - started
+
+    python_peak_mb = None
+    if trace_memory:
+        python_peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'calls': len(latencies),
+        'total_seconds': total,
+        'throughput_per_second': len(latencies) * units_per_item / total if total else None,
+        'units_per_call': units_per_item,
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p95_ms': float(np.percentile(latencies_ms, 95)),
+        'mean_ms': float(latencies_ms.mean()),
+        'peak_rss_mb': peak_rss_mb(),
+        'python_peak_mb': python_peak_mb
+    }
+
+
+def check_result(result):
+    if isinstance(result, dict) and result.get('prediction') == 'error':
+        raise RuntimeError(result.get('error', 'detector returned an error'))
+    return result
+
+
+# Cases
+
+def build_detectors(args):
+    if args.stub_models:
+        from stub_models import stub_deepfake_detector, stub_object_detector
+        deepfake = stub_deepfake_detector()
+        obj = stub_object_detector()
+    else:
+        from deepfake_detection import DeepfakeDetector
+        from object_detection import ObjectDetector
+        deepfake = DeepfakeDetector()
+        obj = ObjectDetector()
+
+    from fraud_detection import FraudDetector
+    fraud = FraudDetector()
+    fraud_streaming = FraudDetector(stream_threshold_bytes=0, chunk_rows=args.csv_chunk_rows)
+    return {'deepfake': deepfake, 'object': obj, 'fraud': fraud, 'fraud_streaming': fraud_streaming}
+
+
+def detector_cases(args, data, detectors):
+    deepfake, obj = detectors['deepfake'], detectors['object']
+    fraud, fraud_streaming = detectors['fraud'], detectors['fraud_streaming']
+    image_arrays = [cv2.cvtColor(cv2.imread(path), cv2.COLOR_BGR2RGB) for path in data['images']]
+    csv_rows = args.csv_rows
+
+    return {
+        'deepfake.image': (lambda p: check_result(deepfake.detect(p)), data['images'], 1),
+        'deepfake.images_batch': (lambda batch: deepfake.detect_images(batch), [image_arrays], len(image_arrays)),
+        'deepfake.video': (lambda p: check_result(deepfake.detect(p)), data['videos'], 1),
+        'deepfake.audio': (lambda p: check_result(deepfake.detect(p)), data['audio'], 1),
+        'object.image': (lambda p: check_result(obj.detect(p)), data['images'], 1),
+        'object.video': (lambda p: check_result(obj.detect(p)), data['videos'], 1),
+        'fraud.json': (lambda p: check_result(fraud.detect(p)), data['transactions'], 1),
+        'fraud.csv': (lambda p: check_result(fraud.detect(p)), [data['csv']], csv_rows),
+        'fraud.csv_streaming': (lambda p: check_result(fraud_streaming.detect(p)), [data['csv']], csv_rows)
+    }
+
+
+def report_case(data, detectors):
+    from evidence_report_generator import EvidenceReportGenerator
+    generator = EvidenceReportGenerator()
+    result = detectors['fraud'].detect(data['transactions'][0])
+    record = SimpleNamespace(
+        id=1,
+        detection_type='fraud',
+        file_path=data['transactions'][0],
+        timestamp=datetime.now(),
+        user_id=None,
+        result=json.dumps(result)
+    )
+
+    def render(record):
+        report_data = generator.generate_court_report(record)
+        return generator.create_pdf_report(report_data, record.id)
+
+    return {'report.pdf': (render, [record], 1)}
+
+
+def http_cases(args, data, detectors):
+    # Configure the app before importing it: throwaway database, no result cache, in-process inference
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(os.getcwd(), 'bench.db')}"
+    os.environ['RESULT_CACHE_ENABLED'] = 'false'
+    os.environ['INFERENCE_WORKERS'] = '0'
+    os.environ['PREWARM_DETECTORS'] = ''
+
+    import app as app_module
+    flask_app = app_module.app
+    flask_app.config['UPLOAD_FOLDER'] = os.path.join(os.getcwd(), 'uploads')
+    with flask_app.app_context():
+        app_module.db.create_all()
+
+    if args.stub_models:
+        app_module.DETECTOR_BUILDERS['deepfake'] = lambda model_name: detectors['deepfake']
+        app_module.DETECTOR_BUILDERS['object'] = lambda model_name: detectors['object']
+
+    client = flask_app.test_client()
+
+    def post(detection_type):
+        def call(path):
+            with open(path, 'rb') as f:
+                response = client.post('/detection', data={
+                    'file': (f, os.path.basename(path)),
+                    'detection_type': detection_type
+                }, content_type='multipart/form-data')
+            if response.status_code != 200:
+                raise RuntimeError(f"/detection returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+            return response
+        return call
+
+    return {
+        'http.deepfake': (post('deepfake'), data['images'], 1),
+        'http.object': (post('object'), data['images'], 1),
+        'http.fraud': (post('fraud'), data['transactions'], 1)
+    }
+
+
+# Reporting
+
+def print_table(cases, baseline=None):
+    print(f"{'case':<24} {'calls':>6} {'thru/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'rss MB':>8}   {'p50 vs base':>11}")
+    for name, stats in cases.items():
+        if 'error' in stats:
+            print(f"{name:<24} failed: {stats['error']}")
+            continue
+        delta = ''
+        base = (baseline or {}).get(name)
+        if base and 'p50_ms' in base and base['p50_ms']:
+            delta = f"{stats['p50_ms'] / base['p50_ms']:>10.2f}x"
+        print(
+            f"{name:<24} {stats['calls']:>6} {stats['throughput_per_second']:>10.1f} "
+            f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['peak_rss_mb']:>8.0f}   {delta:>11}"
+        )
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=APP_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', default=None, help='Earlier output file to compare p50 latency against')
+    parser.add_argument('--stub-models', action='store_true', help='Replace the HF/YOLO networks with tiny offline stubs')
+    parser.add_argument('--only', default=None, help='Comma separated case name prefixes, e.g. deepfake,http')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--images', type=int, default=8)
+    parser.add_argument('--image-size', type=int, default=512)
+    parser.add_argument('--videos', type=int, default=2)
+    parser.add_argument('--video-seconds', type=float, default=4.0)
+    parser.add_argument('--video-size', type=int, default=320)
+    parser.add_argument('--audio-clips', type=int, default=4)
+    parser.add_argument('--audio-seconds', type=float, default=12.0)
+    parser.add_argument('--transactions', type=int, default=32)
+    parser.add_argument('--csv-rows', type=int, default=200_000)
+    parser.add_argument('--csv-chunk-rows', type=int, default=50_000)
+    parser.add_argument('--trace-memory', action='store_true', help='Also record Python heap peak (slows Python-heavy cases)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    output_path = os.path.abspath(args.output)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['cases']
+
+    prefixes = args.only.split(',') if args.only else None
+    rng = np.random.default_rng(args.seed)
+    original_dir = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # Uploads, reports and the database all land in the temporary directory
+        os.chdir(workdir)
+        try:
+            data = {
+                'images': make_images(workdir, args.images, args.image_size, rng),
+                'videos': make_videos(workdir, args.videos, args.video_seconds, args.video_size, rng),
+                'audio': make_audio_clips(workdir, args.audio_clips, args.audio_seconds, rng),
+                'transactions': make_transaction_jsons(workdir, args.transactions, rng),
+                'csv': make_transactions_csv(workdir, args.csv_rows, rng)
+            }
+
+            detectors = build_detectors(args)
+            cases = detector_cases(args, data, detectors)
+            cases.update(report_case(data, detectors))
+            if not prefixes or any(p.startswith('http') for p in prefixes):
+                cases.update(http_cases(args, data, detectors))
+
+            results = {}
+            for name, (fn, items, units) in cases.items():
+                if prefixes and not any(name.startswith(p) for p in prefixes):
+                    continue
+                print(f"Running {name}...")
+                try:
+                    results[name] = measure(fn, items, repeat=args.repeat, units_per_item=units, trace_memory=args.trace_memory)
+                except Exception as e:
+                    results[name] = {'error': str(e)}
+        finally:
+            os.chdir(original_dir)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'stub_models': args.stub_models,
+            'args': vars(args)
+        },
+        'cases': results
+    }
+    with open(output_path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print_table(results, baseline)
+    print(f"Results written to {output_path}")
+
+
+if __name__ == '__main__':
+    main()
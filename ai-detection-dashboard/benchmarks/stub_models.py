@@ -0,0 +1,110 @@
+"""
+Tiny stand-ins for the Hugging Face and YOLO models so the benchmark suite can
+run offline. They are called exactly like the real models, which keeps the
+detector code paths (decode, preprocessing, batching, result building) intact;
+only the network itself is replaced by a few cheap tensor operations.
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import torch
+from transformers import BatchFeature
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_registry import ModelRegistry
+
+
+class StubImageProcessor:
+    size = 32
+
+    def __call__(self, images, return_tensors="pt"):
+        arrays = [cv2.resize(np.asarray(image), (self.size, self.size)) for image in images]
+        pixel_values = torch.from_numpy(np.stack(arrays)).permute(0, 3, 1, 2).float() / 255.0
+        return BatchFeature({"pixel_values": pixel_values}, tensor_type=return_tensors)
+
+
+class StubImageModel(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.config = SimpleNamespace(id2label={0: "real", 1: "fake"}, num_labels=2)
+        self.head = torch.nn.Linear(3, 2)
+
+    def forward(self, pixel_values):
+        return SimpleNamespace(logits=self.head(pixel_values.mean(dim=(2, 3))))
+
+
+class StubFeatureExtractor:
+    sampling_rate = 16000
+
+    def __call__(self, raw_speech, sampling_rate=None, return_tensors="pt", padding=False):
+        clips = raw_speech if isinstance(raw_speech, list) else [raw_speech]
+        length = max(len(clip) for clip in clips)
+        input_values = np.zeros((len(clips), length), dtype=np.float32)
+        for i, clip in enumerate(clips):
+            input_values[i, :len(clip)] = clip
+        return BatchFeature({"input_values": torch.from_numpy(input_values)}, tensor_type=return_tensors)
+
+
+class StubAudioModel(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.config = SimpleNamespace(id2label={0: "real", 1: "fake"}, num_labels=2)
+        self.head = torch.nn.Linear(2, 2)
+
+    def forward(self, input_values):
+        stats = torch.stack((input_values.abs().mean(dim=1), input_values.std(dim=1)), dim=1)
+        return SimpleNamespace(logits=self.head(stats))
+
+
+class StubYOLO:
+    """
+    Returns one fixed box per image, with the same result structure as
+    ultralytics. Like YOLO, `source` is a path, a BGR array, or a list of
+    either, and a list gets one result per element.
+    """
+
+    names = {0: "person", 1: "car"}
+
+    def __call__(self, source, verbose=False):
+        sources = source if isinstance(source, (list, tuple)) else [source]
+        results = []
+        for item in sources:
+            frame = cv2.imread(str(item)) if isinstance(item, (str, os.PathLike)) else item
+            height, width = frame.shape[:2]
+            boxes = _Boxes(
+                xyxy=torch.tensor([[0.0, 0.0, width / 2, height / 2]]),
+                conf=torch.tensor([float(frame.mean()) / 255.0]),
+                cls=torch.tensor([0.0])
+            )
+            results.append(SimpleNamespace(boxes=boxes))
+        return results
+
+
+class _Boxes:
+    def __init__(self, xyxy, conf, cls):
+        self.xyxy = xyxy
+        self.conf = conf
+        self.cls = cls
+
+    def __len__(self):
+        return len(self.conf)
+
+
+def stub_deepfake_detector(**options):
+    from deepfake_detection import DeepfakeDetector
+    detector = DeepfakeDetector(device=torch.device("cpu"), registry=ModelRegistry(), preload=False, **options)
+    detector._load_image_components = lambda: (StubImageProcessor(), StubImageModel().eval())
+    detector._load_audio_components = lambda: (StubFeatureExtractor(), StubAudioModel().eval())
+    return detector
+
+
+def stub_object_detector(**options):
+    from object_detection import ObjectDetector
+    registry = ModelRegistry()
+    registry.get("yolo:stub.pt", StubYOLO)
+    return ObjectDetector(model_path="stub.pt", registry=registry, **options)
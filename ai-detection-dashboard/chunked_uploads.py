@@ -0,0 +1,241 @@
+"""
+Chunked, resumable uploads for media larger than a single request allows.
+
+A client creates an upload session with the file's name, size and SHA-256,
+sends the bytes in order as raw chunk requests at the session's current
+offset, and finalizes it. Chunks are streamed straight to a partial file, so
+memory stays bounded by the copy buffer. The partial file's size is the
+acknowledged offset: after a dropped connection the client asks for the
+offset and resumes from there. The SHA-256 is computed as chunks arrive and
+checked on finalize; if the running digest was lost (a restart, a failed
+write) the partial file is re-hashed instead.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+
+from file_integrity import COPY_CHUNK_SIZE, hash_file
+
+# uuid4().hex, as generated by create()
+UPLOAD_ID_PATTERN = re.compile(r'[0-9a-f]{32}')
+
+
+class UploadError(Exception):
+    """Raised for an invalid operation on an upload session"""
+
+
+class UploadNotFoundError(UploadError):
+    """Raised when the upload session does not exist (or has expired)"""
+
+
+class UploadOffsetError(UploadError):
+    """Raised when a chunk does not start at the session's current offset"""
+
+    def __init__(self, expected_offset):
+        super().__init__(f'Chunk must start at offset {expected_offset}')
+        self.expected_offset = expected_offset
+
+
+class UploadHashMismatchError(UploadError):
+    """Raised on finalize when the assembled file does not match the declared SHA-256"""
+
+
+class ChunkedUploadStore:
+    """
+    Upload sessions kept in `directory` as a partial file plus a JSON sidecar,
+    so they survive restarts. Sessions untouched for `ttl_seconds` are removed.
+    """
+
+    def __init__(self, directory, max_size, ttl_seconds=24 * 3600):
+        self.directory = directory
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._session_locks = {}
+        # upload id -> (running SHA-256, offset it covers)
+        self._hashers = {}
+
+    def create(self, filename, detection_type, size, sha256, model_name=None, generate_report=False):
+        """Start an upload session; returns its state dict"""
+        if size <= 0:
+            raise UploadError('Upload size must be positive')
+        if size > self.max_size:
+            raise UploadError(f'Upload exceeds the {self.max_size} byte limit')
+        if not re.fullmatch(r'[0-9a-fA-F]{64}', sha256 or ''):
+            raise UploadError('sha256 must be a 64 character hex digest')
+
+        self.cleanup_expired()
+        os.makedirs(self.directory, exist_ok=True)
+
+        upload_id = uuid.uuid4().hex
+        state = {
+            'upload_id': upload_id,
+            'filename': filename,
+            'detection_type': detection_type,
+            'model_name': model_name,
+            'generate_report': bool(generate_report),
+            'size': size,
+            'sha256': sha256.lower(),
+            'created_at': time.time()
+        }
+        with open(self._state_path(upload_id), 'w') as f:
+            json.dump(state, f)
+        open(self._partial_path(upload_id), 'wb').close()
+
+        with self._lock:
+            self._hashers[upload_id] = (hashlib.sha256(), 0)
+        return self.status(upload_id)
+
+    def status(self, upload_id):
+        """Session state with the current `offset`"""
+        with self._session_lock(upload_id):
+            state = self._load(upload_id)
+            state['offset'] = self._offset(upload_id)
+            state['complete'] = state['offset'] == state['size']
+            return state
+
+    def append(self, upload_id, offset, stream, chunk_size=COPY_CHUNK_SIZE):
+        """
+        Write a chunk read from `stream` at `offset`, which must equal the
+        current offset. Returns the new offset.
+        """
+        with self._session_lock(upload_id):
+            state = self._load(upload_id)
+            partial_path = self._partial_path(upload_id)
+            current = self._offset(upload_id)
+            if offset != current:
+                raise UploadOffsetError(current)
+
+            with self._lock:
+                hasher, hashed_offset = self._hashers.pop(upload_id, (None, None))
+            if hashed_offset != current:
+                hasher = None
+
+            written = current
+            try:
+                with open(partial_path, 'ab') as out:
+                    for chunk in iter(lambda: stream.read(chunk_size), b''):
+                        if written + len(chunk) > state['size']:
+                            raise UploadError(f"Chunk runs past the declared size of {state['size']} bytes")
+                        out.write(chunk)
+                        written += len(chunk)
+                        if hasher is not None:
+                            hasher.update(chunk)
+            finally:
+                # A chunk cut short still counts up to the bytes written; the digest follows it
+                if hasher is not None:
+                    with self._lock:
+                        self._hashers[upload_id] = (hasher, written)
+            return written
+
+    def finalize(self, upload_id, destination):
+        """
+        Check the assembled file's size and SHA-256 and move it to
+        `destination`. Returns (sha256 hex, size). A file that fails the hash
+        check is discarded.
+        """
+        with self._session_lock(upload_id):
+            state = self.status(upload_id)
+            if not state['complete']:
+                raise UploadError(f"Upload incomplete: {state['offset']} of {state['size']} bytes received")
+
+            partial_path = self._partial_path(upload_id)
+            with self._lock:
+                hasher, hashed_offset = self._hashers.pop(upload_id, (None, None))
+            digest = hasher.hexdigest() if hashed_offset == state['size'] else hash_file(partial_path)
+
+            if digest != state['sha256']:
+                self._remove(upload_id)
+                raise UploadHashMismatchError(f"SHA-256 mismatch: expected {state['sha256']}, received {digest}")
+
+            os.makedirs(os.path.dirname(destination) or '.', exist_ok=True)
+            shutil.move(partial_path, destination)
+            self._remove(upload_id)
+            return digest, state['size']
+
+    def abort(self, upload_id):
+        with self._session_lock(upload_id):
+            self._load(upload_id)
+            self._remove(upload_id)
+
+    def cleanup_expired(self):
+        """Remove sessions with no activity for `ttl_seconds`; returns how many"""
+        if not os.path.isdir(self.directory):
+            return 0
+        cutoff = time.time() - self.ttl_seconds
+        removed = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            upload_id = name[:-len('.json')]
+            try:
+                lock = self._session_lock(upload_id)
+            except UploadNotFoundError:
+                # Removed meanwhile, or not a session file
+                continue
+            # A session busy with a chunk or finalize is not idle
+            if not lock.acquire(blocking=False):
+                continue
+            try:
+                partial_path = self._partial_path(upload_id)
+                try:
+                    last_activity = os.path.getmtime(partial_path if os.path.exists(partial_path) else self._state_path(upload_id))
+                except FileNotFoundError:
+                    continue
+                if last_activity < cutoff:
+                    self._remove(upload_id)
+                    removed += 1
+            finally:
+                lock.release()
+        return removed
+
+    def _load(self, upload_id):
+        # Ids are generated hex; anything else cannot name a session file
+        if not UPLOAD_ID_PATTERN.fullmatch(upload_id):
+            raise UploadNotFoundError('Upload not found')
+        try:
+            with open(self._state_path(upload_id)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise UploadNotFoundError('Upload not found') from None
+
+    def _offset(self, upload_id):
+        # The partial file's size is the acknowledged offset
+        try:
+            return os.path.getsize(self._partial_path(upload_id))
+        except FileNotFoundError:
+            raise UploadNotFoundError('Upload not found') from None
+
+    def _remove(self, upload_id):
+        with self._session_lock(upload_id):
+            self._remove_files(upload_id)
+
+    def _remove_files(self, upload_id):
+        for path in (self._partial_path(upload_id), self._state_path(upload_id)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._hashers.pop(upload_id, None)
+            self._session_locks.pop(upload_id, None)
+
+    def _session_lock(self, upload_id):
+        # Re-entrant: finalize and abort call status and _remove while holding it.
+        # Only existing sessions get a lock, so unknown ids cannot grow the table.
+        if not UPLOAD_ID_PATTERN.fullmatch(upload_id) or not os.path.exists(self._state_path(upload_id)):
+            raise UploadNotFoundError('Upload not found')
+        with self._lock:
+            return self._session_locks.setdefault(upload_id, threading.RLock())
+
+    def _partial_path(self, upload_id):
+        return os.path.join(self.directory, f'{upload_id}.part')
+
+    def _state_path(self, upload_id):
+        return os.path.join(self.directory, f'{upload_id}.json')
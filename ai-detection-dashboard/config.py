@@ -15,15 +15,92 @@ class Config:
         'pdf', 'doc', 'docx', 'json', 'csv'  # Documents
     }
 
+    # Chunked, resumable uploads (each chunk request is still bound by MAX_CONTENT_LENGTH)
+    CHUNKED_UPLOAD_FOLDER = os.environ.get('CHUNKED_UPLOAD_FOLDER', 'uploads/partial')
+    CHUNKED_UPLOAD_MAX_SIZE = int(os.environ.get('CHUNKED_UPLOAD_MAX_SIZE', 20 * 1024 * 1024 * 1024))  # 20GB
+    CHUNKED_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # Suggested to clients
+    CHUNKED_UPLOAD_TTL_HOURS = int(os.environ.get('CHUNKED_UPLOAD_TTL_HOURS', 24))
+
+    # Async detection jobs
+    DETECTION_JOB_WORKERS = int(os.environ.get('DETECTION_JOB_WORKERS', 2))
+    DETECTION_JOB_QUEUE_SIZE = int(os.environ.get('DETECTION_JOB_QUEUE_SIZE', 256))
+
+    # Detection result cache
+    RESULT_CACHE_ENABLED = os.environ.get('RESULT_CACHE_ENABLED', 'true').lower() == 'true'
+    RESULT_CACHE_MEMORY_ENTRIES = int(os.environ.get('RESULT_CACHE_MEMORY_ENTRIES', 512))
+
+    # Batch transaction analysis
+    BATCH_MAX_CONTENT_LENGTH = 2 * 1024 * 1024 * 1024  # 2GB, /detection/transactions and /detection/batch only
+    FRAUD_STREAM_THRESHOLD_BYTES = 8 * 1024 * 1024  # Stream CSVs from 8MB upwards
+    FRAUD_CSV_CHUNK_ROWS = 100000
+    FRAUD_TOP_K = 100
+
+    # Batch submission (/detection/batch): many files or a ZIP/TAR archive
+    BATCH_MAX_FILES = int(os.environ.get('BATCH_MAX_FILES', 5000))
+    BATCH_MAX_EXTRACTED_BYTES = int(os.environ.get('BATCH_MAX_EXTRACTED_BYTES', 10 * 1024 * 1024 * 1024))  # 10GB
+    BATCH_IMAGE_SIZE = int(os.environ.get('BATCH_IMAGE_SIZE', 16))  # Images per forward pass
+    BATCH_INSERT_SIZE = 500  # DetectionResult rows per bulk insert and commit
+
+    # Detectors to load in the background at startup, e.g. "deepfake,object,report"
+    PREWARM_DETECTORS = [name.strip() for name in os.environ.get('PREWARM_DETECTORS', '').split(',') if name.strip()]
+
     # Model paths
     YOLO_MODEL_PATH = 'yolov8n.pt'  # YOLOv8 is in root directory
     # Note: Deepfake models download automatically from Hugging Face
     FRAUD_MODEL_PATH = 'models/weights/fraud_detection.pkl'
 
+    # Selectable model variants per detection type; the first entry is the default
+    MODEL_VARIANTS = {
+        'deepfake': os.environ.get('DEEPFAKE_IMAGE_MODELS', 'Organika/sdxl-detector').split(','),
+        'object': os.environ.get('YOLO_MODELS', YOLO_MODEL_PATH).split(','),
+        'fraud': [FRAUD_MODEL_PATH]
+    }
+
+    # Out-of-process inference workers (0 = run detectors in the web process)
+    INFERENCE_WORKERS = int(os.environ.get('INFERENCE_WORKERS', 0))
+    INFERENCE_WORKER_THREADS = int(os.environ.get('INFERENCE_WORKER_THREADS', 0))  # torch threads per worker, 0 = default
+    INFERENCE_TASK_TIMEOUT = int(os.environ.get('INFERENCE_TASK_TIMEOUT', 600))  # seconds
+
+    # Video frame sampling: longest side of sampled frames (0 = full resolution), and
+    # the gap in frames above which uniform sampling seeks instead of reading through (0 = never seek)
+    FRAME_MAX_SIDE = int(os.environ.get('FRAME_MAX_SIDE', 0))
+    FRAME_SEEK_THRESHOLD = int(os.environ.get('FRAME_SEEK_THRESHOLD', 300))
+
+    # Long audio can be analyzed in overlapping windows, classified in batches (opt-in)
+    AUDIO_WINDOW_SECONDS = float(os.environ.get('AUDIO_WINDOW_SECONDS', 0))  # 0 = single pass over the whole file
+    AUDIO_HOP_SECONDS = float(os.environ.get('AUDIO_HOP_SECONDS', 5))
+    AUDIO_BATCH_SIZE = int(os.environ.get('AUDIO_BATCH_SIZE', 8))
+
+    # CPU inference profile for the deepfake image/audio models
+    INFERENCE_THREADS = int(os.environ.get('INFERENCE_THREADS', 0))  # torch intra-op threads, 0 = default
+    INFERENCE_INTEROP_THREADS = int(os.environ.get('INFERENCE_INTEROP_THREADS', 0))
+    INFERENCE_QUANTIZE_INT8 = os.environ.get('INFERENCE_QUANTIZE_INT8', 'false').lower() == 'true'
+    INFERENCE_AUTOCAST_BF16 = os.environ.get('INFERENCE_AUTOCAST_BF16', 'false').lower() == 'true'
+    # 'torch' or 'onnx' (exported once to ONNX_CACHE_DIR, run with ONNX Runtime on CPU)
+    INFERENCE_BACKEND = os.environ.get('INFERENCE_BACKEND', 'torch').lower()
+    ONNX_CACHE_DIR = os.environ.get('ONNX_CACHE_DIR', 'models/onnx')
+
+    # Resident model memory budget; least recently used models are evicted above it (0 = unlimited)
+    MODEL_MEMORY_BUDGET_MB = int(os.environ.get('MODEL_MEMORY_BUDGET_MB', 0))
+
+    # Serve /api/stats from counters maintained on insert instead of an aggregate query
+    STATS_USE_COUNTERS = os.environ.get('STATS_USE_COUNTERS', 'false').lower() == 'true'
+
+    # Page sizes for the /results and /reports lists
+    LIST_PAGE_SIZE = int(os.environ.get('LIST_PAGE_SIZE', 50))
+    LIST_MAX_PAGE_SIZE = int(os.environ.get('LIST_MAX_PAGE_SIZE', 200))
+
     # Evidence report settings
     EVIDENCE_TEMPLATE_PATH = 'evidence/templates/court_evidence_template.html'
     REPORTS_FOLDER = 'evidence/exports'
     REPORT_RETENTION_DAYS = 365
+    # Re-hash the original file when generating a report instead of trusting the upload-time digest
+    REPORT_VERIFY_FILE_HASH = os.environ.get('REPORT_VERIFY_FILE_HASH', 'false').lower() == 'true'
+    # PDF rendering processes (0 = render in the request thread) and per-report wait
+    REPORT_RENDER_WORKERS = int(os.environ.get('REPORT_RENDER_WORKERS', 2))
+    REPORT_RENDER_TIMEOUT = float(os.environ.get('REPORT_RENDER_TIMEOUT', 120))
+    # Most detections one /reports/export archive may cover
+    REPORT_EXPORT_MAX = int(os.environ.get('REPORT_EXPORT_MAX', 500))
 
     # Security
     SESSION_COOKIE_SECURE = True
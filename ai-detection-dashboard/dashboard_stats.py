@@ -0,0 +1,104 @@
+"""
+Dashboard statistics.
+
+`aggregate_counts()` computes every count in a single statement: one grouped
+query over the indexed `detection_type` column, plus the report count.
+`StatCounter` rows are incremented inside the transaction that inserts a
+detection or report, so `counter_counts()` is a constant-cost read. Counters
+are seeded from the aggregate the first time they are read.
+"""
+
+from sqlalchemy import delete, func, literal, select, union_all, update
+from sqlalchemy.exc import IntegrityError
+
+from database_models import db, DetectionResult, EvidenceReport, StatCounter
+
+REPORTS = 'reports'
+SEEDED = '_seeded'  # present once the counters reflect all existing rows
+
+
+def detection_counter(detection_type):
+    return f"detections:{detection_type}"
+
+
+def aggregate_counts():
+    """{counter name: count} straight from the detection and report tables"""
+    per_type = select(
+        literal('detection').label('kind'),
+        DetectionResult.detection_type.label('name'),
+        func.count().label('count')
+    ).group_by(DetectionResult.detection_type)
+    reports = select(
+        literal('report').label('kind'),
+        literal(REPORTS).label('name'),
+        func.count().label('count')
+    ).select_from(EvidenceReport)
+
+    counts = {REPORTS: 0}
+    for kind, name, count in db.session.execute(union_all(per_type, reports)):
+        counts[detection_counter(name) if kind == 'detection' else REPORTS] = count
+    return counts
+
+
+def increment_counter(name, amount=1):
+    """
+    Add to a counter as part of the caller's transaction (the caller commits).
+    Rows are only created by rebuild_counters(), so concurrent inserts never
+    collide; before the first rebuild this is a no-op.
+    """
+    db.session.execute(
+        update(StatCounter).where(StatCounter.name == name).values(value=StatCounter.value + amount)
+    )
+
+
+def record_detection(detection_type):
+    increment_counter(detection_counter(detection_type))
+
+
+def record_report():
+    increment_counter(REPORTS)
+
+
+def rebuild_counters(detection_types=()):
+    """Reset the counters from the source tables; returns the counts"""
+    try:
+        # Deleting first takes the write lock, so no insert slips in between
+        db.session.execute(delete(StatCounter))
+        counts = aggregate_counts()
+        for detection_type in detection_types:
+            counts.setdefault(detection_counter(detection_type), 0)
+        db.session.add_all([StatCounter(name=name, value=value) for name, value in counts.items()])
+        db.session.add(StatCounter(name=SEEDED, value=1))
+        db.session.commit()
+        return counts
+    except IntegrityError:
+        # Another process seeded the counters concurrently
+        db.session.rollback()
+        return counter_counts(detection_types)
+
+
+def counter_counts(detection_types=()):
+    """{counter name: count} from the counters table, seeding it on first use"""
+    counts = dict(db.session.execute(select(StatCounter.name, StatCounter.value)).all())
+    if SEEDED not in counts:
+        return rebuild_counters(detection_types)
+    del counts[SEEDED]
+    counts.setdefault(REPORTS, 0)
+    return counts
+
+
+def stats_payload(counts, detection_types):
+    """Shape counts into the /api/stats response"""
+    by_type = {
+        name.split(':', 1)[1]: count
+        for name, count in counts.items()
+        if name.startswith('detections:')
+    }
+    payload = {
+        'total_detections': sum(by_type.values()),
+        'reports_generated': counts.get(REPORTS, 0),
+        'detections_by_type': by_type
+    }
+    for detection_type in detection_types:
+        payload[f'{detection_type}_detections'] = by_type.get(detection_type, 0)
+    return payload
@@ -15,24 +15,55 @@ class User(db.Model):
 
 class DetectionResult(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     file_path = db.Column(db.String(255), nullable=False)
-    detection_type = db.Column(db.String(50), nullable=False)  # deepfake, object, fraud
+    detection_type = db.Column(db.String(50), nullable=False, index=True)  # deepfake, object, fraud
     media_type = db.Column(db.String(20))  # image, video, audio - NEW FIELD
-    result = db.Column(db.Text)  # JSON stored as text
+    # Full payloads can be megabytes (e.g. video frame analysis); loaded only when accessed
+    result = db.deferred(db.Column(db.Text))  # JSON stored as text
     confidence = db.Column(db.Float, default=0.0)
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
-    meta = db.Column(db.Text)  # Additional metadata as JSON
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    meta = db.deferred(db.Column(db.Text))  # Additional metadata as JSON
+
+    # Summary fields copied out of `result` at insert time so lists never parse it
+    prediction = db.Column(db.String(50), index=True)
+    object_count = db.Column(db.Integer)
+    fraud_rate = db.Column(db.Float)
+    sampled_frames = db.Column(db.Integer)
+    model_name = db.Column(db.String(255))
+
+    # Digest and size of the upload, computed while it was saved
+    file_sha256 = db.Column(db.String(64), index=True)
+    file_size = db.Column(db.BigInteger)
 
     evidence_reports = db.relationship('EvidenceReport', backref='detection', lazy='dynamic')
 
+    # Keyset pages (listings.py) seek and order on (timestamp, id), optionally
+    # after an equality filter on the detection type
+    __table_args__ = (
+        db.Index('ix_detection_result_timestamp_id', 'timestamp', 'id'),
+        db.Index('ix_detection_result_type_timestamp_id', 'detection_type', 'timestamp', 'id'),
+    )
+
+    @staticmethod
+    def summarize(result):
+        """Summary column values for a detection result dict"""
+        metadata = result.get('metadata') or {}
+        return {
+            'prediction': str(result.get('prediction', 'unknown')),
+            'object_count': result.get('object_count', result.get('total_detections')),
+            'fraud_rate': result.get('fraud_rate'),
+            'sampled_frames': metadata.get('sampled_frames', metadata.get('analyzed_frames')),
+            'model_name': metadata.get('model_name')
+        }
+
 
 class EvidenceReport(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    detection_id = db.Column(db.Integer, db.ForeignKey('detection_result.id'), nullable=False)
+    detection_id = db.Column(db.Integer, db.ForeignKey('detection_result.id'), nullable=False, index=True)
     report_number = db.Column(db.String(100), unique=True, nullable=False)
     report_type = db.Column(db.String(50), default='court_evidence')  # ADD THIS LINE
-    generated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    generated_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     file_path = db.Column(db.String(255))
     chain_of_custody = db.Column(db.Text)  # JSON
     technical_analysis = db.Column(db.Text)  # JSON
@@ -40,6 +71,32 @@ class EvidenceReport(db.Model):
     report_hash = db.Column(db.String(64))  # ADD THIS LINE
     status = db.Column(db.String(20), default='pending')  # ADD THIS LINE
 
+    __table_args__ = (
+        db.Index('ix_evidence_report_generated_at_id', 'generated_at', 'id'),
+    )
+
+
+
+class DetectionCache(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    file_hash = db.Column(db.String(64), nullable=False, index=True)  # SHA-256 of file content
+    detection_type = db.Column(db.String(50), nullable=False)
+    model_signature = db.Column(db.String(255), nullable=False)  # Model name/version that produced the result
+    result = db.Column(db.Text)  # JSON stored as text
+    compute_seconds = db.Column(db.Float, default=0.0)
+    hit_count = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_hit_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.UniqueConstraint('file_hash', 'detection_type', 'model_signature', name='uq_detection_cache_key'),
+    )
+
+
+class StatCounter(db.Model):
+    # Dashboard counters, incremented in the same transaction as the rows they count
+    name = db.Column(db.String(100), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
 
 
 class AuditLog(db.Model):
@@ -57,4 +114,11 @@ class SystemConfig(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     key = db.Column(db.String(100), unique=True, nullable=False)
     value = db.Column(db.Text)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+def ensure_indexes():
+    """Create declared indexes missing on existing tables (db.create_all only creates new tables)"""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
@@ -4,14 +4,21 @@ NO TRAINING REQUIRED - uses transfer learning.
 """
 
 import os
-from typing import Dict, Union, List, Optional
+import time
+from typing import Dict, Union, List, Optional, Sequence, Tuple
 from datetime import datetime
 
 import numpy as np
 import torch
 import cv2
 from PIL import Image
-import torchaudio
+
+from frame_sampler import DEFAULT_SEEK_THRESHOLD, FrameSampler
+from audio_frontend import AudioFrontend
+from inference_profile import InferenceProfile
+from metrics import stage
+from model_registry import ModelRegistry
+from onnx_backend import OnnxClassifier
 
 from transformers import (
     pipeline,
@@ -32,150 +39,295 @@ class DeepfakeDetector:
         self,
         device: Optional[torch.device] = None,
         image_model_name: str = "Organika/sdxl-detector",
-        audio_model_name: str = "mo-thecreator/Deepfake-audio-detection"
+        audio_model_name: str = "mo-thecreator/Deepfake-audio-detection",
+        frame_max_side: Optional[int] = None,
+        frame_seek_threshold: Optional[int] = DEFAULT_SEEK_THRESHOLD,
+        registry: Optional[ModelRegistry] = None,
+        preload: bool = True,
+        audio_window_seconds: Optional[float] = None,
+        audio_hop_seconds: Optional[float] = None,
+        audio_batch_size: int = 8,
+        inference_profile: Optional[InferenceProfile] = None,
+        backend: str = "torch",
+        onnx_cache_dir: str = "models/onnx"
     ):
         self.device = device or (torch.device("cuda") if torch.cuda.is_available() else torch.device("cpu"))
         
-        print(f"Loading models on device: {self.device}")
+        # CPU inference settings: threads, int8 quantization, bf16 autocast
+        self.inference_profile = inference_profile or InferenceProfile()
+        self.inference_profile.apply_threads()
         
-        # Image detection using pretrained Hugging Face model
-        try:
-            print(f"DEBUG:Loading image model: {image_model_name}")
-            self.image_processor = AutoImageProcessor.from_pretrained(image_model_name)
-            self.image_model = AutoModelForImageClassification.from_pretrained(image_model_name).to(self.device)
-            self.image_model.eval()
-            self.image_model_name = image_model_name
-            print("DEBUG:Image model loaded successfully!")
-        except Exception as e:
-            print(f"DEBUG:Image model load failed: {e}")
-            self.image_model = None
-            self.image_processor = None
-            self.image_model_name = None
+        # "torch" runs the Hugging Face models eagerly; "onnx" exports them once and runs ONNX Runtime on CPU
+        if backend not in ("torch", "onnx"):
+            raise ValueError(f"Unknown inference backend: {backend}")
+        self.backend = backend
+        self.onnx_cache_dir = onnx_cache_dir
+        
+        # Longest side of sampled video frames; None keeps full resolution
+        self.frame_max_side = frame_max_side
+        # Frame gap above which video sampling seeks; None reads sequentially
+        self.frame_seek_threshold = frame_seek_threshold
+        
+        # Windowed audio analysis; None analyzes the whole file in one pass
+        self.audio_window_seconds = audio_window_seconds
+        self.audio_hop_seconds = audio_hop_seconds
+        self.audio_batch_size = audio_batch_size
+        self.audio_frontend = AudioFrontend()
         
+        self.image_model_name = image_model_name
+        self.audio_model_name = audio_model_name
+
+        # Models live in the registry so they can be shared, loaded on demand and evicted
+        self.registry = registry or ModelRegistry()
+        self._load_errors: Dict[str, str] = {}
+        
+        print(f"Using device: {self.device}")
+        
+        if preload:
+            self._image_components()
+            self._audio_components()
+
+    def _load_image_components(self):
+        # Image detection using pretrained Hugging Face model
+        print(f"🖼️ Loading image model: {self.image_model_name}")
+        image_processor = AutoImageProcessor.from_pretrained(self.image_model_name)
+        if self.backend == "onnx":
+            image_model = OnnxClassifier.load(
+                self.image_model_name, "image", self.onnx_cache_dir,
+                build_torch_model=lambda: AutoModelForImageClassification.from_pretrained(self.image_model_name).eval(),
+                example_inputs_fn=lambda: image_processor(images=[Image.new("RGB", (224, 224))], return_tensors="pt"),
+                threads=self.inference_profile.threads
+            )
+        else:
+            image_model = AutoModelForImageClassification.from_pretrained(self.image_model_name).to(self.device)
+            image_model.eval()
+            image_model = self.inference_profile.prepare_model(image_model, self.device)
+        print("Image model loaded successfully!")
+        return image_processor, image_model
+
+    def _load_audio_components(self):
         # Audio detection using pretrained Hugging Face model
+        print(f"🎵 Loading audio model: {self.audio_model_name}")
+        audio_feature_extractor = AutoFeatureExtractor.from_pretrained(self.audio_model_name)
+        if self.backend == "onnx":
+            sampling_rate = audio_feature_extractor.sampling_rate
+            audio_model = OnnxClassifier.load(
+                self.audio_model_name, "audio", self.onnx_cache_dir,
+                build_torch_model=lambda: AutoModelForAudioClassification.from_pretrained(self.audio_model_name).eval(),
+                example_inputs_fn=lambda: audio_feature_extractor(
+                    np.zeros(sampling_rate, dtype=np.float32), sampling_rate=sampling_rate, return_tensors="pt"
+                ),
+                threads=self.inference_profile.threads
+            )
+        else:
+            audio_model = AutoModelForAudioClassification.from_pretrained(self.audio_model_name).to(self.device)
+            audio_model.eval()
+            audio_model = self.inference_profile.prepare_model(audio_model, self.device)
+        print("Audio model loaded successfully!")
+        return audio_feature_extractor, audio_model
+
+    def _registry_get(self, key: str, loader):
+        # Nothing is kept for a failed load, so the next request tries again
         try:
-            print(f"🎵 Loading audio model: {audio_model_name}")
-            self.audio_feature_extractor = AutoFeatureExtractor.from_pretrained(audio_model_name)
-            self.audio_model = AutoModelForAudioClassification.from_pretrained(audio_model_name).to(self.device)
-            self.audio_model.eval()
-            self.audio_model_name = audio_model_name
-            print("DEBUG:Audio model loaded successfully!")
+            components = self.registry.get(key, loader)
         except Exception as e:
-            print(f"DEBUG:Audio model load failed: {e}")
-            self.audio_feature_extractor = None
-            self.audio_model = None
-            self.audio_model_name = None
+            print(f"❌ Model load failed ({key}): {e}")
+            self._load_errors[key] = str(e)
+            return None
+        self._load_errors.pop(key, None)
+        return components
+
+    def _image_components(self):
+        """(image_processor, image_model) from the registry, or None if unavailable"""
+        key = f"hf-image:{self.image_model_name}:{self.device}:{self.runtime_tag}"
+        return self._registry_get(key, self._load_image_components)
+
+    def _audio_components(self):
+        """(audio_feature_extractor, audio_model) from the registry, or None if unavailable"""
+        key = f"hf-audio:{self.audio_model_name}:{self.device}:{self.runtime_tag}"
+        return self._registry_get(key, self._load_audio_components)
+
+    @property
+    def image_processor(self):
+        components = self._image_components()
+        return components[0] if components else None
+
+    @property
+    def image_model(self):
+        components = self._image_components()
+        return components[1] if components else None
+
+    @property
+    def audio_feature_extractor(self):
+        components = self._audio_components()
+        return components[0] if components else None
+
+    @property
+    def audio_model(self):
+        components = self._audio_components()
+        return components[1] if components else None
+
+    @property
+    def runtime_tag(self) -> str:
+        """Backend and precision the models run with"""
+        return "onnx" if self.backend == "onnx" else self.inference_profile.tag
+
+    @property
+    def model_family(self) -> str:
+        """Models this detector serves, independent of version and settings"""
+        return f"{self.image_model_name}+{self.audio_model_name}"
+
+    @property
+    def model_signature(self) -> str:
+        """Identifies the loaded models; used to key cached results"""
+        return (
+            f"{self.model_family}|pretrained-hf|{self.runtime_tag}|frames={self.frame_max_side}"
+            f"|audio_window={self.audio_window_seconds}/{self.audio_hop_seconds}"
+        )
 
     # Image Detection
     def detect_image(self, image_path: str) -> Dict[str, Union[str, float]]:
         """Detect if image is deepfake using pretrained model"""
         
         if not os.path.exists(image_path):
-            return {
-                "error": "file not found",
-                "prediction": "error",
-                "confidence": 0.0,
-                "timestamp": datetime.now().isoformat(),
-                "type": "image",
-                "media_type": "image",
-                "file_path": image_path
-            }
+            return self._image_error("file not found", image_path)
         
-        if self.image_model is None or self.image_processor is None:
-            return {
-                "error": "image model not loaded",
-                "prediction": "error",
-                "confidence": 0.0,
-                "timestamp": datetime.now().isoformat(),
-                "type": "image",
-                "media_type": "image",
-                "file_path": image_path
-            }
+        if self._image_components() is None:
+            return self._image_error("image model not loaded", image_path)
         
         try:
-            # Empty cache
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
             # Load and process image
-            image = Image.open(image_path).convert("RGB")
-            inputs = self.image_processor(images=image, return_tensors="pt").to(self.device)
+            with stage("decode"):
+                image = Image.open(image_path).convert("RGB")
+            prediction, confidence, pred_label = self._classify_images([image])[0]
             
-            # Inference
-            with torch.no_grad():
-                outputs = self.image_model(**inputs)
-                logits = outputs.logits
-                probs = torch.nn.functional.softmax(logits, dim=-1)
-                
-                # Get prediction
-                pred_idx = torch.argmax(probs, dim=-1).item()
-                confidence = probs[0][pred_idx].item()
-                
-                # Map to "real" or "fake"
-                label_map = self.image_model.config.id2label
-                pred_label = label_map[pred_idx].lower()
-                
-                # Normalize labels
-                if "fake" in pred_label or "deepfake" in pred_label:
-                    prediction = "fake"
-                else:
-                    prediction = "real"
-            
-            return {
-                "prediction": prediction,
-                "confidence": float(confidence),
-                "type": "image",
-                "media_type": "image",
-                "file_path": image_path,
-                "timestamp": datetime.now().isoformat(),
-                "metadata": {
-                    "model_version": "pretrained-hf",
-                    "model_name": self.image_model_name,
-                    "detection_method": "Transfer Learning (No Training Required)",
-                    "raw_label": pred_label
-                }
-            }
+            return self._image_result(prediction, confidence, pred_label, image_path)
             
         except Exception as e:
-            return {
-                "error": str(e),
-                "prediction": "error",
-                "confidence": 0.0,
-                "timestamp": datetime.now().isoformat(),
-                "type": "image",
-                "media_type": "image",
-                "file_path": image_path
+            return self._image_error(str(e), image_path)
+
+    def _classify_images(self, images: Sequence[Union[Image.Image, np.ndarray]]) -> List[Tuple[str, float, str]]:
+        """
+        Run one batched forward pass over RGB images.
+        Returns (prediction, confidence, raw_label) per image.
+        """
+        image_processor, image_model = self._image_components()
+        with stage("preprocess"):
+            inputs = image_processor(images=list(images), return_tensors="pt").to(self.device)
+
+        # Inference
+        with stage("model_forward"), self.inference_profile.context(self.device):
+            outputs = image_model(**inputs)
+            probs = torch.nn.functional.softmax(outputs.logits.float(), dim=-1)
+            confidences, pred_indices = torch.max(probs, dim=-1)
+
+        label_map = image_model.config.id2label
+        classified = []
+        for pred_idx, confidence in zip(pred_indices.tolist(), confidences.tolist()):
+            # Map to "real" or "fake"
+            pred_label = label_map[pred_idx].lower()
+            
+            # Normalize labels
+            if "fake" in pred_label or "deepfake" in pred_label:
+                prediction = "fake"
+            else:
+                prediction = "real"
+            classified.append((prediction, float(confidence), pred_label))
+
+        return classified
+
+    def _image_result(self, prediction: str, confidence: float, pred_label: str, image_path: Optional[str]) -> Dict[str, Union[str, float, dict]]:
+        return {
+            "prediction": prediction,
+            "confidence": float(confidence),
+            "type": "image",
+            "media_type": "image",
+            "file_path": image_path,
+            "timestamp": datetime.now().isoformat(),
+            "metadata": {
+                "model_version": "pretrained-hf",
+                "model_name": self.image_model_name,
+                "detection_method": "Transfer Learning (No Training Required)",
+                "raw_label": pred_label
             }
+        }
+
+    def _image_error(self, error: str, image_path: Optional[str]) -> Dict[str, Union[str, float]]:
+        return {
+            "error": error,
+            "prediction": "error",
+            "confidence": 0.0,
+            "timestamp": datetime.now().isoformat(),
+            "type": "image",
+            "media_type": "image",
+            "file_path": image_path
+        }
+
+    def detect_images(
+        self,
+        paths_or_arrays: Sequence[Union[str, np.ndarray, Image.Image]],
+        batch_size: int = 16
+    ) -> List[Dict[str, Union[str, float, dict]]]:
+        """
+        Detect deepfakes in many images with one forward pass per batch.
+        Accepts file paths, RGB uint8 arrays (H x W x 3) or PIL images and
+        returns one result per input, in order, shaped like detect_image.
+        """
+        results: List[Optional[Dict]] = [None] * len(paths_or_arrays)
+
+        if self._image_components() is None:
+            return [
+                self._image_error("image model not loaded", item if isinstance(item, str) else None)
+                for item in paths_or_arrays
+            ]
+
+        # Decode inputs, recording per-item failures in place
+        pending = []
+        for i, item in enumerate(paths_or_arrays):
+            image_path = item if isinstance(item, str) else None
+            if image_path is not None:
+                if not os.path.exists(image_path):
+                    results[i] = self._image_error("file not found", image_path)
+                    continue
+                try:
+                    with stage("decode"):
+                        image = Image.open(image_path).convert("RGB")
+                except Exception as e:
+                    results[i] = self._image_error(str(e), image_path)
+                    continue
+            elif isinstance(item, Image.Image):
+                image = item.convert("RGB")
+            else:
+                image = item
+            pending.append((i, image_path, image))
+
+        batch_size = max(1, int(batch_size))
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            try:
+                classified = self._classify_images([image for _, _, image in chunk])
+                for (i, image_path, _), (prediction, confidence, pred_label) in zip(chunk, classified):
+                    results[i] = self._image_result(prediction, confidence, pred_label, image_path)
+            except Exception as e:
+                for i, image_path, _ in chunk:
+                    results[i] = self._image_error(str(e), image_path)
+
+        return results
 
     # Video Detection
     def _sample_frames(self, video_path: str, max_frames: int = 16) -> List[np.ndarray]:
         """Sample frames uniformly from video"""
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            return []
-        
-        frames = []
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        
-        if total_frames <= 0:
-            cap.release()
-            return []
-        
-        # Sample frames uniformly
-        indices = np.linspace(0, total_frames - 1, num=min(max_frames, total_frames), dtype=int)
-        
-        for idx in indices:
-            cap.set(cv2.CAP_PROP_POS_FRAMES, int(idx))
-            ret, frame = cap.read()
-            if ret:
-                frames.append(frame)
-        
-        cap.release()
-        return frames
+        sampler = FrameSampler(
+            strategy='uniform', count=max_frames, max_side=self.frame_max_side, seek_threshold=self.frame_seek_threshold
+        )
+        frames, _ = sampler.sample(video_path)
+        return [frame for _, frame in frames]
 
-    def detect_video(self, video_path: str, max_frames: int = 16) -> Dict[str, Union[str, float, dict]]:
+    def detect_video(self, video_path: str, max_frames: int = 16, batch_size: int = 16) -> Dict[str, Union[str, float, dict]]:
         """
         Detect deepfake in video by analyzing sampled frames.
         Uses per-frame classification with majority voting.
+        Frames are classified in memory in batches of `batch_size`.
         """
         
         if not os.path.exists(video_path):
@@ -191,7 +343,8 @@ class DeepfakeDetector:
         
         try:
             # Sample frames
-            frames = self._sample_frames(video_path, max_frames=max_frames)
+            with stage("frame_decode"):
+                frames = self._sample_frames(video_path, max_frames=max_frames)
             
             if not frames:
                 return {
@@ -204,24 +357,23 @@ class DeepfakeDetector:
                     "file_path": video_path
                 }
             
-            # Analyze each frame
-            frame_results = []
-            for i, frame in enumerate(frames):
-                # Convert BGR to RGB
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                pil_image = Image.fromarray(frame_rgb)
-                
-                # Save temporarily
-                temp_path = f"/tmp/temp_frame_{i}.jpg"
-                pil_image.save(temp_path)
-                
-                # Detect on frame
-                result = self.detect_image(temp_path)
-                frame_results.append(result)
-                
-                # Cleanup
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+            # Analyze frames in memory: BGR -> RGB arrays go straight to the image processor
+            with stage("preprocess"):
+                frames_rgb = [cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) for frame in frames]
+            frame_results = self.detect_images(frames_rgb, batch_size=batch_size)
+
+            errors = [r for r in frame_results if r.get("prediction") == "error"]
+            if len(errors) == len(frame_results):
+                return {
+                    "error": errors[0].get("error", "frame analysis failed"),
+                    "prediction": "error",
+                    "confidence": 0.0,
+                    "timestamp": datetime.now().isoformat(),
+                    "type": "video",
+                    "media_type": "video",
+                    "file_path": video_path
+                }
+            frame_results = [r for r in frame_results if r.get("prediction") != "error"]
             
             # Aggregate results using majority voting
             fake_count = sum(1 for r in frame_results if r.get("prediction") == "fake")
@@ -246,6 +398,7 @@ class DeepfakeDetector:
                     "real_count": real_count,
                     "frame_predictions": [r.get("prediction") for r in frame_results],
                     "model_version": "pretrained-hf",
+                    "model_name": self.image_model_name,
                     "detection_method": "Per-frame majority voting (No Training Required)"
                 }
             }
@@ -262,10 +415,196 @@ class DeepfakeDetector:
             }
 
     # Audio Detection
+    def _audio_label(self, audio_model, pred_idx: int) -> Tuple[str, str]:
+        """Map a class index to ("real" | "fake", raw lowercase label)"""
+        label_str = audio_model.config.id2label[pred_idx] if hasattr(audio_model.config, "id2label") else str(pred_idx)
+        label_str = label_str.lower()
+        
+        # Map to "real" or "fake"
+        if "bonafide" in label_str or "real" in label_str:
+            pred_label = "real"
+        elif "spoof" in label_str or "fake" in label_str:
+            pred_label = "fake"
+        else:
+            pred_label = "fake" if pred_idx == 1 else "real"
+        return pred_label, label_str
+
+    def _fake_class_index(self, audio_model) -> int:
+        """Index of the class that _audio_label maps to "fake" """
+        num_labels = getattr(audio_model.config, "num_labels", 2)
+        for idx in range(num_labels):
+            if self._audio_label(audio_model, idx)[0] == "fake":
+                return idx
+        return 1
+
+    def _iter_audio_segments(self, audio_path: str, target_sr: int, window_seconds: float, hop_seconds: float):
+        """
+        Stream mono audio at `target_sr` as overlapping windows.
+        Yields (start_sample, samples); only about one window is held in memory.
+        Every window is full length, so batches are never zero-padded: the tail
+        not covered by the last window is classified as the final `window_seconds`
+        of audio. Only audio shorter than one window yields a shorter segment.
+        """
+        window = int(window_seconds * target_sr)
+        # A hop longer than the window would skip audio
+        hop = min(int(hop_seconds * target_sr), window)
+
+        buffer = torch.zeros(0)
+        buffer_start = 0
+        last_window = None
+
+        for block in self.audio_frontend.iter_blocks(audio_path, target_sr, hop_seconds):
+            buffer = torch.cat([buffer, block])
+
+            while buffer.shape[0] >= window:
+                last_window = buffer[:window]
+                yield buffer_start, last_window.numpy()
+                buffer = buffer[hop:]
+                buffer_start += hop
+
+        if last_window is None:
+            if buffer.shape[0] > 0:
+                yield buffer_start, buffer.numpy()
+        elif buffer.shape[0] > window - hop:
+            # Merge the tail into a full window ending at the last sample
+            tail = torch.cat([last_window, buffer[window - hop:]])[-window:]
+            yield buffer_start + buffer.shape[0] - window, tail.numpy()
+
+    def detect_audio_windowed(
+        self,
+        audio_path: str,
+        window_seconds: Optional[float] = None,
+        hop_seconds: Optional[float] = None,
+        batch_size: Optional[int] = None
+    ) -> Dict[str, Union[str, float, dict]]:
+        """
+        Detect deepfake audio over fixed-length overlapping windows.
+        Windows are streamed from disk and classified in batches, so memory is
+        bounded by the window and batch size. Returns a per-segment timeline and
+        an aggregate verdict from the mean fake probability.
+        """
+        window_seconds = window_seconds or self.audio_window_seconds or 10.0
+        hop_seconds = hop_seconds or self.audio_hop_seconds or window_seconds / 2
+        batch_size = max(1, int(batch_size or self.audio_batch_size))
+
+        audio_components = self._audio_components()
+        if audio_components is None:
+            return {
+                "error": "audio model not loaded",
+                "prediction": "error",
+                "confidence": 0.0,
+                "timestamp": datetime.now().isoformat(),
+                "type": "audio",
+                "media_type": "audio",
+                "file_path": audio_path
+            }
+
+        try:
+            audio_feature_extractor, audio_model = audio_components
+            target_sr = getattr(audio_feature_extractor, "sampling_rate", 16000)
+            fake_idx = self._fake_class_index(audio_model)
+
+            timeline = []
+            batch = []
+
+            def classify(batch):
+                with stage("preprocess"):
+                    inputs = audio_feature_extractor(
+                        [samples for _, samples in batch],
+                        sampling_rate=target_sr,
+                        return_tensors="pt",
+                        # Windows share one length (see _iter_audio_segments), so nothing is padded
+                        padding=True
+                    )
+                    for k, v in inputs.items():
+                        inputs[k] = v.to(self.device)
+
+                with stage("model_forward"), self.inference_profile.context(self.device):
+                    probs = torch.softmax(audio_model(**inputs).logits.float(), dim=1)
+                    confs, preds = torch.max(probs, dim=1)
+
+                for (start, samples), conf, pred, fake_prob in zip(
+                    batch, confs.tolist(), preds.tolist(), probs[:, fake_idx].tolist()
+                ):
+                    pred_label, _ = self._audio_label(audio_model, pred)
+                    timeline.append({
+                        "start": start / target_sr,
+                        "end": (start + len(samples)) / target_sr,
+                        "prediction": pred_label,
+                        "confidence": float(conf),
+                        "fake_probability": float(fake_prob)
+                    })
+
+            segments = self._iter_audio_segments(audio_path, target_sr, window_seconds, hop_seconds)
+            while True:
+                # Decoding happens lazily as windows are pulled
+                with stage("audio_decode"):
+                    segment = next(segments, None)
+                if segment is None:
+                    break
+                batch.append(segment)
+                if len(batch) >= batch_size:
+                    classify(batch)
+                    batch = []
+            if batch:
+                classify(batch)
+
+            if not timeline:
+                return {
+                    "error": "no audio decoded",
+                    "prediction": "error",
+                    "confidence": 0.0,
+                    "timestamp": datetime.now().isoformat(),
+                    "type": "audio",
+                    "media_type": "audio",
+                    "file_path": audio_path
+                }
+
+            mean_fake = float(np.mean([segment["fake_probability"] for segment in timeline]))
+            prediction = "fake" if mean_fake > 0.5 else "real"
+            fake_segments = sum(1 for segment in timeline if segment["prediction"] == "fake")
+
+            return {
+                "prediction": prediction,
+                "confidence": mean_fake if prediction == "fake" else 1 - mean_fake,
+                "type": "audio",
+                "media_type": "audio",
+                "file_path": audio_path,
+                "timestamp": datetime.now().isoformat(),
+                "timeline": timeline,
+                "metadata": {
+                    "sampling_rate": target_sr,
+                    "model_version": "pretrained-hf",
+                    "model_name": self.audio_model_name,
+                    "detection_method": "Sliding-window classification (No Training Required)",
+                    "window_seconds": window_seconds,
+                    "hop_seconds": hop_seconds,
+                    "segments": len(timeline),
+                    "fake_segments": fake_segments,
+                    "real_segments": len(timeline) - fake_segments,
+                    "duration_seconds": timeline[-1]["end"]
+                }
+            }
+
+        except Exception as e:
+            return {
+                "error": str(e),
+                "prediction": "error",
+                "confidence": 0.0,
+                "timestamp": datetime.now().isoformat(),
+                "type": "audio",
+                "media_type": "audio",
+                "file_path": audio_path
+            }
+
     def detect_audio(self, audio_path: str) -> Dict[str, Union[str, float]]:
-        """Detect if audio is deepfake using pretrained model"""
+        """
+        Detect if audio is deepfake using pretrained model.
+        Uses windowed streaming analysis when `audio_window_seconds` is set.
+        """
         
-        if self.audio_model is None or self.audio_feature_extractor is None:
+        audio_components = self._audio_components()
+        if audio_components is None:
             return {
                 "error": "audio model not loaded",
                 "prediction": "error",
@@ -287,48 +626,44 @@ class DeepfakeDetector:
                 "file_path": audio_path
             }
 
+        if self.audio_window_seconds:
+            return self.detect_audio_windowed(audio_path)
+
         try:
-            # Empty cache
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-            # Load audio
-            waveform, sr = torchaudio.load(audio_path)
-            waveform = waveform.mean(dim=0, keepdim=True)  # Convert to mono
-            
-            target_sr = getattr(self.audio_feature_extractor, "sampling_rate", 16000)
-            if sr != target_sr:
-                waveform = torchaudio.functional.resample(waveform, sr, target_sr)
-
-            samples = waveform.squeeze(0).numpy()
-            inputs = self.audio_feature_extractor(
-                samples, 
-                sampling_rate=target_sr, 
-                return_tensors="pt", 
-                padding=True
-            )
-            
-            # Move to device
-            for k, v in inputs.items():
-                inputs[k] = v.to(self.device)
+            audio_feature_extractor, audio_model = audio_components
+            target_sr = getattr(audio_feature_extractor, "sampling_rate", 16000)
+
+            # Load audio as mono at the model's sampling rate
+            with stage("audio_decode"):
+                waveform, sr, timings = self.audio_frontend.load(audio_path, target_sr)
+
+            # float32 tensor -> NumPy view, no copy
+            started = time.perf_counter()
+            with stage("preprocess"):
+                samples = waveform.numpy()
+                inputs = audio_feature_extractor(
+                    samples, 
+                    sampling_rate=target_sr, 
+                    return_tensors="pt", 
+                    padding=True
+                )
+                
+                # Move to device
+                for k, v in inputs.items():
+                    inputs[k] = v.to(self.device)
+            timings["feature_seconds"] = time.perf_counter() - started
 
             # Inference
-            with torch.no_grad():
-                outputs = self.audio_model(**inputs)
-                logits = outputs.logits
+            started = time.perf_counter()
+            with stage("model_forward"), self.inference_profile.context(self.device):
+                outputs = audio_model(**inputs)
+                logits = outputs.logits.float()
                 probs = torch.softmax(logits, dim=1)
                 conf, pred = torch.max(probs, dim=1)
+            timings["inference_seconds"] = time.perf_counter() - started
 
             # Get label
-            label_str = self.audio_model.config.id2label[pred.item()] if hasattr(self.audio_model.config, "id2label") else str(pred.item())
-            label_str = label_str.lower()
-            
-            # Map to "real" or "fake"
-            if "bonafide" in label_str or "real" in label_str:
-                pred_label = "real"
-            elif "spoof" in label_str or "fake" in label_str:
-                pred_label = "fake"
-            else:
-                pred_label = "fake" if pred.item() == 1 else "real"
+            pred_label, label_str = self._audio_label(audio_model, pred.item())
 
             return {
                 "prediction": pred_label,
@@ -342,7 +677,9 @@ class DeepfakeDetector:
                     "model_version": "pretrained-hf",
                     "model_name": self.audio_model_name,
                     "detection_method": "Transfer Learning (No Training Required)",
-                    "raw_label": label_str
+                    "raw_label": label_str,
+                    "source_sampling_rate": sr,
+                    "timings": timings
                 }
             }
             
@@ -1,6 +1,8 @@
 
+import copy
 import json
 import hashlib
+from collections import OrderedDict
 from datetime import datetime
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -10,10 +12,55 @@ from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 import os
 
+from file_integrity import hash_file, verify_file
+
+# Bump when the PDF layout changes so unchanged-report reuse renders again
+REPORT_TEMPLATE_VERSION = 1
+
+# Digests memoized for detections stored without one (least recently used dropped first)
+FILE_HASH_CACHE_SIZE = 256
+
+# Report fields that change on every generation without changing the findings
+VOLATILE_FIELDS = (
+    ('report_id',),
+    ('verification', 'verification_timestamp'),
+    ('appendices', 'system_info', 'analysis_timestamp'),
+)
+
+
+def _table_style(label_background):
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), label_background),
+        ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ])
+
+
+REPORT_INFO_TABLE_STYLE = _table_style(colors.lightgrey)
+ANALYSIS_TABLE_STYLE = _table_style(colors.lightblue)
+
+# Legal statements that do not depend on the detection
+STATIC_LEGAL_STATEMENTS = (
+    "I hereby certify that this analysis was conducted using scientifically accepted methods and industry-standard digital forensics practices.",
+    "The integrity of the original digital evidence has been maintained throughout the analysis process, as verified by cryptographic hash validation.",
+    "This report contains the complete findings of the digital forensics analysis and has been generated automatically to ensure objectivity and reproducibility.",
+    "The methodologies employed are based on peer-reviewed research and are widely accepted in the digital forensics community.",
+    "All timestamps are recorded in UTC and can be independently verified through system logs."
+)
+
+
 class EvidenceReportGenerator:
     def __init__(self):
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
+        # Parsed paragraphs reused across reports: static text and per-type methodology
+        self._static_flowables = {}
+        # (path, size, mtime) -> SHA-256, so regenerating a report does not re-read the file
+        self._file_hashes = OrderedDict()
 
     def _setup_custom_styles(self):
         """Setup custom styles for the report"""
@@ -44,8 +91,11 @@ class EvidenceReportGenerator:
             spaceAfter=6
         ))
 
-    def generate_court_report(self, detection_result):
-        """Generate court-ready evidence report"""
+    def generate_court_report(self, detection_result, verify=False):
+        """
+        Generate court-ready evidence report. The digest recorded at upload is
+        used when present; `verify` re-hashes the file to check it still matches.
+        """
         result_data = json.loads(detection_result.result)
 
         report_data = {
@@ -64,11 +114,7 @@ class EvidenceReportGenerator:
                 'model_version': result_data.get('metadata', {}).get('model_version', 'unknown')
             },
             'chain_of_custody': self._generate_chain_of_custody(detection_result),
-            'verification': {
-                'hash_original': self._calculate_file_hash(detection_result.file_path),
-                'verification_timestamp': datetime.now().isoformat(),
-                'integrity_status': 'verified'
-            },
+            'verification': self._verification(detection_result, verify),
             'legal_statements': self._generate_legal_statements(detection_result, result_data),
             'appendices': {
                 'technical_details': result_data,
@@ -79,10 +125,10 @@ class EvidenceReportGenerator:
 
         return report_data
 
-    def create_pdf_report(self, report_data, report_id):
-        """Create PDF version of the evidence report"""
+    def create_pdf_report(self, report_data, report_id, output_dir='evidence/exports'):
+        """Create PDF version of the evidence report, named after `report_id` (the report number)"""
         filename = f"evidence_report_{report_id}.pdf"
-        filepath = os.path.join('evidence/exports', filename)
+        filepath = os.path.join(output_dir, filename)
 
         # Ensure directory exists
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
@@ -91,11 +137,10 @@ class EvidenceReportGenerator:
         story = []
 
         # Title
-        story.append(Paragraph("DIGITAL EVIDENCE ANALYSIS REPORT", self.styles['CustomTitle']))
-        story.append(Spacer(1, 20))
+        story.extend(self._static('title'))
 
         # Report Information
-        story.append(Paragraph("REPORT IDENTIFICATION", self.styles['EvidenceHeader']))
+        story.extend(self._static('header', "REPORT IDENTIFICATION"))
         report_info_data = [
             ['Report ID:', report_data['report_id']],
             ['Generated:', datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')],
@@ -104,20 +149,12 @@ class EvidenceReportGenerator:
         ]
 
         report_table = Table(report_info_data, colWidths=[2*inch, 4*inch])
-        report_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        report_table.setStyle(REPORT_INFO_TABLE_STYLE)
         story.append(report_table)
         story.append(Spacer(1, 20))
 
         # Chain of Custody
-        story.append(Paragraph("CHAIN OF CUSTODY", self.styles['EvidenceHeader']))
+        story.extend(self._static('header', "CHAIN OF CUSTODY"))
         for entry in report_data['chain_of_custody']:
             story.append(Paragraph(f"<b>Action:</b> {entry['action']}", self.styles['LegalText']))
             story.append(Paragraph(f"<b>Timestamp:</b> {entry['timestamp']}", self.styles['LegalText']))
@@ -125,7 +162,7 @@ class EvidenceReportGenerator:
             story.append(Spacer(1, 10))
 
         # Technical Analysis
-        story.append(Paragraph("TECHNICAL ANALYSIS RESULTS", self.styles['EvidenceHeader']))
+        story.extend(self._static('header', "TECHNICAL ANALYSIS RESULTS"))
 
         analysis_data = [
             ['Analysis Method:', report_data['technical_analysis']['detection_method']],
@@ -135,41 +172,52 @@ class EvidenceReportGenerator:
         ]
 
         analysis_table = Table(analysis_data, colWidths=[2*inch, 4*inch])
-        analysis_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightblue),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        analysis_table.setStyle(ANALYSIS_TABLE_STYLE)
         story.append(analysis_table)
         story.append(Spacer(1, 20))
 
         # Legal Statements
-        story.append(Paragraph("LEGAL CERTIFICATION", self.styles['EvidenceHeader']))
+        story.extend(self._static('header', "LEGAL CERTIFICATION"))
         for statement in report_data['legal_statements']:
-            story.append(Paragraph(statement, self.styles['LegalText']))
-            story.append(Spacer(1, 10))
+            story.extend(self._static('statement', statement))
 
         # Verification
-        story.append(Paragraph("INTEGRITY VERIFICATION", self.styles['EvidenceHeader']))
+        story.extend(self._static('header', "INTEGRITY VERIFICATION"))
         story.append(Paragraph(f"<b>Original File Hash:</b> {report_data['verification']['hash_original']}", self.styles['LegalText']))
         story.append(Paragraph(f"<b>Verification Status:</b> {report_data['verification']['integrity_status'].upper()}", self.styles['LegalText']))
         story.append(Paragraph(f"<b>Verification Time:</b> {report_data['verification']['verification_timestamp']}", self.styles['LegalText']))
 
         # Methodology
         story.append(Spacer(1, 20))
-        story.append(Paragraph("METHODOLOGY", self.styles['EvidenceHeader']))
-        methodology = report_data['appendices']['methodology']
-        for paragraph in methodology:
-            story.append(Paragraph(paragraph, self.styles['LegalText']))
-            story.append(Spacer(1, 6))
+        story.extend(self._static('methodology', report_data['case_info']['detection_type'], report_data['appendices']['methodology']))
 
         doc.build(story)
         return filepath
 
+    def _static(self, kind, key=None, paragraphs=None):
+        """
+        Flowables for a fixed piece of text, parsed once per generator.
+        Copies are returned because ReportLab stores layout state on each
+        flowable while building; the parsed markup is shared.
+        """
+        cache_key = (kind, key)
+        flowables = self._static_flowables.get(cache_key)
+        if flowables is None:
+            if kind == 'title':
+                flowables = [Paragraph("DIGITAL EVIDENCE ANALYSIS REPORT", self.styles['CustomTitle']), Spacer(1, 20)]
+            elif kind == 'header':
+                flowables = [Paragraph(key, self.styles['EvidenceHeader'])]
+            elif kind == 'statement':
+                flowables = [Paragraph(key, self.styles['LegalText']), Spacer(1, 10)]
+            else:
+                flowables = [Paragraph("METHODOLOGY", self.styles['EvidenceHeader'])]
+                for paragraph in paragraphs:
+                    flowables.extend([Paragraph(paragraph, self.styles['LegalText']), Spacer(1, 6)])
+            # Statements carrying per-detection values are not worth keeping
+            if kind != 'statement' or key in STATIC_LEGAL_STATEMENTS:
+                self._static_flowables[cache_key] = flowables
+        return [copy.copy(flowable) for flowable in flowables]
+
     def _generate_chain_of_custody(self, detection_result):
         """Generate chain of custody information"""
         return [
@@ -195,31 +243,47 @@ class EvidenceReportGenerator:
             }
         ]
 
+    def _verification(self, detection_result, verify):
+        """Integrity section: the upload-time digest, re-checked only when asked"""
+        recorded = getattr(detection_result, 'file_sha256', None)
+        if recorded is None:
+            # Stored before digests were recorded at upload
+            digest, status = self._calculate_file_hash(detection_result.file_path), 'verified'
+        elif verify:
+            digest = recorded
+            status = verify_file(detection_result.file_path, recorded, getattr(detection_result, 'file_size', None))
+        else:
+            digest, status = recorded, 'recorded at upload'
+
+        return {
+            'hash_original': digest,
+            'verification_timestamp': datetime.now().isoformat(),
+            'integrity_status': status
+        }
+
     def _calculate_file_hash(self, file_path):
-        """Calculate SHA-256 hash of the file"""
-        hash_sha256 = hashlib.sha256()
+        """Calculate SHA-256 hash of the file, once per (path, size, mtime)"""
         try:
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hash_sha256.update(chunk)
-            return hash_sha256.hexdigest()
+            stat = os.stat(file_path)
+            key = (file_path, stat.st_size, stat.st_mtime_ns)
+            if key in self._file_hashes:
+                self._file_hashes.move_to_end(key)
+                return self._file_hashes[key]
+            digest = self._file_hashes[key] = hash_file(file_path)
+            while len(self._file_hashes) > FILE_HASH_CACHE_SIZE:
+                self._file_hashes.popitem(last=False)
+            return digest
         except:
             return "hash_calculation_failed"
 
     def _generate_legal_statements(self, detection_result, result_data):
         """Generate legal certification statements"""
         return [
-            "I hereby certify that this analysis was conducted using scientifically accepted methods and industry-standard digital forensics practices.",
+            STATIC_LEGAL_STATEMENTS[0],
 
             f"The digital evidence was analyzed on {detection_result.timestamp.strftime('%B %d, %Y')} using automated detection systems with a confidence level of {result_data.get('confidence', 0):.2%}.",
 
-            "The integrity of the original digital evidence has been maintained throughout the analysis process, as verified by cryptographic hash validation.",
-
-            "This report contains the complete findings of the digital forensics analysis and has been generated automatically to ensure objectivity and reproducibility.",
-
-            "The methodologies employed are based on peer-reviewed research and are widely accepted in the digital forensics community.",
-
-            "All timestamps are recorded in UTC and can be independently verified through system logs."
+            *STATIC_LEGAL_STATEMENTS[1:]
         ]
 
     def _get_system_info(self):
@@ -260,3 +324,23 @@ class EvidenceReportGenerator:
         """Generate hash for report integrity"""
         content = json.dumps(data, sort_keys=True)
         return hashlib.sha256(content.encode()).hexdigest()
+
+    def content_hash(self, report_data):
+        """
+        Report hash over the findings only: generation timestamps are left out
+        and the template version is included, so an unchanged detection hashes
+        the same every time it is regenerated.
+        """
+        stable = copy.deepcopy(report_data)
+        for path in VOLATILE_FIELDS:
+            parent = stable
+            for key in path[:-1]:
+                parent = parent.get(key, {})
+            parent.pop(path[-1], None)
+        # The report-generation entry of the chain of custody is stamped with now()
+        stable['chain_of_custody'] = [
+            entry for entry in stable.get('chain_of_custody', [])
+            if entry.get('action') != 'Evidence Report Generated'
+        ]
+        stable['template_version'] = REPORT_TEMPLATE_VERSION
+        return self.generate_hash(stable)
@@ -0,0 +1,62 @@
+"""
+Upload hashing.
+
+Uploads are hashed while they are copied to the upload folder, so the
+SHA-256 and size stored on `DetectionResult` cost no extra read. Re-reading a
+file to verify it is done only on demand, through a memory map (or large
+reads where mapping is not possible).
+"""
+
+import hashlib
+import mmap
+import os
+
+COPY_CHUNK_SIZE = 1024 * 1024
+HASH_CHUNK_SIZE = 16 * 1024 * 1024
+
+
+def save_and_hash(stream, file_path, chunk_size=COPY_CHUNK_SIZE):
+    """Copy a readable stream to `file_path`, hashing it in the same pass; returns (sha256 hex, size)"""
+    hash_sha256 = hashlib.sha256()
+    size = 0
+    with open(file_path, 'wb') as out:
+        for chunk in iter(lambda: stream.read(chunk_size), b''):
+            hash_sha256.update(chunk)
+            out.write(chunk)
+            size += len(chunk)
+    return hash_sha256.hexdigest(), size
+
+
+def save_upload(file_storage, file_path, chunk_size=COPY_CHUNK_SIZE):
+    """`FileStorage.save()` that also returns (sha256 hex, size)"""
+    return save_and_hash(file_storage.stream, file_path, chunk_size)
+
+
+def hash_file(file_path, chunk_size=HASH_CHUNK_SIZE):
+    """SHA-256 of a file, read through a memory map in `chunk_size` slices"""
+    hash_sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Empty files and some filesystems cannot be mapped
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                hash_sha256.update(chunk)
+            return hash_sha256.hexdigest()
+
+        with mapped, memoryview(mapped) as view:
+            for offset in range(0, len(view), chunk_size):
+                hash_sha256.update(view[offset:offset + chunk_size])
+    return hash_sha256.hexdigest()
+
+
+def verify_file(file_path, expected_sha256, expected_size=None):
+    """
+    Re-hash a stored file and compare it with its recorded digest.
+    Returns 'verified', 'mismatch' or 'missing'.
+    """
+    if not os.path.exists(file_path):
+        return 'missing'
+    if expected_size is not None and os.path.getsize(file_path) != expected_size:
+        return 'mismatch'
+    return 'verified' if hash_file(file_path) == expected_sha256 else 'mismatch'
@@ -0,0 +1,138 @@
+"""
+Shared frame sampling for the video detectors.
+
+Frames are walked sequentially with `grab()`, and only the frames that are
+actually sampled go through `retrieve()` (colour conversion + copy). Long gaps
+between sampled frames can optionally be crossed with a seek instead.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Gaps longer than this many frames (a few GOPs at common frame rates) are
+# crossed with a seek; shorter ones are cheaper to grab() through
+DEFAULT_SEEK_THRESHOLD = 300
+
+
+class FrameSampler:
+    """
+    Sample frames from a video file.
+
+    Strategies:
+      - 'uniform': `count` frames spread evenly over the whole video
+      - 'stride':  every `stride`-th frame
+      - 'time':    one frame every `interval_seconds` of video time
+
+    `max_side` downscales sampled frames so their longest side is at most that
+    many pixels. `seek_threshold` (in frames) switches to a seek when the next
+    uniformly sampled frame is further away than that; None always reads
+    sequentially.
+    """
+
+    STRATEGIES = ('uniform', 'stride', 'time')
+
+    def __init__(
+        self,
+        strategy: str = 'uniform',
+        count: int = 16,
+        stride: int = 30,
+        interval_seconds: float = 1.0,
+        max_side: Optional[int] = None,
+        seek_threshold: Optional[int] = DEFAULT_SEEK_THRESHOLD
+    ):
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Unknown sampling strategy: {strategy}")
+        self.strategy = strategy
+        self.count = max(1, int(count))
+        self.stride = max(1, int(stride))
+        self.interval_seconds = float(interval_seconds)
+        self.max_side = max_side
+        self.seek_threshold = seek_threshold
+
+    def sample(self, video_path: str) -> Tuple[List[Tuple[int, np.ndarray]], Dict[str, float]]:
+        """
+        Return ([(frame_index, bgr_frame), ...], info) where info holds
+        `total_frames` (frames walked for stride/time sampling, the container
+        frame count for uniform sampling), `fps`, and the source `width` and
+        `height` before any downscaling.
+        """
+        info = {'total_frames': 0, 'fps': 0.0}
+        frames = list(self.iter_frames(video_path, info))
+        return frames, info
+
+    def iter_frames(self, video_path: str, info: Optional[Dict[str, float]] = None) -> Iterator[Tuple[int, np.ndarray]]:
+        """Yield (frame_index, bgr_frame) for each sampled frame"""
+        info = info if info is not None else {}
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            return
+
+        try:
+            info['total_frames'] = max(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), 0)
+            info['fps'] = float(cap.get(cv2.CAP_PROP_FPS) or 0.0)
+            info['width'] = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH) or 0)
+            info['height'] = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 0)
+
+            if self.strategy == 'uniform':
+                yield from self._iter_uniform(cap, info)
+            else:
+                # Stride and time-based sampling walk the whole stream, because
+                # the container frame count is not always reliable
+                yield from self._iter_stride(cap, self._effective_stride(info['fps']), info)
+        finally:
+            cap.release()
+
+    def _iter_uniform(self, cap, info):
+        total_frames = info['total_frames']
+        if total_frames <= 0:
+            return
+
+        indices = np.linspace(0, total_frames - 1, num=min(self.count, total_frames), dtype=int)
+        position = 0
+        for target in sorted(set(int(i) for i in indices)):
+            if self.seek_threshold is not None and target - position > self.seek_threshold:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                position = target
+
+            # Skipped frames are grabbed but never retrieved
+            while position < target:
+                if not cap.grab():
+                    return
+                position += 1
+
+            if not cap.grab():
+                return
+            position += 1
+
+            ret, frame = cap.retrieve()
+            if ret:
+                yield target, self._resize(frame)
+
+    def _iter_stride(self, cap, stride, info):
+        position = 0
+        while cap.grab():
+            if position % stride == 0:
+                ret, frame = cap.retrieve()
+                if ret:
+                    yield position, self._resize(frame)
+            position += 1
+
+        info['total_frames'] = position
+
+    def _effective_stride(self, fps: float) -> int:
+        if self.strategy == 'time':
+            return max(1, int(round(self.interval_seconds * (fps or 30.0))))
+        return self.stride
+
+    def _resize(self, frame: np.ndarray) -> np.ndarray:
+        if not self.max_side:
+            return frame
+        height, width = frame.shape[:2]
+        longest = max(height, width)
+        if longest <= self.max_side:
+            return frame
+        scale = self.max_side / float(longest)
+        return cv2.resize(frame, (max(1, int(width * scale)), max(1, int(height * scale))), interpolation=cv2.INTER_AREA)
+
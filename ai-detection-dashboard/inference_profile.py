@@ -0,0 +1,67 @@
+"""
+CPU inference profile for the PyTorch models: thread counts, dynamic int8
+quantization of Linear layers and optional bfloat16 autocast.
+
+torch is imported inside the methods so the web process can build a profile
+(e.g. to hand to inference workers) without importing it.
+"""
+
+import contextlib
+from typing import Optional
+
+
+class InferenceProfile:
+    """
+    Settings applied to a model when it is loaded and around every forward pass.
+    All options default to plain fp32 eager inference.
+    """
+
+    def __init__(
+        self,
+        threads: Optional[int] = None,
+        interop_threads: Optional[int] = None,
+        quantize_int8: bool = False,
+        autocast_bf16: bool = False
+    ):
+        self.threads = threads
+        self.interop_threads = interop_threads
+        self.quantize_int8 = quantize_int8
+        self.autocast_bf16 = autocast_bf16
+
+    @property
+    def tag(self) -> str:
+        """Short description of options that can change predictions"""
+        parts = []
+        if self.quantize_int8:
+            parts.append("int8")
+        if self.autocast_bf16:
+            parts.append("bf16")
+        return "+".join(parts) or "fp32"
+
+    def apply_threads(self):
+        """Configure torch intra/inter-op thread pools for this process"""
+        import torch
+        if self.threads:
+            torch.set_num_threads(self.threads)
+        if self.interop_threads:
+            try:
+                torch.set_num_interop_threads(self.interop_threads)
+            except RuntimeError as e:
+                # Only allowed before any inter-op parallel work has started
+                print(f"Could not set inter-op threads: {e}")
+
+    def prepare_model(self, model: "torch.nn.Module", device: "torch.device") -> "torch.nn.Module":
+        """Quantize a loaded eval-mode model if requested (CPU only)"""
+        import torch
+        if self.quantize_int8 and device.type == "cpu":
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model
+
+    def context(self, device: "torch.device"):
+        """Context manager wrapping a forward pass"""
+        import torch
+        stack = contextlib.ExitStack()
+        stack.enter_context(torch.inference_mode())
+        if self.autocast_bf16 and device.type == "cpu":
+            stack.enter_context(torch.autocast(device_type="cpu", dtype=torch.bfloat16))
+        return stack
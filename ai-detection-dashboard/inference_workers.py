@@ -0,0 +1,253 @@
+"""
+Out-of-process inference worker pool.
+
+Each worker process builds its own detectors on first use and pulls tasks from
+a shared queue, so model execution, torch threads and OpenCV decoding stay out
+of the web process and a crashing model only takes down its worker (which is
+restarted). Tasks carry file paths; each worker decodes its own media.
+"""
+
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from metrics import StageTimer
+
+
+class WorkerCrashedError(Exception):
+    """Raised for tasks that were running on a worker process that died"""
+
+
+# Worker process side
+
+def _build_detector(detection_type, model_name, detector_options):
+    options = dict(detector_options.get(detection_type, {}))
+    if detection_type == 'deepfake':
+        from deepfake_detection import DeepfakeDetector
+        if model_name:
+            options['image_model_name'] = model_name
+        return DeepfakeDetector(**options)
+    elif detection_type == 'object':
+        from object_detection import ObjectDetector
+        if model_name:
+            options['model_path'] = model_name
+        return ObjectDetector(**options)
+    elif detection_type == 'fraud':
+        from fraud_detection import FraudDetector
+        if model_name:
+            options['model_path'] = model_name
+        return FraudDetector(**options)
+    raise ValueError(f"Unknown detection type: {detection_type}")
+
+
+def _run_task(task, detectors, detector_options):
+    kind = task['kind']
+    key = (task['detection_type'], task.get('model_name'))
+    if key not in detectors:
+        detectors[key] = _build_detector(task['detection_type'], task.get('model_name'), detector_options)
+    detector = detectors[key]
+
+    if kind == 'signature':
+        return {'model_signature': detector.model_signature, 'model_family': detector.model_family}
+
+    if kind == 'detect':
+        # Stage timings travel back in the result; the web process merges them
+        with StageTimer() as timer:
+            result = detector.detect(task['file_path'])
+        if isinstance(result, dict):
+            result.setdefault('metadata', {})['stages'] = timer.as_dict()
+        return result
+
+    raise ValueError(f"Unknown task kind: {kind}")
+
+
+def _worker_main(worker_index, task_queue, result_queue, detector_options, torch_threads):
+    if torch_threads:
+        os.environ.setdefault('OMP_NUM_THREADS', str(torch_threads))
+        try:
+            import torch
+            torch.set_num_threads(torch_threads)
+        except ImportError:
+            pass
+
+    detectors = {}
+    pid = os.getpid()
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+
+        result_queue.put(('started', task['id'], pid))
+        try:
+            result_queue.put(('done', task['id'], _run_task(task, detectors, detector_options)))
+        except Exception as e:
+            result_queue.put(('error', task['id'], str(e)))
+
+
+# Web process side
+
+class InferenceWorkerPool:
+    """
+    Pool of inference worker processes fed through a local queue.
+
+    `detector_options` maps detection type to constructor kwargs for the
+    detector built inside each worker. Workers are started on first use.
+    """
+
+    LIVENESS_INTERVAL = 1.0  # seconds between worker liveness checks
+
+    def __init__(self, num_workers, detector_options=None, torch_threads=None, task_timeout=None):
+        self.num_workers = max(1, int(num_workers))
+        self.detector_options = detector_options or {}
+        self.torch_threads = torch_threads
+        self.task_timeout = task_timeout
+        # spawn keeps torch/OpenCV thread pools out of forked children
+        self._ctx = mp.get_context('spawn')
+        self._task_queue = None
+        self._result_queue = None
+        self._workers = []
+        self._futures = {}
+        self._running_on = {}  # task id -> worker pid
+        self._signatures = {}
+        self._task_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._started = False
+        self._stopping = False
+        self._counters = {'submitted': 0, 'completed': 0, 'failed': 0, 'worker_restarts': 0}
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._task_queue = self._ctx.Queue()
+            self._result_queue = self._ctx.Queue()
+            for index in range(self.num_workers):
+                self._workers.append(self._spawn_worker(index))
+            self._dispatcher = threading.Thread(target=self._dispatch_results, name='inference-dispatcher', daemon=True)
+            self._dispatcher.start()
+            self._started = True
+        print(f"Started {self.num_workers} inference worker(s)")
+
+    def shutdown(self):
+        with self._lock:
+            if not self._started:
+                return
+            self._stopping = True
+            for _ in self._workers:
+                self._task_queue.put(None)
+        for process in self._workers:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        with self._lock:
+            self._started = False
+
+    def detect(self, detection_type, file_path, model_name=None):
+        """Run `detector.detect(file_path)` in a worker and wait for the result"""
+        return self.submit({
+            'kind': 'detect',
+            'detection_type': detection_type,
+            'model_name': model_name,
+            'file_path': file_path
+        }).result(timeout=self.task_timeout)
+
+    def model_signature(self, detection_type, model_name=None):
+        """(model_family, model_signature) as reported by a worker; cached per model"""
+        key = (detection_type, model_name)
+        if key not in self._signatures:
+            info = self.submit({
+                'kind': 'signature',
+                'detection_type': detection_type,
+                'model_name': model_name
+            }).result(timeout=self.task_timeout)
+            self._signatures[key] = (info['model_family'], info['model_signature'])
+        return self._signatures[key]
+
+    def submit(self, task):
+        self.start()
+        future = Future()
+        with self._lock:
+            task['id'] = next(self._task_ids)
+            self._futures[task['id']] = future
+            self._counters['submitted'] += 1
+        self._task_queue.put(task)
+        return future
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            counters['workers'] = [
+                {'pid': process.pid, 'alive': process.is_alive()} for process in self._workers
+            ]
+            counters['pending'] = len(self._futures)
+            counters['running'] = len(self._running_on)
+        counters['num_workers'] = self.num_workers
+        return counters
+
+    def _spawn_worker(self, index):
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(index, self._task_queue, self._result_queue, self.detector_options, self.torch_threads),
+            name=f'inference-worker-{index}',
+            daemon=True
+        )
+        process.start()
+        return process
+
+    def _dispatch_results(self):
+        last_check = time.monotonic()
+        while not self._stopping:
+            # Liveness is checked on a timer, so a crash is noticed even while results keep arriving
+            if time.monotonic() - last_check >= self.LIVENESS_INTERVAL:
+                self._check_workers()
+                last_check = time.monotonic()
+            try:
+                message = self._result_queue.get(timeout=self.LIVENESS_INTERVAL)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+
+            kind, task_id, payload = message
+            if kind == 'started':
+                with self._lock:
+                    if task_id in self._futures:
+                        self._running_on[task_id] = payload
+                continue
+
+            with self._lock:
+                future = self._futures.pop(task_id, None)
+                self._running_on.pop(task_id, None)
+                self._counters['completed' if kind == 'done' else 'failed'] += 1
+
+            if future is None:
+                continue
+            if kind == 'done':
+                future.set_result(payload)
+            else:
+                future.set_exception(RuntimeError(payload))
+
+    def _check_workers(self):
+        # Fail tasks of crashed workers and replace the workers
+        crashed = []
+        with self._lock:
+            for index, process in enumerate(self._workers):
+                if process.is_alive() or self._stopping:
+                    continue
+                print(f"❌ Inference worker {process.pid} exited with code {process.exitcode}, restarting")
+                for task_id, pid in list(self._running_on.items()):
+                    if pid == process.pid:
+                        del self._running_on[task_id]
+                        future = self._futures.pop(task_id, None)
+                        self._counters['failed'] += 1
+                        if future is not None:
+                            crashed.append(future)
+                self._workers[index] = self._spawn_worker(index)
+                self._counters['worker_restarts'] += 1
+
+        for future in crashed:
+            future.set_exception(WorkerCrashedError('Inference worker crashed while running this task'))
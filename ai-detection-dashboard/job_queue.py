@@ -0,0 +1,184 @@
+"""
+Bounded in-process job queue for running detections off the request thread.
+"""
+
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another submission"""
+
+
+class DetectionJob:
+    """State of a single submitted detection job"""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+    def __init__(self, detection_type, file_path, on_cancel=None):
+        self.id = uuid.uuid4().hex
+        self.detection_type = detection_type
+        self.file_path = file_path
+        self.status = self.QUEUED
+        self.stage = None
+        self.detection_id = None
+        self.report_id = None
+        self.stages = None
+        self.summary = None  # batch jobs: per-item outcome
+        self.error = None
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+        # Called once if the job is cancelled before it runs, e.g. to delete its upload
+        self.on_cancel = on_cancel
+
+    def is_finished(self):
+        return self.status in self.FINISHED_STATES
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'stage': self.stage,
+            'detection_type': self.detection_type,
+            'detection_id': self.detection_id,
+            'report_id': self.report_id,
+            'stages': self.stages,
+            'summary': self.summary,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class DetectionJobManager:
+    """
+    Runs detection jobs on a bounded thread pool.
+
+    `max_workers` caps concurrent detections and `max_pending` caps how many
+    jobs may be queued or running at once; finished jobs are kept (up to
+    `history_size`) so clients can poll for the outcome.
+    """
+
+    def __init__(self, max_workers=2, max_pending=256, history_size=1000):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.history_size = history_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='detection-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, job, func, *args, **kwargs):
+        """
+        Queue `func(job, *args, **kwargs)` for execution.
+        The callable may update `job.stage` and must return a dict with
+        `detection_id` (and optionally `report_id` and `stages` timings).
+        """
+        with self._lock:
+            if self._pending_count() >= self.max_pending:
+                raise QueueFullError('Detection queue is full, try again later')
+            self._jobs[job.id] = job
+            self._trim_history()
+
+        job.future = self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def snapshot(self, job_id):
+        """A job's to_dict() taken under the lock, or None if it does not exist"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job is not None else None
+
+    def cancel(self, job_id):
+        """
+        Cancel a job that has not started yet and run its `on_cancel` cleanup.
+        Returns the job, or None if it does not exist.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+
+        cancelled = False
+        with self._lock:
+            if job.status == DetectionJob.QUEUED:
+                job.status = DetectionJob.CANCELLED
+                job.finished_at = datetime.now()
+                if job.future is not None:
+                    job.future.cancel()
+                cancelled = True
+
+        # The job will never run, so nothing else releases its files
+        if cancelled and job.on_cancel is not None:
+            try:
+                job.on_cancel()
+            except Exception as e:
+                print(f"❌ Cleanup of cancelled job {job.id} failed: {e}")
+        return job
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            'max_workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'jobs': counts
+        }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job, func, args, kwargs):
+        with self._lock:
+            if job.status == DetectionJob.CANCELLED:
+                return
+            job.status = DetectionJob.RUNNING
+            job.started_at = datetime.now()
+
+        try:
+            outcome = func(job, *args, **kwargs) or {}
+        except Exception as e:
+            print(f"❌ Detection job {job.id} failed: {e}")
+            outcome = {'error': str(e)}
+        self._finish(job, outcome)
+
+    def _finish(self, job, outcome):
+        # Readers hold the lock, so they see either the running job or the whole outcome
+        with self._lock:
+            job.detection_id = outcome.get('detection_id')
+            job.report_id = outcome.get('report_id')
+            job.stages = outcome.get('stages')
+            job.summary = outcome.get('summary')
+            job.error = outcome.get('error')
+            job.status = DetectionJob.FAILED if job.error else DetectionJob.DONE
+            job.stage = None
+            job.finished_at = datetime.now()
+
+    def _pending_count(self):
+        return sum(1 for job in self._jobs.values() if not job.is_finished())
+
+    def _trim_history(self):
+        # Drop the oldest finished jobs once the history limit is reached
+        if len(self._jobs) <= self.history_size:
+            return
+        for job_id in list(self._jobs.keys()):
+            if len(self._jobs) <= self.history_size:
+                break
+            if self._jobs[job_id].is_finished():
+                del self._jobs[job_id]
@@ -0,0 +1,64 @@
+"""
+Thread-safe lazy construction of expensive objects (detectors, report generator).
+
+The factory runs on first use, so heavy imports such as torch, transformers and
+ultralytics only happen when a detector is actually needed.
+"""
+
+import threading
+import time
+
+
+class LazyInstance:
+    """Builds `factory()` once, on first `get()`, and records how long it took"""
+
+    def __init__(self, name, factory, on_load=None):
+        self.name = name
+        self._factory = factory
+        self._on_load = on_load
+        self._instance = None
+        self._lock = threading.Lock()
+        self.load_seconds = None
+        self.loaded_at = None
+        self.error = None
+
+    @property
+    def loaded(self):
+        return self._instance is not None
+
+    def get(self):
+        instance = self._instance
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if self._instance is None:
+                print(f"Loading {self.name}...")
+                started = time.perf_counter()
+                try:
+                    instance = self._factory()
+                except Exception as e:
+                    # Leave unloaded so the next call retries
+                    self.error = str(e)
+                    print(f"❌ Loading {self.name} failed: {e}")
+                    raise
+                self.load_seconds = time.perf_counter() - started
+                self.loaded_at = time.time()
+                self.error = None
+                self._instance = instance
+                print(f"{self.name} loaded in {self.load_seconds:.2f}s")
+
+                if self._on_load is not None:
+                    try:
+                        self._on_load(instance)
+                    except Exception as e:
+                        print(f"{self.name} on_load hook failed: {e}")
+            return self._instance
+
+    def status(self):
+        return {
+            'name': self.name,
+            'loaded': self.loaded,
+            'load_seconds': self.load_seconds,
+            'error': self.error
+        }
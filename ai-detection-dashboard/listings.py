@@ -0,0 +1,175 @@
+"""
+Keyset-paginated listings for the /results and /reports pages.
+
+Pages are ordered newest first on (timestamp, id) and continue from an opaque
+cursor instead of an OFFSET, so each page is an index range scan whose cost
+does not grow with the table. Only the columns the list views render are
+selected; the result JSON blob is never loaded.
+"""
+
+import base64
+import json
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_, select
+
+from database_models import db, DetectionResult, EvidenceReport
+
+
+def encode_cursor(timestamp, row_id):
+    raw = json.dumps([timestamp.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(timestamp, id) from a cursor; raises ValueError if it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except Exception as e:
+        raise ValueError('Invalid cursor') from e
+
+
+def _parse_date(value, end_of_day=False):
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError as e:
+        raise ValueError(f'Invalid date: {value}') from e
+    # A bare date as the upper bound includes that whole day
+    if end_of_day and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+
+def parse_list_args(args, default_limit=50, max_limit=200):
+    """
+    Filters and paging options from query parameters:
+    type, prediction, since, until (ISO dates), cursor, limit.
+    Raises ValueError for malformed values.
+    """
+    try:
+        limit = int(args.get('limit', default_limit))
+    except ValueError as e:
+        raise ValueError('Invalid limit') from e
+
+    cursor = args.get('cursor') or None
+    return {
+        'detection_type': args.get('type') or None,
+        'prediction': args.get('prediction') or None,
+        'since': _parse_date(args.get('since')),
+        'until': _parse_date(args.get('until'), end_of_day=True),
+        'cursor': decode_cursor(cursor) if cursor else None,
+        'limit': max(1, min(limit, max_limit))
+    }
+
+
+def _keyset_page(query, timestamp_column, id_column, options):
+    if options['cursor'] is not None:
+        cursor_timestamp, cursor_id = options['cursor']
+        query = query.where(or_(
+            timestamp_column < cursor_timestamp,
+            and_(timestamp_column == cursor_timestamp, id_column < cursor_id)
+        ))
+    if options['since'] is not None:
+        query = query.where(timestamp_column >= options['since'])
+    if options['until'] is not None:
+        query = query.where(timestamp_column < options['until'])
+
+    # One extra row tells whether there is a next page
+    query = query.order_by(timestamp_column.desc(), id_column.desc()).limit(options['limit'] + 1)
+    rows = db.session.execute(query).all()
+    has_more = len(rows) > options['limit']
+    return rows[:options['limit']], has_more
+
+
+def _apply_detection_filters(query, options):
+    if options['detection_type']:
+        query = query.where(DetectionResult.detection_type == options['detection_type'])
+    if options['prediction']:
+        query = query.where(DetectionResult.prediction == options['prediction'])
+    return query
+
+
+def detection_page(options):
+    """One page of detections; returns (rows, next_cursor)"""
+    query = select(
+        DetectionResult.id,
+        DetectionResult.detection_type,
+        DetectionResult.media_type,
+        DetectionResult.file_path,
+        DetectionResult.confidence,
+        DetectionResult.timestamp,
+        DetectionResult.prediction
+    )
+    query = _apply_detection_filters(query, options)
+    rows, has_more = _keyset_page(query, DetectionResult.timestamp, DetectionResult.id, options)
+
+    items = [
+        {
+            'id': row.id,
+            'detection_type': row.detection_type,
+            'media_type': row.media_type,
+            'filename': os.path.basename(row.file_path),
+            'confidence': row.confidence or 0.0,
+            'timestamp': row.timestamp,
+            'prediction': row.prediction or 'unknown'
+        }
+        for row in rows
+    ]
+    next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id) if has_more else None
+    return items, next_cursor
+
+
+def detection_ids(options, ids=None, max_count=500):
+    """
+    Ids of the detections matching the list filters (cursor and limit are
+    ignored), newest first, capped at `max_count`. `ids` narrows the set to
+    explicit detections.
+    """
+    query = _apply_detection_filters(select(DetectionResult.id), options)
+    if ids:
+        query = query.where(DetectionResult.id.in_(ids))
+    if options['since'] is not None:
+        query = query.where(DetectionResult.timestamp >= options['since'])
+    if options['until'] is not None:
+        query = query.where(DetectionResult.timestamp < options['until'])
+    query = query.order_by(DetectionResult.timestamp.desc(), DetectionResult.id.desc()).limit(max_count)
+    return list(db.session.execute(query).scalars())
+
+
+def report_page(options):
+    """One page of evidence reports joined with their detections; returns (rows, next_cursor)"""
+    query = select(
+        EvidenceReport.id,
+        EvidenceReport.detection_id,
+        EvidenceReport.generated_at,
+        EvidenceReport.file_path.label('report_path'),
+        DetectionResult.detection_type,
+        DetectionResult.media_type,
+        DetectionResult.file_path,
+        DetectionResult.confidence,
+        DetectionResult.prediction
+    ).join(DetectionResult, EvidenceReport.detection_id == DetectionResult.id)
+    query = _apply_detection_filters(query, options)
+    rows, has_more = _keyset_page(query, EvidenceReport.generated_at, EvidenceReport.id, options)
+
+    items = [
+        {
+            'id': row.id,
+            'detection_id': row.detection_id,
+            'detection_type': row.detection_type,
+            'media_type': row.media_type,
+            'filename': os.path.basename(row.file_path),
+            'confidence': row.confidence or 0.0,
+            'timestamp': row.generated_at,
+            'prediction': row.prediction or 'unknown',
+            'report_path': row.report_path
+        }
+        for row in rows
+    ]
+    next_cursor = encode_cursor(rows[-1].generated_at, rows[-1].id) if has_more else None
+    return items, next_cursor
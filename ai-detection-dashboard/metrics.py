@@ -0,0 +1,215 @@
+"""
+Per-stage timing instrumentation and Prometheus-style metrics.
+
+A `StageTimer` used as a context manager becomes the active timer of the
+current thread. Code further down the call stack (detectors, the result cache,
+report rendering) records durations with `stage(name)`, which is a no-op when
+no timer is active. Finished detections are observed into histograms that
+`/api/metrics` renders in the Prometheus text exposition format.
+"""
+
+import bisect
+import contextlib
+import threading
+import time
+
+_local = threading.local()
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+class StageTimer:
+    """Accumulates named stage durations (seconds) for one detection"""
+
+    def __init__(self):
+        self.stages = {}
+        self.started = time.perf_counter()
+
+    def add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def merge(self, stages):
+        for name, seconds in (stages or {}).items():
+            self.add(name, seconds)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def as_dict(self):
+        return {name: round(seconds, 6) for name, seconds in self.stages.items()}
+
+    def __enter__(self):
+        stack = getattr(_local, 'timers', None)
+        if stack is None:
+            stack = _local.timers = []
+        stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _local.timers.remove(self)
+        return False
+
+
+def current_timer():
+    """The innermost active StageTimer on this thread, or None"""
+    stack = getattr(_local, 'timers', None)
+    return stack[-1] if stack else None
+
+
+def stage(name):
+    """Time a block into the active timer, if there is one"""
+    timer = current_timer()
+    return timer.stage(name) if timer is not None else contextlib.nullcontext()
+
+
+def merge_stages(stages):
+    """Add stages measured elsewhere (e.g. in an inference worker) to the active timer"""
+    timer = current_timer()
+    if timer is not None:
+        timer.merge(stages)
+
+
+# Metric types
+
+def _format_labels(label_names, values, extra=None):
+    pairs = list(zip(label_names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    escaped = [
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    ]
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.label_names, key)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, count=1, **labels):
+        """Record `value` (`count` times, for items that share one measurement)"""
+        key = tuple(str(labels.get(name, '')) for name in self.label_names)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += count
+            series[1] += value * count
+            series[2] += count
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for upper, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(self.label_names, key, ('le', repr(float(upper))))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.label_names, key, ('le', '+Inf'))
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, help_text, label_names=()):
+        metric = Counter(name, help_text, label_names)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        metric = Histogram(name, help_text, label_names, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+DETECTIONS_TOTAL = registry.counter(
+    'detections_total', 'Detections handled, by outcome',
+    ('detection_type', 'media_type', 'outcome')
+)
+DETECTION_SECONDS = registry.histogram(
+    'detection_duration_seconds', 'End-to-end detection pipeline time',
+    ('detection_type', 'media_type')
+)
+STAGE_SECONDS = registry.histogram(
+    'detection_stage_seconds', 'Time spent per pipeline stage',
+    ('stage', 'detection_type', 'media_type')
+)
+
+
+def observe_detection(detection_type, media_type, timer, outcome='success'):
+    """Record a finished (or failed) detection and its stage breakdown"""
+    media_type = media_type or 'unknown'
+    DETECTIONS_TOTAL.inc(detection_type=detection_type, media_type=media_type, outcome=outcome)
+    DETECTION_SECONDS.observe(timer.elapsed(), detection_type=detection_type, media_type=media_type)
+    for name, seconds in timer.stages.items():
+        STAGE_SECONDS.observe(seconds, stage=name, detection_type=detection_type, media_type=media_type)
+
+
+def observe_batch(detection_type, media_type, timer, succeeded, failed):
+    """
+    Record a group of detections run together: each item is counted, and the
+    group's time and stage breakdown are observed per item, averaged.
+    """
+    total = succeeded + failed
+    if total == 0:
+        return
+    media_type = media_type or 'unknown'
+    if succeeded:
+        DETECTIONS_TOTAL.inc(succeeded, detection_type=detection_type, media_type=media_type, outcome='success')
+    if failed:
+        DETECTIONS_TOTAL.inc(failed, detection_type=detection_type, media_type=media_type, outcome='error')
+    DETECTION_SECONDS.observe(timer.elapsed() / total, count=total, detection_type=detection_type, media_type=media_type)
+    for name, seconds in timer.stages.items():
+        STAGE_SECONDS.observe(seconds / total, count=total, stage=name, detection_type=detection_type, media_type=media_type)
@@ -0,0 +1,166 @@
+"""
+On-demand model registry with a memory budget.
+
+Models are loaded the first time they are requested, and their approximate
+footprint (parameter + buffer bytes) is tracked. When the resident total goes
+over the budget, the least recently used models are evicted.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+def estimate_model_bytes(value):
+    """
+    Approximate memory held by a model object.
+    Sums parameter and buffer sizes of any torch modules found in `value`
+    (directly, inside tuples/lists, or on a `.model` attribute as with YOLO),
+    or uses an `approx_bytes` attribute when the object provides one.
+    """
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_model_bytes(item) for item in value)
+
+    # Non-torch runtimes (e.g. ONNX Runtime sessions) report their own size
+    approx_bytes = getattr(value, 'approx_bytes', None)
+    if approx_bytes is not None:
+        return int(approx_bytes)
+
+    parameters = getattr(value, 'parameters', None)
+    buffers = getattr(value, 'buffers', None)
+    if callable(parameters) and callable(buffers):
+        try:
+            total = sum(p.numel() * p.element_size() for p in parameters())
+            total += sum(b.numel() * b.element_size() for b in buffers())
+            return total
+        except Exception:
+            pass
+
+    inner = getattr(value, 'model', None)
+    if inner is not None and inner is not value:
+        return estimate_model_bytes(inner)
+
+    return 0
+
+
+class ModelRegistry:
+    """LRU cache of loaded models bounded by `budget_bytes` (None = unlimited)"""
+
+    def __init__(self, budget_bytes=None):
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()
+        self._load_locks = {}
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'loads': 0, 'evictions': 0, 'load_failures': 0}
+
+    def get(self, key, loader):
+        """Return the model stored under `key`, calling `loader()` if it is not resident"""
+        with self._lock:
+            entry = self._touch(key)
+            if entry is not None:
+                return entry['value']
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Only one thread loads a given model; others wait for it
+        with load_lock:
+            with self._lock:
+                entry = self._touch(key)
+                if entry is not None:
+                    return entry['value']
+
+            started = time.perf_counter()
+            try:
+                value = loader()
+            except Exception:
+                with self._lock:
+                    self._counters['load_failures'] += 1
+                raise
+            load_seconds = time.perf_counter() - started
+            size_bytes = estimate_model_bytes(value)
+
+            with self._lock:
+                self._entries[key] = {
+                    'value': value,
+                    'size_bytes': size_bytes,
+                    'load_seconds': load_seconds,
+                    'loaded_at': time.time(),
+                    'last_used': time.time(),
+                    'hits': 0
+                }
+                self._counters['loads'] += 1
+                self._evict_over_budget(keep=key)
+
+            print(f"Model {key} loaded in {load_seconds:.2f}s (~{size_bytes / 1024 / 1024:.1f} MB)")
+            return value
+
+    def evict(self, key):
+        """Drop a model from the registry; returns True if it was resident"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._counters['evictions'] += 1
+        if entry is not None:
+            self._release_memory()
+        return entry is not None
+
+    def resident_bytes(self):
+        with self._lock:
+            return sum(entry['size_bytes'] for entry in self._entries.values())
+
+    def stats(self):
+        with self._lock:
+            models = [
+                {
+                    'key': key,
+                    'size_bytes': entry['size_bytes'],
+                    'load_seconds': entry['load_seconds'],
+                    'loaded_at': entry['loaded_at'],
+                    'last_used': entry['last_used'],
+                    'hits': entry['hits']
+                }
+                for key, entry in self._entries.items()
+            ]
+            counters = dict(self._counters)
+
+        counters['budget_bytes'] = self.budget_bytes
+        counters['resident_bytes'] = sum(model['size_bytes'] for model in models)
+        counters['models'] = models
+        return counters
+
+    def _touch(self, key):
+        # Caller must hold the lock
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            entry['hits'] += 1
+            entry['last_used'] = time.time()
+            self._counters['hits'] += 1
+        return entry
+
+    def _evict_over_budget(self, keep):
+        # Caller must hold the lock
+        if not self.budget_bytes:
+            return
+
+        evicted = False
+        total = sum(entry['size_bytes'] for entry in self._entries.values())
+        for key in list(self._entries.keys()):
+            if total <= self.budget_bytes:
+                break
+            if key == keep:
+                continue
+            entry = self._entries.pop(key)
+            total -= entry['size_bytes']
+            self._counters['evictions'] += 1
+            evicted = True
+            print(f"Evicted model {key} to stay within the memory budget")
+
+        if total > self.budget_bytes:
+            print(f"Model {keep} alone exceeds the memory budget")
+        if evicted:
+            self._release_memory()
+
+    def _release_memory(self):
+        # Models still in use by a running detection stay alive until it finishes
+        import gc
+        gc.collect()
@@ -1,14 +1,39 @@
-import cv2
 import numpy as np
 from ultralytics import YOLO
 from datetime import datetime
 import os
 
+from frame_sampler import DEFAULT_SEEK_THRESHOLD, FrameSampler
+from metrics import stage
+from model_registry import ModelRegistry
+
 class ObjectDetector:
-    def __init__(self, model_path='yolov8n.pt'):
-        self.model = YOLO(model_path)
+    def __init__(self, model_path='yolov8n.pt', frame_stride=30, batch_size=16, registry=None,
+                 frame_max_side=None, frame_seek_threshold=DEFAULT_SEEK_THRESHOLD):
+        self.model_path = model_path
+        self.frame_stride = frame_stride
+        # Video frames are downscaled to this longest side for YOLO; boxes are mapped back to source pixels
+        self.frame_max_side = frame_max_side
+        self.frame_seek_threshold = frame_seek_threshold
+        self.batch_size = max(1, int(batch_size))
+        # YOLO lives in the registry so it can be loaded on demand and evicted
+        self.registry = registry or ModelRegistry()
         self.class_names = self.model.names
 
+    @property
+    def model(self):
+        return self.registry.get(f"yolo:{self.model_path}", lambda: YOLO(self.model_path))
+
+    @property
+    def model_family(self):
+        """Model this detector serves, independent of version and settings"""
+        return os.path.basename(self.model_path)
+
+    @property
+    def model_signature(self):
+        """Identifies the loaded model; used to key cached results"""
+        return f"{self.model_family}|YOLOv8|stride={self.frame_stride}|frames={self.frame_max_side}"
+
     def detect(self, file_path):
         """Detect objects in image or video"""
         try:
@@ -24,33 +49,86 @@ class ObjectDetector:
                 'timestamp': datetime.now().isoformat()
             }
 
+    def _extract_detections(self, result, with_center=False):
+        """Convert one YOLO result into detection dicts, pulling box tensors out once"""
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            return []
+
+        xyxy = boxes.xyxy.cpu().numpy().astype(np.float64)
+        confidences = boxes.conf.cpu().numpy().astype(np.float64).tolist()
+        class_ids = boxes.cls.cpu().numpy().astype(np.int64).tolist()
+        bboxes = xyxy.tolist()
+
+        if with_center:
+            centers = np.column_stack((
+                (xyxy[:, 0] + xyxy[:, 2]) / 2,
+                (xyxy[:, 1] + xyxy[:, 3]) / 2
+            )).tolist()
+            return [
+                {
+                    'class': self.class_names[class_id],
+                    'confidence': confidence,
+                    'bbox': bbox,
+                    'center': center
+                }
+                for class_id, confidence, bbox, center in zip(class_ids, confidences, bboxes, centers)
+            ]
+
+        return [
+            {
+                'class': self.class_names[class_id],
+                'confidence': confidence,
+                'bbox': bbox
+            }
+            for class_id, confidence, bbox in zip(class_ids, confidences, bboxes)
+        ]
+
     def _detect_image(self, image_path):
         """Detect objects in image"""
-        results = self.model(image_path)
+        # YOLO decodes and preprocesses the image as part of the call
+        with stage('model_forward'):
+            results = self.model(image_path, verbose=False)
         detections = []
 
-        for result in results:
-            boxes = result.boxes
-            if boxes is not None:
-                for box in boxes:
-                    detection = {
-                        'class': self.class_names[int(box.cls)],
-                        'confidence': float(box.conf),
-                        'bbox': [float(x) for x in box.xyxy[0].tolist()],
-                        'center': [float((box.xyxy[0][0] + box.xyxy[0][2])/2), 
-                                  float((box.xyxy[0][1] + box.xyxy[0][3])/2)]
-                    }
-                    detections.append(detection)
-
+        with stage('postprocess'):
+            for result in results:
+                detections.extend(self._extract_detections(result, with_center=True))
+
+        return self._image_result(image_path, detections)
+
+    def detect_images(self, image_paths):
+        """
+        Detect objects in many images with one YOLO call per `batch_size`
+        images. Returns one result per path, in order, shaped like detect();
+        a failed batch falls back to one call per image.
+        """
+        results = []
+        for start in range(0, len(image_paths), self.batch_size):
+            chunk = list(image_paths[start:start + self.batch_size])
+            try:
+                with stage('model_forward'):
+                    batch_results = self.model(chunk, verbose=False)
+                with stage('postprocess'):
+                    results.extend(
+                        self._image_result(image_path, self._extract_detections(result, with_center=True))
+                        for image_path, result in zip(chunk, batch_results)
+                    )
+            except Exception:
+                results.extend(self.detect(image_path) for image_path in chunk)
+        return results
+
+    def _image_result(self, image_path, detections):
+        """Image result payload from its detection dicts"""
         # Determine primary class (highest confidence detection)
         primary_class = "unknown"
         max_confidence = 0.0
         
         if detections:
-            # Sort by confidence and get the highest
-            sorted_detections = sorted(detections, key=lambda x: x['confidence'], reverse=True)
-            primary_class = sorted_detections[0]['class']
-            max_confidence = sorted_detections[0]['confidence']
+            # Highest confidence detection
+            top_detection = max(detections, key=lambda x: x['confidence'])
+            primary_class = top_detection['class']
+            max_confidence = top_detection['confidence']
 
         return {
             'prediction': primary_class,  # Main class of the image
@@ -63,45 +141,64 @@ class ObjectDetector:
             'all_classes': list(set([d['class'] for d in detections])),  # All unique classes found
             'metadata': {
                 'model_version': 'YOLOv8n',
+                'model_name': self.model_family,
                 'detection_method': 'object_detection',
                 'primary_object': primary_class
             }
         }
 
+    def detect_frames(self, frames, model=None):
+        """Detect objects in already decoded BGR frames; returns one detection list per frame"""
+        model = model or self.model
+        with stage('model_forward'):
+            results = model(list(frames), verbose=False)
+        with stage('postprocess'):
+            return [self._extract_detections(result) for result in results]
+
     def _detect_video(self, video_path):
         """Detect objects in video"""
-        cap = cv2.VideoCapture(video_path)
+        model = self.model
+        sampler = FrameSampler(
+            strategy='stride', stride=self.frame_stride,
+            max_side=self.frame_max_side, seek_threshold=self.frame_seek_threshold
+        )
+        video_info = {}
         frame_detections = []
-        frame_count = 0
-
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
 
-            if frame_count % 30 == 0:  # Process every 30th frame
-                results = self.model(frame)
-                frame_objects = []
-
-                for result in results:
-                    boxes = result.boxes
-                    if boxes is not None:
-                        for box in boxes:
-                            detection = {
-                                'class': self.class_names[int(box.cls)],
-                                'confidence': float(box.conf),
-                                'bbox': [float(x) for x in box.xyxy[0].tolist()]
-                            }
-                            frame_objects.append(detection)
+        batch_indices = []
+        batch_frames = []
 
+        def flush():
+            # One YOLO call per batch of sampled frames
+            scale = video_info.get('width', 0) / batch_frames[0].shape[1] if video_info.get('width') else 1.0
+            for frame_index, objects in zip(batch_indices, self.detect_frames(batch_frames, model=model)):
+                if scale != 1.0:
+                    for detection in objects:
+                        detection['bbox'] = [coordinate * scale for coordinate in detection['bbox']]
                 frame_detections.append({
-                    'frame': frame_count,
-                    'objects': frame_objects
+                    'frame': frame_index,
+                    'objects': objects
                 })
+            batch_indices.clear()
+            batch_frames.clear()
+
+        frames = sampler.iter_frames(video_path, video_info)
+        while True:
+            # Frames are decoded lazily as they are pulled
+            with stage('frame_decode'):
+                item = next(frames, None)
+            if item is None:
+                break
+            frame_index, frame = item
+            batch_indices.append(frame_index)
+            batch_frames.append(frame)
+            if len(batch_frames) >= self.batch_size:
+                flush()
 
-            frame_count += 1
+        if batch_frames:
+            flush()
 
-        cap.release()
+        frame_count = video_info.get('total_frames', 0)
 
         # Aggregate results
         all_detections = []
@@ -135,6 +232,7 @@ class ObjectDetector:
                 'total_frames': frame_count,
                 'analyzed_frames': len(frame_detections),
                 'model_version': 'YOLOv8n',
+                'model_name': self.model_family,
                 'detection_method': 'video_object_detection',
                 'primary_object': primary_class
             }
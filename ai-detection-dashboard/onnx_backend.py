@@ -0,0 +1,129 @@
+"""
+ONNX Runtime backend for the Hugging Face classifiers.
+
+A model is exported to ONNX once and cached on disk; afterwards only its config
+is loaded from Hugging Face and inference runs through ONNX Runtime's CPU
+execution provider. `OnnxClassifier` is called like the PyTorch model
+(`model(**inputs).logits`, `model.config`), so the detector code is unchanged.
+"""
+
+import os
+import re
+import tempfile
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+
+
+# Input names fed to the exported graph, per model kind
+MODEL_INPUTS = {
+    'image': ['pixel_values'],
+    'audio': ['input_values']
+}
+
+
+def onnx_model_path(cache_dir, model_name, kind):
+    safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)
+    return os.path.join(cache_dir, kind, safe_name, 'model.onnx')
+
+
+def export_to_onnx(model, example_inputs, path, kind, opset=17):
+    """Export a PyTorch classifier with dynamic batch (and audio length) axes"""
+    input_names = MODEL_INPUTS[kind]
+    dynamic_axes = {name: {0: 'batch'} for name in input_names}
+    if kind == 'audio':
+        dynamic_axes['input_values'][1] = 'samples'
+    dynamic_axes['logits'] = {0: 'batch'}
+
+    class LogitsOnly(torch.nn.Module):
+        def __init__(self, wrapped):
+            super().__init__()
+            self.wrapped = wrapped
+
+        def forward(self, *args):
+            return self.wrapped(**dict(zip(input_names, args))).logits
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # A unique temp file per export: workers exporting the same model at once
+    # must not write to (or publish) each other's partial files
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.onnx')
+    os.close(fd)
+    try:
+        with torch.inference_mode():
+            torch.onnx.export(
+                LogitsOnly(model).eval(),
+                tuple(example_inputs[name] for name in input_names),
+                tmp_path,
+                input_names=input_names,
+                output_names=['logits'],
+                dynamic_axes=dynamic_axes,
+                opset_version=opset,
+                dynamo=False
+            )
+        # Publish atomically so concurrent workers never read a partial file
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class OnnxClassifier:
+    """ONNX Runtime session that behaves like a Hugging Face classification model"""
+
+    def __init__(self, path, config, kind, threads=None):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError('onnxruntime is required for the ONNX backend') from e
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+
+        self.session = ort.InferenceSession(path, sess_options=options, providers=['CPUExecutionProvider'])
+        self.config = config
+        self.kind = kind
+        self.path = path
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        # Used by the model registry's footprint estimate
+        self.approx_bytes = os.path.getsize(path)
+
+    def __call__(self, **inputs):
+        feed = {}
+        for name in self.input_names:
+            value = inputs[name]
+            if isinstance(value, torch.Tensor):
+                value = value.detach().cpu().numpy()
+            feed[name] = np.ascontiguousarray(value, dtype=np.float32)
+        logits = self.session.run(['logits'], feed)[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+    def eval(self):
+        return self
+
+    def to(self, device):
+        return self
+
+    @classmethod
+    def load(cls, model_name, kind, cache_dir, build_torch_model, example_inputs_fn, threads=None):
+        """
+        Return an OnnxClassifier for `model_name`, exporting it on first use.
+        `build_torch_model()` is only called when no cached export exists.
+        """
+        from transformers import AutoConfig
+
+        path = onnx_model_path(cache_dir, model_name, kind)
+        if not os.path.exists(path):
+            print(f"Exporting {model_name} to ONNX: {path}")
+            model = build_torch_model()
+            export_to_onnx(model, example_inputs_fn(), path, kind)
+            config = model.config
+            del model
+        else:
+            config = AutoConfig.from_pretrained(model_name)
+        return cls(path, config, kind, threads=threads)
@@ -0,0 +1,140 @@
+"""
+Evidence PDF rendering in a process pool, and streaming ZIP export.
+
+ReportLab builds are CPU-bound and hold the GIL, so PDFs are rendered in
+worker processes: the web process stays responsive and bulk exports render
+many reports in parallel. With zero workers, rendering happens in-process.
+"""
+
+import multiprocessing as mp
+import os
+import threading
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor
+
+# Worker process side: one generator per process, built on first use
+_worker_generator = None
+
+
+def _render_in_worker(report_data, report_id, output_dir):
+    global _worker_generator
+    if _worker_generator is None:
+        from evidence_report_generator import EvidenceReportGenerator
+        _worker_generator = EvidenceReportGenerator()
+    return _worker_generator.create_pdf_report(report_data, report_id, output_dir=output_dir)
+
+
+class ReportRenderService:
+    """
+    Renders evidence PDFs on a pool of `max_workers` processes, started on
+    first use. `local_generator` returns the in-process generator used when
+    `max_workers` is 0.
+    """
+
+    def __init__(self, max_workers=2, output_dir='evidence/exports', local_generator=None):
+        self.max_workers = max(0, int(max_workers))
+        self.output_dir = output_dir
+        self._local_generator = local_generator
+        self._executor = None
+        self._lock = threading.Lock()
+        self._counters = {'submitted': 0, 'completed': 0, 'failed': 0}
+
+    def submit(self, report_data, report_id):
+        """Queue a PDF build; returns a Future resolving to the PDF path"""
+        with self._lock:
+            self._counters['submitted'] += 1
+
+        if self.max_workers == 0:
+            future = Future()
+            try:
+                generator = self._local_generator()
+                future.set_result(generator.create_pdf_report(report_data, report_id, output_dir=self.output_dir))
+            except Exception as e:
+                future.set_exception(e)
+        else:
+            future = self._pool().submit(_render_in_worker, report_data, report_id, self.output_dir)
+
+        future.add_done_callback(self._count)
+        return future
+
+    def render(self, report_data, report_id, timeout=None):
+        """Render one PDF and wait for its path"""
+        return self.submit(report_data, report_id).result(timeout=timeout)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        counters['max_workers'] = self.max_workers
+        counters['started'] = self._executor is not None
+        return counters
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn keeps the web process's threads and DB connections out of the workers
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=mp.get_context('spawn'))
+            return self._executor
+
+    def _count(self, future):
+        with self._lock:
+            self._counters['failed' if future.exception() is not None else 'completed'] += 1
+
+
+class _ChunkBuffer:
+    """Write-only, non-seekable sink that hands written bytes back in chunks"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(entries, chunk_size=1024 * 1024):
+    """
+    Yield a ZIP archive piece by piece. `entries` yields (archive name, file
+    path) or (archive name, bytes). Files are copied in `chunk_size` pieces, so
+    memory stays bounded regardless of archive size. PDFs are already
+    compressed, so members are stored rather than deflated.
+    """
+    sink = _ChunkBuffer()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for name, source in entries:
+            if isinstance(source, (bytes, bytearray)):
+                archive.writestr(name, source)
+            else:
+                with open(source, 'rb') as f, archive.open(name, 'w', force_zip64=True) as member:
+                    for chunk in iter(lambda: f.read(chunk_size), b''):
+                        member.write(chunk)
+                        yield sink.drain()
+            yield sink.drain()
+    yield sink.drain()
+
+
+def report_exists(evidence_report):
+    return (
+        evidence_report is not None
+        and evidence_report.status == 'completed'
+        and evidence_report.file_path
+        and os.path.exists(evidence_report.file_path)
+    )
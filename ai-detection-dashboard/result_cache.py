@@ -0,0 +1,246 @@
+"""
+Content-addressed cache for detection results.
+
+Results are keyed by (file SHA-256, detection type, model signature), so the
+same media uploaded again under a different name skips inference entirely.
+An in-memory LRU tier sits in front of the `DetectionCache` table.
+"""
+
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from database_models import db, DetectionCache
+from file_integrity import hash_file as calculate_file_hash
+from metrics import stage
+
+# Result fields that point at files written for one upload (e.g. a streamed
+# CSV's per-row sidecar); results carrying them are not cached
+UPLOAD_SPECIFIC_FIELDS = ('detailed_results_path',)
+
+
+class ResultCache:
+    """Two-tier (memory LRU + database) detection result cache"""
+
+    def __init__(self, max_memory_entries=512, use_db=True):
+        self.max_memory_entries = max_memory_entries
+        self.use_db = use_db
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            'memory_hits': 0,
+            'db_hits': 0,
+            'misses': 0,
+            'stores': 0,
+            'invalidations': 0,
+            'saved_seconds': 0.0
+        }
+
+    def get_or_detect(self, file_path, detection_type, model_signature, detect_fn, file_hash=None):
+        """
+        Return the cached result for `file_path`, or run `detect_fn(file_path)`
+        and cache its result. Error results are never cached. Pass `file_hash`
+        when the digest is already known (computed while saving the upload).
+        """
+        if file_hash is None:
+            with stage('file_hash'):
+                file_hash = calculate_file_hash(file_path)
+        key = (file_hash, detection_type, model_signature)
+
+        with stage('cache_lookup'):
+            cached = self.get(key)
+        if cached is not None:
+            return self._prepare_hit(cached, file_path)
+
+        started = time.perf_counter()
+        result = detect_fn(file_path)
+        elapsed = time.perf_counter() - started
+
+        if self.cacheable(result):
+            with stage('cache_store'):
+                self.put(key, result, elapsed)
+
+        return result
+
+    @staticmethod
+    def cacheable(result):
+        """Successful results that do not reference another upload's files"""
+        return bool(result) and result.get('prediction') != 'error' and not any(
+            field in result for field in UPLOAD_SPECIFIC_FIELDS
+        )
+
+    def get_or_detect_many(self, files, detection_type, model_signature, detect_many_fn):
+        """
+        Batch form of get_or_detect. `files` is a list of (file_path, file_hash);
+        the paths missing from the cache go through one `detect_many_fn(paths)`
+        call, which returns results in the same order. Each miss is credited
+        an equal share of the batch time.
+        """
+        results = [None] * len(files)
+        missing = []
+        for i, (file_path, file_hash) in enumerate(files):
+            if file_hash is None:
+                with stage('file_hash'):
+                    file_hash = calculate_file_hash(file_path)
+            key = (file_hash, detection_type, model_signature)
+            with stage('cache_lookup'):
+                cached = self.get(key)
+            if cached is not None:
+                results[i] = self._prepare_hit(cached, file_path)
+            else:
+                missing.append((i, file_path, key))
+
+        if missing:
+            started = time.perf_counter()
+            detected = detect_many_fn([file_path for _, file_path, _ in missing])
+            share = (time.perf_counter() - started) / len(missing)
+            for (i, _, key), result in zip(missing, detected):
+                results[i] = result
+                if self.cacheable(result):
+                    with stage('cache_store'):
+                        self.put(key, result, share)
+
+        return results
+
+    def get(self, key):
+        """Look up a cache entry; returns {'result': ..., 'compute_seconds': ...} or None"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._counters['memory_hits'] += 1
+                self._counters['saved_seconds'] += entry['compute_seconds']
+                return entry
+
+        if self.use_db:
+            # Own session: committing the hit count must not commit the caller's pending work
+            with Session(db.engine) as session:
+                row = session.query(DetectionCache).filter_by(
+                    file_hash=key[0],
+                    detection_type=key[1],
+                    model_signature=key[2]
+                ).first()
+                if row is not None:
+                    entry = {
+                        'result': json.loads(row.result),
+                        'compute_seconds': row.compute_seconds or 0.0
+                    }
+                    row.hit_count = (row.hit_count or 0) + 1
+                    row.last_hit_at = datetime.utcnow()
+                    session.commit()
+            if row is not None:
+                with self._lock:
+                    self._remember(key, entry)
+                    self._counters['db_hits'] += 1
+                    self._counters['saved_seconds'] += entry['compute_seconds']
+                return entry
+
+        with self._lock:
+            self._counters['misses'] += 1
+        return None
+
+    def put(self, key, result, compute_seconds=0.0):
+        """Store a result in both tiers"""
+        entry = {'result': copy.deepcopy(result), 'compute_seconds': compute_seconds}
+        with self._lock:
+            self._remember(key, entry)
+            self._counters['stores'] += 1
+
+        if self.use_db:
+            try:
+                with Session(db.engine) as session:
+                    row = session.query(DetectionCache).filter_by(
+                        file_hash=key[0],
+                        detection_type=key[1],
+                        model_signature=key[2]
+                    ).first()
+                    if row is None:
+                        row = DetectionCache(
+                            file_hash=key[0],
+                            detection_type=key[1],
+                            model_signature=key[2]
+                        )
+                        session.add(row)
+                    row.result = json.dumps(result)
+                    row.compute_seconds = compute_seconds
+                    session.commit()
+            except Exception as e:
+                print(f"Result cache write failed: {e}")
+
+    def invalidate(self, detection_type=None, model_signature=None, keep_model_signature=None, signature_prefix=None):
+        """
+        Drop cache entries. With no arguments everything is cleared.
+        `keep_model_signature` removes every matching entry produced by any
+        other model; combined with `signature_prefix` (the model family) it
+        drops stale results of one model after its version or settings change.
+        Returns the number of database rows removed.
+        """
+        def matches(key):
+            if detection_type is not None and key[1] != detection_type:
+                return False
+            if model_signature is not None and key[2] != model_signature:
+                return False
+            if signature_prefix is not None and not key[2].startswith(signature_prefix):
+                return False
+            if keep_model_signature is not None and key[2] == keep_model_signature:
+                return False
+            return True
+
+        with self._lock:
+            for key in [k for k in self._memory if matches(k)]:
+                del self._memory[key]
+            self._counters['invalidations'] += 1
+
+        removed = 0
+        if self.use_db:
+            session = Session(db.engine)
+            query = session.query(DetectionCache)
+            if detection_type is not None:
+                query = query.filter(DetectionCache.detection_type == detection_type)
+            if model_signature is not None:
+                query = query.filter(DetectionCache.model_signature == model_signature)
+            if signature_prefix is not None:
+                query = query.filter(DetectionCache.model_signature.startswith(signature_prefix, autoescape=True))
+            if keep_model_signature is not None:
+                query = query.filter(DetectionCache.model_signature != keep_model_signature)
+            with session:
+                removed = query.delete(synchronize_session=False)
+                session.commit()
+        return removed
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            memory_entries = len(self._memory)
+
+        hits = counters['memory_hits'] + counters['db_hits']
+        lookups = hits + counters['misses']
+        counters['hits'] = hits
+        counters['hit_rate'] = hits / lookups if lookups else 0.0
+        counters['memory_entries'] = memory_entries
+        counters['max_memory_entries'] = self.max_memory_entries
+        return counters
+
+    def _remember(self, key, entry):
+        # Caller must hold the lock
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _prepare_hit(self, entry, file_path):
+        # Hand back a fresh copy that points at the new upload
+        result = copy.deepcopy(entry['result'])
+        result['file_path'] = file_path
+        result['timestamp'] = datetime.now().isoformat()
+        # Entries stored before such results were excluded may still carry them
+        for field in UPLOAD_SPECIFIC_FIELDS:
+            result.pop(field, None)
+        metadata = result.setdefault('metadata', {})
+        metadata['cache_hit'] = True
+        return result
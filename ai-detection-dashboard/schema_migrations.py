@@ -0,0 +1,112 @@
+"""
+In-place schema upgrades for existing databases.
+
+db.create_all() only creates missing tables, so columns and indexes added to
+existing models are applied here, followed by a backfill of the
+DetectionResult summary columns from the stored result JSON.
+
+Run at startup, or on its own:
+    python schema_migrations.py
+"""
+
+import json
+
+from sqlalchemy import inspect, select, text, update
+
+from database_models import db, DetectionResult, ensure_indexes
+
+# Columns added to existing tables after their first release: table -> {column: DDL type}
+ADDED_COLUMNS = {
+    'detection_result': {
+        'prediction': 'VARCHAR(50)',
+        'object_count': 'INTEGER',
+        'fraud_rate': 'FLOAT',
+        'sampled_frames': 'INTEGER',
+        'model_name': 'VARCHAR(255)',
+        'file_sha256': 'VARCHAR(64)',
+        'file_size': 'BIGINT'
+    }
+}
+
+# model_version values an earlier summarize() stored in the model_name column
+VERSION_MODEL_NAMES = ('1.0', 'pretrained-hf', 'YOLOv8n')
+
+
+def add_missing_columns():
+    """ALTER TABLE ... ADD COLUMN for every declared column the database lacks"""
+    inspector = inspect(db.engine)
+    added = []
+    with db.engine.begin() as connection:
+        for table, columns in ADDED_COLUMNS.items():
+            if not inspector.has_table(table):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table)}
+            for name, ddl_type in columns.items():
+                if name not in existing:
+                    connection.execute(text(f'ALTER TABLE {table} ADD COLUMN {name} {ddl_type}'))
+                    added.append(f'{table}.{name}')
+    return added
+
+
+def backfill_detection_summaries(batch_size=500):
+    """
+    Fill the summary columns of rows stored before they existed.
+    Each row's result JSON is parsed once; rows are processed in id order in
+    batches so memory stays bounded. Returns the number of rows updated.
+    """
+    updated = 0
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select(DetectionResult.id, DetectionResult.result)
+            .where(DetectionResult.prediction.is_(None), DetectionResult.id > last_id)
+            .order_by(DetectionResult.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        mappings = []
+        for row_id, result_json in rows:
+            try:
+                result = json.loads(result_json) if result_json else {}
+            except (TypeError, ValueError):
+                result = {}
+            mappings.append({'id': row_id, **DetectionResult.summarize(result)})
+
+        db.session.bulk_update_mappings(DetectionResult, mappings)
+        db.session.commit()
+        updated += len(mappings)
+        last_id = rows[-1][0]
+    return updated
+
+
+def clear_version_model_names():
+    """Reset model_name where it holds a model version instead; returns the number of rows changed"""
+    cleared = db.session.execute(
+        update(DetectionResult)
+        .where(DetectionResult.model_name.in_(VERSION_MODEL_NAMES))
+        .values(model_name=None)
+    ).rowcount
+    db.session.commit()
+    return cleared
+
+
+def upgrade_schema():
+    """Bring an existing database up to the current models"""
+    db.create_all()
+    added = add_missing_columns()
+    ensure_indexes()
+    backfilled = backfill_detection_summaries()
+    cleared = clear_version_model_names()
+    if added or backfilled or cleared:
+        print(
+            f"Schema upgraded: added columns {added or 'none'}, backfilled {backfilled} detection summaries, "
+            f"cleared {cleared} version-valued model names"
+        )
+
+
+if __name__ == '__main__':
+    from app import app
+    with app.app_context():
+        upgrade_schema()
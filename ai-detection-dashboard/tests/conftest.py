@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The dashboard modules are imported flat (`import listings`), as app.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
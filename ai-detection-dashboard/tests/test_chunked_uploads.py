@@ -0,0 +1,133 @@
+import hashlib
+import io
+import os
+
+import pytest
+
+from chunked_uploads import (
+    ChunkedUploadStore,
+    UploadError,
+    UploadHashMismatchError,
+    UploadNotFoundError,
+    UploadOffsetError,
+)
+
+DATA = bytes(range(256)) * 40
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ChunkedUploadStore(str(tmp_path / 'uploads'), max_size=1024 * 1024)
+
+
+def create(store, data=DATA, sha256=None):
+    state = store.create('clip.mp4', 'deepfake', len(data), sha256 or hashlib.sha256(data).hexdigest())
+    return state['upload_id']
+
+
+def test_offset_advances_with_each_chunk(store):
+    upload_id = create(store)
+    assert store.status(upload_id)['offset'] == 0
+
+    assert store.append(upload_id, 0, io.BytesIO(DATA[:1000])) == 1000
+    assert store.append(upload_id, 1000, io.BytesIO(DATA[1000:4000])) == 4000
+
+    state = store.status(upload_id)
+    assert state['offset'] == 4000
+    assert not state['complete']
+
+
+def test_chunk_at_wrong_offset_is_rejected_with_current_offset(store):
+    upload_id = create(store)
+    store.append(upload_id, 0, io.BytesIO(DATA[:1000]))
+
+    with pytest.raises(UploadOffsetError) as excinfo:
+        store.append(upload_id, 500, io.BytesIO(DATA[500:1500]))
+    assert excinfo.value.expected_offset == 1000
+    assert store.status(upload_id)['offset'] == 1000
+
+
+def test_chunk_past_declared_size_is_rejected(store):
+    upload_id = create(store, DATA[:100])
+    with pytest.raises(UploadError):
+        store.append(upload_id, 0, io.BytesIO(DATA[:200]))
+
+
+def test_resume_after_restart_rehashes_on_finalize(store, tmp_path):
+    upload_id = create(store)
+    store.append(upload_id, 0, io.BytesIO(DATA[:3000]))
+
+    # A new store has no running digest for the session
+    resumed = ChunkedUploadStore(store.directory, max_size=store.max_size)
+    offset = resumed.status(upload_id)['offset']
+    assert offset == 3000
+    resumed.append(upload_id, offset, io.BytesIO(DATA[offset:]))
+
+    destination = str(tmp_path / 'out' / 'clip.mp4')
+    digest, size = resumed.finalize(upload_id, destination)
+    assert digest == hashlib.sha256(DATA).hexdigest()
+    assert size == len(DATA)
+    with open(destination, 'rb') as f:
+        assert f.read() == DATA
+    with pytest.raises(UploadNotFoundError):
+        resumed.status(upload_id)
+
+
+def test_finalize_rejects_incomplete_upload(store, tmp_path):
+    upload_id = create(store)
+    store.append(upload_id, 0, io.BytesIO(DATA[:10]))
+    with pytest.raises(UploadError):
+        store.finalize(upload_id, str(tmp_path / 'clip.mp4'))
+
+
+def test_hash_mismatch_discards_upload(store, tmp_path):
+    upload_id = create(store, sha256='0' * 64)
+    store.append(upload_id, 0, io.BytesIO(DATA))
+    with pytest.raises(UploadHashMismatchError):
+        store.finalize(upload_id, str(tmp_path / 'clip.mp4'))
+    with pytest.raises(UploadNotFoundError):
+        store.status(upload_id)
+
+
+def test_missing_partial_file_is_not_found(store):
+    upload_id = create(store)
+    os.remove(os.path.join(store.directory, f'{upload_id}.part'))
+    with pytest.raises(UploadNotFoundError):
+        store.status(upload_id)
+
+
+def test_unknown_and_malformed_ids_are_not_found(store):
+    for upload_id in ('0' * 32, '../etc'):
+        with pytest.raises(UploadNotFoundError):
+            store.status(upload_id)
+
+
+def test_unknown_ids_do_not_allocate_session_locks(store):
+    for i in range(100):
+        with pytest.raises(UploadNotFoundError):
+            store.status(f'{i:032x}')
+        with pytest.raises(UploadNotFoundError):
+            store.append(f'{i:032x}', 0, io.BytesIO(b'x'))
+        with pytest.raises(UploadNotFoundError):
+            store.abort(f'{i:032x}')
+    assert store._session_locks == {}
+
+
+def test_finished_sessions_release_their_locks(store, tmp_path):
+    upload_id = create(store)
+    store.append(upload_id, 0, io.BytesIO(DATA))
+    store.finalize(upload_id, str(tmp_path / 'clip.mp4'))
+
+    aborted_id = create(store)
+    store.abort(aborted_id)
+    assert store._session_locks == {}
+
+
+def test_cleanup_expired_removes_idle_sessions(store):
+    upload_id = create(store)
+    assert store.cleanup_expired() == 0
+
+    store.ttl_seconds = -1
+    assert store.cleanup_expired() == 1
+    with pytest.raises(UploadNotFoundError):
+        store.status(upload_id)
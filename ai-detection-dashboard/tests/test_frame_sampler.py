@@ -0,0 +1,134 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+cv2 = pytest.importorskip('cv2')
+
+import frame_sampler
+from frame_sampler import FrameSampler
+
+
+class FakeCapture:
+    """cv2.VideoCapture stand-in whose frames are filled with their own index"""
+
+    def __init__(self, total_frames, fps=30.0, width=64, height=48):
+        self.total_frames = total_frames
+        self.fps = fps
+        self.width = width
+        self.height = height
+        self.position = 0
+        self.grabs = 0
+        self.retrieves = 0
+        self.seeks = []
+
+    def isOpened(self):
+        return True
+
+    def get(self, prop):
+        return {
+            cv2.CAP_PROP_FRAME_COUNT: self.total_frames,
+            cv2.CAP_PROP_FPS: self.fps,
+            cv2.CAP_PROP_FRAME_WIDTH: self.width,
+            cv2.CAP_PROP_FRAME_HEIGHT: self.height,
+        }.get(prop, 0)
+
+    def set(self, prop, value):
+        assert prop == cv2.CAP_PROP_POS_FRAMES
+        self.seeks.append(value)
+        self.position = int(value)
+        return True
+
+    def grab(self):
+        if self.position >= self.total_frames:
+            return False
+        self.grabs += 1
+        self.position += 1
+        return True
+
+    def retrieve(self):
+        self.retrieves += 1
+        frame = np.full((self.height, self.width, 3), (self.position - 1) % 256, dtype=np.uint8)
+        return True, frame
+
+    def release(self):
+        pass
+
+
+@pytest.fixture
+def capture(monkeypatch):
+    def open_capture(total_frames, **kwargs):
+        fake = FakeCapture(total_frames, **kwargs)
+        monkeypatch.setattr(frame_sampler.cv2, 'VideoCapture', lambda path: fake)
+        return fake
+
+    return open_capture
+
+
+def sampled(sampler):
+    frames, info = sampler.sample('video.mp4')
+    for index, frame in frames:
+        # The frame handed back is the one at its reported index
+        assert frame[0, 0, 0] == index % 256
+    return [index for index, _ in frames], info
+
+
+def test_uniform_sampling_spreads_indices_over_the_video(capture):
+    fake = capture(1000)
+    indices, info = sampled(FrameSampler('uniform', count=16, seek_threshold=None))
+
+    assert indices == np.linspace(0, 999, num=16, dtype=int).tolist()
+    assert info['total_frames'] == 1000
+    assert (info['width'], info['height']) == (64, 48)
+    # Without seeking every frame up to the last sample is grabbed, but only samples are retrieved
+    assert fake.seeks == []
+    assert fake.grabs == 1000
+    assert fake.retrieves == 16
+
+
+def test_uniform_sampling_seeks_across_long_gaps(capture):
+    fake = capture(10000)
+    indices, _ = sampled(FrameSampler('uniform', count=4, seek_threshold=300))
+
+    assert indices == [0, 3333, 6666, 9999]
+    assert fake.seeks == [3333, 6666, 9999]
+    assert fake.grabs == 4
+
+
+def test_uniform_sampling_reads_through_short_gaps(capture):
+    fake = capture(100)
+    indices, _ = sampled(FrameSampler('uniform', count=5, seek_threshold=300))
+
+    assert indices == [0, 24, 49, 74, 99]
+    assert fake.seeks == []
+
+
+def test_uniform_sampling_of_short_video_returns_every_frame(capture):
+    capture(5)
+    indices, _ = sampled(FrameSampler('uniform', count=16))
+    assert indices == [0, 1, 2, 3, 4]
+
+
+def test_stride_sampling_counts_walked_frames(capture):
+    capture(95)
+    indices, info = sampled(FrameSampler('stride', stride=30))
+
+    assert indices == [0, 30, 60, 90]
+    assert info['total_frames'] == 95
+
+
+def test_time_sampling_uses_the_frame_rate(capture):
+    capture(125, fps=25.0)
+    indices, _ = sampled(FrameSampler('time', interval_seconds=2.0))
+    assert indices == [0, 50, 100]
+
+
+def test_max_side_downscales_sampled_frames(capture):
+    capture(10, width=640, height=480)
+    frames, info = FrameSampler('uniform', count=2, max_side=160).sample('video.mp4')
+
+    assert [frame.shape[:2] for _, frame in frames] == [(120, 160), (120, 160)]
+    assert (info['width'], info['height']) == (640, 480)
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        FrameSampler('random')
@@ -0,0 +1,82 @@
+import json
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pd = pytest.importorskip('pandas')
+pytest.importorskip('sklearn')
+
+from fraud_detection import FraudDetector
+
+
+@pytest.fixture
+def detector():
+    return FraudDetector()
+
+
+def random_transactions(count, seed=7):
+    rng = random.Random(seed)
+    return [
+        {
+            'amount': rng.choice([0, 1, 2999.99, 3000, 3000.01, rng.uniform(0, 20000)]),
+            'hour': rng.choice([0, 5, 6, 12, 22, 23]),
+            'merchant_risk': rng.random(),
+            'user_score': rng.random(),
+            'location_risk': rng.random()
+        }
+        for _ in range(count)
+    ]
+
+
+def test_vectorized_scores_match_scalar_scores(detector):
+    transactions = random_transactions(500)
+    df = pd.DataFrame(transactions)
+
+    vectorized = detector._calculate_risk_scores(df)
+    scalar = [detector._calculate_risk_score(detector._extract_features(t)) for t in transactions]
+
+    # Terms are summed in the same order, so the scores are identical, not just close
+    assert vectorized.tolist() == scalar
+
+
+def test_vectorized_scores_use_defaults_for_missing_columns(detector):
+    df = pd.DataFrame({'amount': [100.0, 50000.0]})
+
+    vectorized = detector._calculate_risk_scores(df)
+    scalar = [detector._calculate_risk_score(detector._extract_features({'amount': a})) for a in (100.0, 50000.0)]
+    assert vectorized.tolist() == scalar
+
+
+def write_transactions(tmp_path, transactions):
+    paths = []
+    for i, transaction in enumerate(transactions):
+        path = tmp_path / f'transaction_{i}.json'
+        path.write_text(json.dumps(transaction))
+        paths.append(str(path))
+    return paths
+
+
+def test_detect_transactions_matches_detect(detector, tmp_path):
+    paths = write_transactions(tmp_path, random_transactions(20))
+
+    batched = detector.detect_transactions(paths)
+    single = [detector.detect(path) for path in paths]
+
+    for batch_result, single_result in zip(batched, single):
+        assert batch_result['risk_score'] == single_result['risk_score']
+        assert batch_result['prediction'] == single_result['prediction']
+
+
+def test_detect_transactions_isolates_bad_files(detector, tmp_path):
+    transactions = random_transactions(3)
+    transactions[1]['amount'] = 'not a number'
+    paths = write_transactions(tmp_path, transactions)
+    unreadable = tmp_path / 'broken.json'
+    unreadable.write_text('{')
+    paths.append(str(unreadable))
+
+    results = detector.detect_transactions(paths)
+
+    assert [r['prediction'] == 'error' for r in results] == [False, True, False, True]
+    assert results[0]['risk_score'] == detector.detect(paths[0])['risk_score']
@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from job_queue import DetectionJob, DetectionJobManager
+
+
+@pytest.fixture
+def manager():
+    manager = DetectionJobManager(max_workers=1)
+    yield manager
+    manager.shutdown(wait=True)
+
+
+def blocking_job(manager, release):
+    started = threading.Event()
+
+    def run(job):
+        started.set()
+        release.wait(5)
+        return {'detection_id': 1}
+
+    job = manager.submit(DetectionJob('deepfake', 'running.jpg'), run)
+    assert started.wait(5)
+    return job
+
+
+def test_cancelling_a_queued_job_runs_its_cleanup(manager):
+    release = threading.Event()
+    blocking_job(manager, release)
+
+    cleaned = []
+    queued = manager.submit(
+        DetectionJob('deepfake', 'queued.jpg', on_cancel=lambda: cleaned.append('queued.jpg')),
+        lambda job: {'detection_id': 2}
+    )
+    manager.cancel(queued.id)
+    manager.cancel(queued.id)
+    release.set()
+
+    assert manager.snapshot(queued.id)['status'] == DetectionJob.CANCELLED
+    assert cleaned == ['queued.jpg']
+
+
+def test_running_job_is_not_cancelled_or_cleaned_up(manager):
+    release = threading.Event()
+    cleaned = []
+    running = blocking_job(manager, release)
+    running.on_cancel = lambda: cleaned.append(running.file_path)
+
+    manager.cancel(running.id)
+    release.set()
+    running.future.result(timeout=5)
+
+    assert manager.snapshot(running.id)['status'] == DetectionJob.DONE
+    assert cleaned == []
@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+flask = pytest.importorskip('flask')
+pytest.importorskip('flask_sqlalchemy')
+
+from sqlalchemy import text
+
+from database_models import db, DetectionResult, User, ensure_indexes
+import listings
+
+BASE_TIME = datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def rows():
+    app = flask.Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(id=1, username='analyst', email='analyst@example.com'))
+        # Pairs share a timestamp, so the id has to break ties
+        for i in range(9):
+            db.session.add(DetectionResult(
+                user_id=1,
+                file_path=f'/uploads/file_{i}.jpg',
+                detection_type='deepfake' if i % 3 else 'object',
+                media_type='image',
+                confidence=0.5,
+                timestamp=BASE_TIME + timedelta(minutes=i // 2),
+                prediction='real'
+            ))
+        db.session.commit()
+        yield db.session.query(DetectionResult).order_by(
+            DetectionResult.timestamp.desc(), DetectionResult.id.desc()
+        ).all()
+        db.session.remove()
+        db.drop_all()
+
+
+def all_pages(args):
+    ids = []
+    cursor = None
+    pages = 0
+    while True:
+        page_args = dict(args, cursor=cursor) if cursor else dict(args)
+        items, cursor = listings.detection_page(listings.parse_list_args(page_args))
+        ids.extend(item['id'] for item in items)
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+def test_pages_cover_every_row_once_newest_first(rows):
+    ids, pages = all_pages({'limit': '4'})
+
+    assert ids == [row.id for row in rows]
+    assert pages == 3
+
+
+def test_exact_multiple_of_limit_has_no_empty_trailing_page(rows):
+    ids, pages = all_pages({'limit': '3'})
+
+    assert len(ids) == 9
+    assert pages == 3
+
+
+def test_filters_apply_across_pages(rows):
+    ids, _ = all_pages({'limit': '2', 'type': 'object'})
+    assert ids == [row.id for row in rows if row.detection_type == 'object']
+
+
+def test_since_and_until_bound_the_listing(rows):
+    since = (BASE_TIME + timedelta(minutes=1)).isoformat()
+    until = (BASE_TIME + timedelta(minutes=3)).isoformat()
+    ids, _ = all_pages({'limit': '2', 'since': since, 'until': until})
+
+    assert ids == [
+        row.id for row in rows
+        if BASE_TIME + timedelta(minutes=1) <= row.timestamp < BASE_TIME + timedelta(minutes=3)
+    ]
+
+
+def test_filtered_page_is_an_index_range_scan(rows):
+    ensure_indexes()
+    plan = db.session.execute(text(
+        'EXPLAIN QUERY PLAN SELECT id FROM detection_result '
+        "WHERE detection_type = 'object' AND (timestamp < :ts OR (timestamp = :ts AND id < 5)) "
+        'ORDER BY timestamp DESC, id DESC LIMIT 3'
+    ), {'ts': BASE_TIME}).all()
+    details = ' '.join(row[-1] for row in plan)
+
+    assert 'ix_detection_result_type_timestamp_id' in details
+    assert 'TEMP B-TREE' not in details
+
+
+def test_cursor_round_trips():
+    cursor = listings.encode_cursor(BASE_TIME, 42)
+    assert listings.decode_cursor(cursor) == (BASE_TIME, 42)
+
+
+def test_malformed_arguments_raise_value_error():
+    for args in ({'cursor': 'not-a-cursor'}, {'limit': 'many'}, {'since': 'yesterday'}):
+        with pytest.raises(ValueError):
+            listings.parse_list_args(args)
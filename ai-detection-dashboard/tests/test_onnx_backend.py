@@ -0,0 +1,83 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+torch = pytest.importorskip('torch')
+pytest.importorskip('onnx')
+pytest.importorskip('onnxruntime')
+
+from onnx_backend import OnnxClassifier, export_to_onnx
+
+CONFIG = SimpleNamespace(id2label={0: 'real', 1: 'fake'}, num_labels=2)
+
+
+class TinyImageClassifier(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.conv = torch.nn.Conv2d(3, 4, kernel_size=3, stride=2)
+        self.head = torch.nn.Linear(4, 2)
+        self.config = CONFIG
+
+    def forward(self, pixel_values):
+        features = torch.relu(self.conv(pixel_values)).mean(dim=(2, 3))
+        return SimpleNamespace(logits=self.head(features))
+
+
+class TinyAudioClassifier(torch.nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.head = torch.nn.Linear(2, 2)
+        self.config = CONFIG
+
+    def forward(self, input_values):
+        stats = torch.stack((input_values.abs().mean(dim=1), input_values.std(dim=1)), dim=1)
+        return SimpleNamespace(logits=self.head(stats))
+
+
+def export(model, example_inputs, tmp_path, kind):
+    path = str(tmp_path / kind / 'model.onnx')
+    export_to_onnx(model.eval(), example_inputs, path, kind)
+    # Only the published model is left behind
+    assert os.listdir(os.path.dirname(path)) == ['model.onnx']
+    return OnnxClassifier(path, model.config, kind, threads=1)
+
+
+def test_image_logits_match_torch(tmp_path):
+    torch.manual_seed(0)
+    model = TinyImageClassifier()
+    onnx_model = export(model, {'pixel_values': torch.randn(1, 3, 32, 32)}, tmp_path, 'image')
+
+    # Batch size differs from the export example: the batch axis is dynamic
+    pixel_values = torch.randn(5, 3, 32, 32)
+    with torch.inference_mode():
+        expected = model(pixel_values=pixel_values).logits
+    actual = onnx_model(pixel_values=pixel_values).logits
+
+    assert actual.shape == expected.shape
+    assert torch.allclose(actual, expected, atol=1e-5)
+    assert onnx_model.config is CONFIG
+
+
+def test_audio_logits_match_torch_for_any_length(tmp_path):
+    torch.manual_seed(0)
+    model = TinyAudioClassifier()
+    onnx_model = export(model, {'input_values': torch.randn(1, 16000)}, tmp_path, 'audio')
+
+    for batch, samples in ((1, 16000), (3, 8000), (2, 48000)):
+        input_values = torch.randn(batch, samples)
+        with torch.inference_mode():
+            expected = model(input_values=input_values).logits
+        actual = onnx_model(input_values=input_values).logits
+        assert torch.allclose(actual, expected, atol=1e-5)
+
+
+def test_failed_export_leaves_no_files(tmp_path):
+    class Broken(torch.nn.Module):
+        def forward(self, pixel_values):
+            raise RuntimeError('cannot trace')
+
+    path = str(tmp_path / 'image' / 'model.onnx')
+    with pytest.raises(RuntimeError):
+        export_to_onnx(Broken(), {'pixel_values': torch.randn(1, 3, 8, 8)}, path, 'image')
+    assert os.listdir(os.path.dirname(path)) == []